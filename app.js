@@ -7,6 +7,41 @@ const USER_VERIFICATION_KEY = "islaapp_user_verification";
 const PLAN_SELECTION_KEY = "islaapp_plan_selection";
 const PLAN_PENDING_KEY = "islaapp_plan_pending_selection";
 
+let bootstrapPayloads = null;
+
+// Pages rendered by the dev server embed first responses for public GET endpoints.
+// Every caller during initial load shares them; later refreshes go to the network.
+function takeBootstrapPayload(url) {
+  if (bootstrapPayloads === null) {
+    bootstrapPayloads = {};
+    const node = document.getElementById("bootstrapData");
+    if (node) {
+      try {
+        bootstrapPayloads = JSON.parse(node.textContent || "{}") || {};
+      } catch (_error) {
+        bootstrapPayloads = {};
+      }
+    }
+  }
+  if (!Object.prototype.hasOwnProperty.call(bootstrapPayloads, url)) return undefined;
+  const payload = bootstrapPayloads[url];
+  setTimeout(() => {
+    delete bootstrapPayloads[url];
+  }, 0);
+  return payload;
+}
+
+function bootstrapFetch(url) {
+  const payload = takeBootstrapPayload(url);
+  if (payload === undefined) return fetch(url);
+  return Promise.resolve(
+    new Response(JSON.stringify(payload), {
+      status: 200,
+      headers: { "Content-Type": "application/json" },
+    })
+  );
+}
+
 function getCurrentLanguage() {
   const raw = String(localStorage.getItem(UI_LANGUAGE_KEY) || "en").trim().toLowerCase();
   return raw === "es" ? "es" : "en";
@@ -421,7 +456,7 @@ function initStartHerePage() {
 
   const readProjectSummary = async () => {
     try {
-      const response = await fetch("/api/projects");
+      const response = await bootstrapFetch("/api/projects");
       const payload = await response.json();
       if (!response.ok || !payload.ok || !Array.isArray(payload.projects)) return { count: null, latest: "" };
       const projects = payload.projects;
@@ -942,37 +977,6 @@ function createTemplateStudioImage(presetKey, altText) {
   };
 }
 
-function createTemplatePhotoImage(presetKey, altText) {
-  const photoSources = {
-    saas: "https://images.pexels.com/photos/590016/pexels-photo-590016.jpeg?auto=compress&cs=tinysrgb&w=1600",
-    portal: "https://images.pexels.com/photos/3184465/pexels-photo-3184465.jpeg?auto=compress&cs=tinysrgb&w=1600",
-    market: "https://images.pexels.com/photos/3850220/pexels-photo-3850220.jpeg?auto=compress&cs=tinysrgb&w=1600",
-    store: "https://images.pexels.com/photos/230544/pexels-photo-230544.jpeg?auto=compress&cs=tinysrgb&w=1600",
-    booking: "https://images.pexels.com/photos/669615/pexels-photo-669615.jpeg?auto=compress&cs=tinysrgb&w=1600",
-    helpdesk: "https://images.pexels.com/photos/8867436/pexels-photo-8867436.jpeg?auto=compress&cs=tinysrgb&w=1600",
-    community: "https://images.pexels.com/photos/3184338/pexels-photo-3184338.jpeg?auto=compress&cs=tinysrgb&w=1600",
-    membership: "https://images.pexels.com/photos/4050315/pexels-photo-4050315.jpeg?auto=compress&cs=tinysrgb&w=1600",
-    crm: "https://images.pexels.com/photos/3184291/pexels-photo-3184291.jpeg?auto=compress&cs=tinysrgb&w=1600",
-    hr: "https://images.pexels.com/photos/3184360/pexels-photo-3184360.jpeg?auto=compress&cs=tinysrgb&w=1600",
-    realestate: "https://images.pexels.com/photos/323780/pexels-photo-323780.jpeg?auto=compress&cs=tinysrgb&w=1600",
-    restaurant: "https://images.pexels.com/photos/1640774/pexels-photo-1640774.jpeg?auto=compress&cs=tinysrgb&w=1600",
-  };
-
-  const key = String(presetKey || "").toLowerCase();
-  const photo = String(photoSources[key] || "").trim();
-  const fallback = createTemplateStudioImage(key, altText);
-  if (!photo) return fallback;
-
-  return {
-    alt: String(altText || "").trim() || fallback.alt,
-    avifSrcSet: "",
-    webpSrcSet: "",
-    jpgSrcSet: "",
-    fallbackSrc: photo,
-    backupSrc: String(fallback.fallbackSrc || ""),
-  };
-}
-
 function createImportedTemplateImage(filePath, altText, presetKey) {
   const src = String(filePath || "").trim();
   const safeAlt = String(altText || "").trim() || "Template preview";
@@ -1020,486 +1024,42 @@ function renderTemplateImagePicture(template, options) {
   `;
 }
 
-function getTemplateCatalog() {
-  const coreTemplates = [
-    {
-      id: "saas-dashboard",
-      name: "SaaS Dashboard",
-      category: "business",
-      status: "Featured",
-      thumbClass: "template-thumb-saas",
-      image: createTemplatePhotoImage("saas", "SaaS analytics dashboard visual"),
-      shortDescription: "Admin, analytics, subscriptions.",
-      longDescription: "Best for analytics products, admin dashboards, and subscription-ready SaaS launches.",
-      stack: "React + Supabase",
-      target: "MVP in 1 month",
-      clones: 412,
-      perfectFor: ["B2B tools", "Analytics apps", "Internal operations"],
-      techTags: ["React", "Supabase", "Auth", "Reports"],
-      features: ["User authentication", "Admin dashboard", "Analytics reports", "Team collaboration"],
-    },
-    {
-      id: "client-portal",
-      name: "Client Portal",
-      category: "business",
-      status: "Customizable",
-      thumbClass: "template-thumb-portal",
-      image: createTemplatePhotoImage("portal", "Client portal workspace visual"),
-      shortDescription: "Projects, files, progress timeline.",
-      longDescription: "Best for agencies and service teams managing client projects and shared files.",
-      stack: "React + Supabase",
-      target: "MVP in 1 month",
-      clones: 289,
-      perfectFor: ["Agencies", "Freelancers", "Client services"],
-      techTags: ["React", "Supabase", "File sharing", "Notifications"],
-      features: ["User authentication", "Team collaboration", "Notifications", "Admin dashboard"],
-    },
-    {
-      id: "marketplace",
-      name: "Marketplace",
-      category: "commerce",
-      status: "Featured",
-      thumbClass: "template-thumb-market",
-      image: createTemplatePhotoImage("market", "Marketplace app visual"),
-      shortDescription: "Listings, checkout, seller profiles.",
-      longDescription: "Best for multi-vendor catalogs where customers browse listings and checkout online.",
-      stack: "Next.js + PostgreSQL",
-      target: "Production in 2 months",
-      clones: 507,
-      perfectFor: ["Digital products", "Physical goods", "Multi-vendor platforms"],
-      techTags: ["Next.js", "PostgreSQL", "Payments", "Admin"],
-      features: ["User authentication", "Payments and billing", "Notifications", "Admin dashboard"],
-    },
-    {
-      id: "ecommerce-storefront",
-      name: "E-commerce Storefront",
-      category: "commerce",
-      status: "Popular",
-      thumbClass: "template-thumb-store",
-      image: createTemplatePhotoImage("store", "Ecommerce storefront visual"),
-      shortDescription: "Products, cart, customer accounts.",
-      longDescription: "Best for direct-to-consumer stores with inventory, cart, and order workflows.",
-      stack: "Next.js + PostgreSQL",
-      target: "Production in 2 months",
-      clones: 621,
-      perfectFor: ["Retail brands", "D2C stores", "Catalog sales"],
-      techTags: ["Next.js", "PostgreSQL", "Checkout", "Order flow"],
-      features: ["User authentication", "Payments and billing", "Notifications", "Analytics reports"],
-    },
-    {
-      id: "booking-platform",
-      name: "Booking Platform",
-      category: "service",
-      status: "Fast launch",
-      thumbClass: "template-thumb-booking",
-      image: createTemplatePhotoImage("booking", "Booking platform visual"),
-      shortDescription: "Calendar, availability, reminders.",
-      longDescription: "Best for appointment-based businesses that need scheduling and reminders.",
-      stack: "React + Supabase",
-      target: "Beta in 2 weeks",
-      clones: 355,
-      perfectFor: ["Clinics", "Salons", "Professional services"],
-      techTags: ["React", "Supabase", "Calendar", "Reminders"],
-      features: ["User authentication", "Notifications", "Admin dashboard"],
-    },
-    {
-      id: "bookflow-homepage-shuffle2",
-      name: "BookFlow Homepage",
-      category: "service",
-      status: "Customizable",
-      thumbClass: "template-thumb-booking",
-      image: createImportedTemplateImage(
-        "data/shuffle-imports/shuffle-2/public/flex-ui-assets/images/headers/header.jpg",
-        "BookFlow homepage imported from Shuffle",
-        "booking"
-      ),
-      shortDescription: "Scheduling-focused landing page baseline.",
-      longDescription: "Imported from Shuffle export (shuffle-2) and ready to adapt for service booking businesses.",
-      stack: "HTML/CSS/JS",
-      target: "Beta in 2 weeks",
-      clones: 42,
-      liveUrl: "template-live-bookflow-homepage.html",
-      perfectFor: ["Clinics", "Salons", "Fitness studios"],
-      techTags: ["HTML", "Tailwind", "Alpine.js", "Landing page"],
-      features: ["User authentication", "Notifications", "Admin dashboard"],
-    },
-    {
-      id: "bookflow-salon-booking",
-      name: "Salon Booking Landing",
-      category: "service",
-      status: "Fast launch",
-      thumbClass: "template-thumb-booking",
-      image: createImportedTemplateImage(
-        "data/shuffle-imports/shuffle-2/public/flex-ui-assets/images/features/stock2.png",
-        "Salon booking imported template preview",
-        "booking"
-      ),
-      shortDescription: "Beauty and salon appointment funnel.",
-      longDescription: "Derived from Shuffle BookFlow export and tailored for salons with online bookings and reminders.",
-      stack: "HTML/CSS/JS",
-      target: "Beta in 2 weeks",
-      clones: 18,
-      liveUrl: "template-live-bookflow-salon.html",
-      perfectFor: ["Beauty salons", "Barbershops", "Spa services"],
-      techTags: ["HTML", "Tailwind", "Booking funnel", "Lead capture"],
-      features: ["User authentication", "Notifications", "Admin dashboard"],
-    },
-    {
-      id: "bookflow-clinic-appointments",
-      name: "Clinic Appointments Landing",
-      category: "service",
-      status: "Customizable",
-      thumbClass: "template-thumb-booking",
-      image: createImportedTemplateImage(
-        "data/shuffle-imports/shuffle-2/public/flex-ui-assets/images/how-it-works/photo-video.png",
-        "Clinic appointments imported template preview",
-        "booking"
-      ),
-      shortDescription: "Healthcare scheduling homepage.",
-      longDescription: "Derived from Shuffle BookFlow export and focused on patient booking, trust sections, and contact flow.",
-      stack: "HTML/CSS/JS",
-      target: "Beta in 2 weeks",
-      clones: 15,
-      liveUrl: "template-live-bookflow-clinic.html",
-      perfectFor: ["Private clinics", "Dental offices", "Wellness centers"],
-      techTags: ["HTML", "Tailwind", "Appointments", "Service landing"],
-      features: ["User authentication", "Notifications", "Admin dashboard"],
-    },
-    {
-      id: "bookflow-fitness-classes",
-      name: "Fitness Class Booking",
-      category: "service",
-      status: "Popular",
-      thumbClass: "template-thumb-booking",
-      image: createImportedTemplateImage(
-        "data/shuffle-imports/shuffle-2/public/flex-ui-assets/images/headers/mockup-light1.png",
-        "Fitness booking imported template preview",
-        "booking"
-      ),
-      shortDescription: "Gym and class reservation starter.",
-      longDescription: "Derived from Shuffle BookFlow export and adapted for gyms, trainers, and studio class scheduling.",
-      stack: "HTML/CSS/JS",
-      target: "Beta in 2 weeks",
-      clones: 21,
-      liveUrl: "template-live-bookflow-fitness.html",
-      perfectFor: ["Gyms", "Personal trainers", "Studios"],
-      techTags: ["HTML", "Tailwind", "Class schedules", "CTA landing"],
-      features: ["User authentication", "Notifications", "Admin dashboard"],
-    },
-    {
-      id: "bookflow-consulting-calls",
-      name: "Consulting Call Scheduler",
-      category: "business",
-      status: "Featured",
-      thumbClass: "template-thumb-portal",
-      image: createImportedTemplateImage(
-        "data/shuffle-imports/shuffle-2/public/flex-ui-assets/images/teams/photo-employee1.png",
-        "Consulting scheduler imported template preview",
-        "portal"
-      ),
-      shortDescription: "Consultation and discovery call page.",
-      longDescription: "Derived from Shuffle BookFlow export and adapted for consultants booking discovery calls.",
-      stack: "HTML/CSS/JS",
-      target: "MVP in 1 month",
-      clones: 13,
-      liveUrl: "template-live-bookflow-consulting.html",
-      perfectFor: ["Consultants", "Agencies", "Coaches"],
-      techTags: ["HTML", "Tailwind", "Booking", "Conversion page"],
-      features: ["User authentication", "Notifications", "Admin dashboard"],
-    },
-    {
-      id: "support-helpdesk",
-      name: "Support Helpdesk",
-      category: "service",
-      status: "Customizable",
-      thumbClass: "template-thumb-helpdesk",
-      image: createTemplatePhotoImage("helpdesk", "Support helpdesk visual"),
-      shortDescription: "Ticket queues and SLA workflow.",
-      longDescription: "Best for support teams handling tickets, priorities, and service SLAs.",
-      stack: "Node API + React Frontend",
-      target: "MVP in 1 month",
-      clones: 238,
-      perfectFor: ["Support teams", "IT operations", "Customer success"],
-      techTags: ["Node API", "React", "SLA tracking", "Reporting"],
-      features: ["User authentication", "Team collaboration", "Notifications", "Analytics reports"],
-    },
-    {
-      id: "community-platform",
-      name: "Community Platform",
-      category: "community",
-      status: "Popular",
-      thumbClass: "template-thumb-community",
-      image: createTemplatePhotoImage("community", "Community platform visual"),
-      shortDescription: "Feeds, groups, moderation.",
-      longDescription: "Best for groups, memberships, and moderated social discussion spaces.",
-      stack: "React + Supabase",
-      target: "MVP in 1 month",
-      clones: 474,
-      perfectFor: ["Member clubs", "Forums", "Private communities"],
-      techTags: ["React", "Supabase", "Feeds", "Moderation"],
-      features: ["User authentication", "Team collaboration", "Notifications"],
-    },
-    {
-      id: "creator-membership-hub",
-      name: "Creator Membership Hub",
-      category: "community",
-      status: "Featured",
-      thumbClass: "template-thumb-membership",
-      image: createTemplatePhotoImage("membership", "Creator membership hub visual"),
-      shortDescription: "Paid content and member access.",
-      longDescription: "Best for creators selling premium content and gated member access.",
-      stack: "React + Supabase",
-      target: "MVP in 1 month",
-      clones: 329,
-      perfectFor: ["Creators", "Coaches", "Paid communities"],
-      techTags: ["React", "Supabase", "Billing", "Access control"],
-      features: ["User authentication", "Payments and billing", "Notifications", "Analytics reports"],
-    },
-    {
-      id: "crm-workspace",
-      name: "CRM Workspace",
-      category: "business",
-      status: "Enterprise ready",
-      thumbClass: "template-thumb-crm",
-      image: createTemplatePhotoImage("crm", "CRM workspace visual"),
-      shortDescription: "Leads, deals, team pipeline.",
-      longDescription: "Best for pipeline management, lead tracking, and sales follow-up operations.",
-      stack: "Node API + React Frontend",
-      target: "MVP in 1 month",
-      clones: 276,
-      perfectFor: ["Sales teams", "B2B services", "Revenue ops"],
-      techTags: ["Node API", "React", "Pipelines", "Dashboards"],
-      features: ["User authentication", "Team collaboration", "Admin dashboard", "Analytics reports"],
-    },
-    {
-      id: "hr-recruiting-portal",
-      name: "HR Recruiting Portal",
-      category: "business",
-      status: "Enterprise ready",
-      thumbClass: "template-thumb-hr",
-      image: createTemplatePhotoImage("hr", "HR recruiting portal visual"),
-      shortDescription: "Candidates, stages, interviews.",
-      longDescription: "Best for hiring teams managing candidates, stages, and interview processes.",
-      stack: "Node API + React Frontend",
-      target: "MVP in 1 month",
-      clones: 211,
-      perfectFor: ["HR teams", "Recruiters", "Talent operations"],
-      techTags: ["Node API", "React", "Hiring funnel", "Scorecards"],
-      features: ["User authentication", "Team collaboration", "Notifications", "Analytics reports"],
-    },
-    {
-      id: "real-estate-listings",
-      name: "Real Estate Listings",
-      category: "service",
-      status: "Customizable",
-      thumbClass: "template-thumb-realestate",
-      image: createTemplatePhotoImage("realestate", "Real estate listings visual"),
-      shortDescription: "Properties, tours, lead capture.",
-      longDescription: "Best for brokers and agencies showcasing properties and capturing buyer leads.",
-      stack: "React + Supabase",
-      target: "MVP in 1 month",
-      clones: 194,
-      perfectFor: ["Real estate agencies", "Property teams", "Independent brokers"],
-      techTags: ["React", "Supabase", "Listings", "Lead forms"],
-      features: ["User authentication", "Notifications", "Admin dashboard"],
-    },
-    {
-      id: "restaurant-ordering",
-      name: "Restaurant Ordering",
-      category: "service",
-      status: "Fast launch",
-      thumbClass: "template-thumb-restaurant",
-      image: createTemplatePhotoImage("restaurant", "Restaurant ordering visual"),
-      shortDescription: "Menu, orders, kitchen queue.",
-      longDescription: "Best for restaurants and food operators taking digital orders and tracking kitchen status.",
-      stack: "React + Supabase",
-      target: "Beta in 2 weeks",
-      clones: 448,
-      perfectFor: ["Restaurants", "Food trucks", "Cafe chains"],
-      techTags: ["React", "Supabase", "Ordering", "Kitchen queue"],
-      features: ["User authentication", "Payments and billing", "Notifications", "Admin dashboard"],
-    },
-  ];
-
-  const profileByPreset = {
-    saas: {
-      stack: "React + Supabase",
-      target: "MVP in 1 month",
-      techTags: ["React", "Supabase", "Dashboards", "Auth"],
-      features: ["User authentication", "Admin dashboard", "Analytics reports", "Team collaboration"],
-      perfectFor: ["Operations teams", "Service businesses", "Agencies"],
-    },
-    portal: {
-      stack: "React + Supabase",
-      target: "MVP in 1 month",
-      techTags: ["React", "Supabase", "Client portal", "File sharing"],
-      features: ["User authentication", "Team collaboration", "Notifications", "Admin dashboard"],
-      perfectFor: ["Client services", "Freelancers", "Agency teams"],
-    },
-    market: {
-      stack: "Next.js + PostgreSQL",
-      target: "Production in 2 months",
-      techTags: ["Next.js", "PostgreSQL", "Marketplace", "Payments"],
-      features: ["User authentication", "Payments and billing", "Notifications", "Admin dashboard"],
-      perfectFor: ["Marketplaces", "B2B directories", "Digital catalogs"],
-    },
-    store: {
-      stack: "Next.js + PostgreSQL",
-      target: "Production in 2 months",
-      techTags: ["Next.js", "PostgreSQL", "Checkout", "Catalog"],
-      features: ["User authentication", "Payments and billing", "Notifications", "Analytics reports"],
-      perfectFor: ["Retail brands", "Local stores", "Commerce teams"],
-    },
-    booking: {
-      stack: "React + Supabase",
-      target: "Beta in 2 weeks",
-      techTags: ["React", "Supabase", "Calendar", "Booking"],
-      features: ["User authentication", "Notifications", "Admin dashboard"],
-      perfectFor: ["Clinics", "Salons", "Coaches"],
-    },
-    helpdesk: {
-      stack: "Node API + React Frontend",
-      target: "MVP in 1 month",
-      techTags: ["Node API", "React", "Tickets", "SLA"],
-      features: ["User authentication", "Team collaboration", "Notifications", "Analytics reports"],
-      perfectFor: ["Support teams", "IT ops", "Customer success"],
-    },
-    community: {
-      stack: "React + Supabase",
-      target: "MVP in 1 month",
-      techTags: ["React", "Supabase", "Feeds", "Moderation"],
-      features: ["User authentication", "Team collaboration", "Notifications"],
-      perfectFor: ["Communities", "Networks", "Creator groups"],
-    },
-    membership: {
-      stack: "React + Supabase",
-      target: "MVP in 1 month",
-      techTags: ["React", "Supabase", "Membership", "Billing"],
-      features: ["User authentication", "Payments and billing", "Notifications", "Analytics reports"],
-      perfectFor: ["Creators", "Course sellers", "Private communities"],
-    },
-    crm: {
-      stack: "Node API + React Frontend",
-      target: "MVP in 1 month",
-      techTags: ["Node API", "React", "CRM", "Automation"],
-      features: ["User authentication", "Team collaboration", "Admin dashboard", "Analytics reports"],
-      perfectFor: ["Sales teams", "Service agencies", "Consultancies"],
-    },
-    hr: {
-      stack: "Node API + React Frontend",
-      target: "MVP in 1 month",
-      techTags: ["Node API", "React", "Recruiting", "Workflows"],
-      features: ["User authentication", "Team collaboration", "Notifications", "Analytics reports"],
-      perfectFor: ["HR teams", "Recruiters", "Hiring managers"],
-    },
-    realestate: {
-      stack: "React + Supabase",
-      target: "MVP in 1 month",
-      techTags: ["React", "Supabase", "Listings", "Lead capture"],
-      features: ["User authentication", "Notifications", "Admin dashboard"],
-      perfectFor: ["Real estate brokers", "Property teams", "Developers"],
-    },
-    restaurant: {
-      stack: "React + Supabase",
-      target: "Beta in 2 weeks",
-      techTags: ["React", "Supabase", "Menus", "Orders"],
-      features: ["User authentication", "Payments and billing", "Notifications", "Admin dashboard"],
-      perfectFor: ["Restaurants", "Food businesses", "Delivery teams"],
-    },
-  };
+// The catalog lives in data/template-catalog.json (plus any template-seed manifests). Pages that
+// list templates get this response embedded by the dev server; elsewhere it is loaded on first use.
+const TEMPLATE_CATALOG_URL = "/api/templates?pageSize=100";
+let templateCatalogCache = null;
 
-  const expansionSeeds = [
-    { name: "Task Management Flow", category: "business", preset: "saas", shortDescription: "Tasks, priorities, team workflow.", perfectFor: ["Project teams", "Operations managers"] },
-    { name: "Finance Performance Hub", category: "business", preset: "saas", shortDescription: "Revenue, KPIs, forecasting board.", perfectFor: ["Finance teams", "Founders"] },
-    { name: "Agency Delivery Desk", category: "business", preset: "portal", shortDescription: "Client updates, files, approvals.", perfectFor: ["Agencies", "Studios"] },
-    { name: "Legal Case Tracker", category: "business", preset: "portal", shortDescription: "Cases, documents, milestones.", perfectFor: ["Law firms", "Legal teams"] },
-    { name: "Quote And Proposal Manager", category: "business", preset: "crm", shortDescription: "Pipeline, quotes, deal status.", perfectFor: ["Sales teams", "Consultants"] },
-    { name: "Recruitment Command Center", category: "business", preset: "hr", shortDescription: "Applicants, interviews, scorecards.", perfectFor: ["Recruiting teams", "HR ops"] },
-    { name: "Inventory Operations Board", category: "business", preset: "saas", shortDescription: "Stock, reorder alerts, reports.", perfectFor: ["Warehouses", "Retail ops"] },
-    { name: "Service Business CRM", category: "business", preset: "crm", shortDescription: "Leads, follow-ups, account health.", perfectFor: ["Service companies", "B2B teams"] },
-    { name: "Artist Management Portal", category: "business", preset: "portal", shortDescription: "Bookings, events, contracts.", perfectFor: ["Talent agencies", "Managers"] },
-
-    { name: "Serenity Spa And Salon", category: "commerce", preset: "store", shortDescription: "Services catalog, booking, checkout.", perfectFor: ["Salons", "Beauty studios"] },
-    { name: "Burger Builder", category: "commerce", preset: "restaurant", shortDescription: "Menu builder, cart, online orders.", perfectFor: ["Fast-food brands", "Cloud kitchens"] },
-    { name: "Print Tee Studio", category: "commerce", preset: "store", shortDescription: "Custom product previews and checkout.", perfectFor: ["Print shops", "Merch brands"] },
-    { name: "Auto Parts Finder", category: "commerce", preset: "market", shortDescription: "Parts catalog and fitment filters.", perfectFor: ["Auto retailers", "Parts dealers"] },
-    { name: "Digital Download Market", category: "commerce", preset: "market", shortDescription: "Sell files, licenses, subscriptions.", perfectFor: ["Creators", "Digital sellers"] },
-    { name: "Local Market Delivery", category: "commerce", preset: "store", shortDescription: "Grocery catalog and delivery slots.", perfectFor: ["Grocers", "Local delivery teams"] },
-    { name: "Hotel Booking Engine", category: "commerce", preset: "booking", shortDescription: "Rooms, rates, guest checkout.", perfectFor: ["Hotels", "Vacation rentals"] },
-    { name: "Freelancer Marketplace", category: "commerce", preset: "market", shortDescription: "Talent listings and service checkout.", perfectFor: ["Agencies", "Freelancer platforms"] },
-    { name: "Pet Storefront", category: "commerce", preset: "store", shortDescription: "Products, subscriptions, loyalty.", perfectFor: ["Pet shops", "Niche brands"] },
-    { name: "Fitness Program Store", category: "commerce", preset: "store", shortDescription: "Workout plans and digital checkout.", perfectFor: ["Fitness coaches", "Gyms"] },
-
-    { name: "Creator Fan Community", category: "community", preset: "membership", shortDescription: "Member posts, gated spaces, perks.", perfectFor: ["Creators", "Influencer brands"] },
-    { name: "Coaching Cohort Hub", category: "community", preset: "community", shortDescription: "Discussions, lessons, milestones.", perfectFor: ["Coaches", "Mentors"] },
-    { name: "Gaming Community Arena", category: "community", preset: "community", shortDescription: "Guilds, chats, event schedule.", perfectFor: ["Gaming communities", "Esports groups"] },
-    { name: "Alumni Network Platform", category: "community", preset: "community", shortDescription: "Profiles, networking, events.", perfectFor: ["Schools", "University groups"] },
-    { name: "Neighborhood Exchange", category: "community", preset: "community", shortDescription: "Local posts, requests, updates.", perfectFor: ["Community groups", "Neighborhood teams"] },
-    { name: "Paid Newsletter Club", category: "community", preset: "membership", shortDescription: "Subscriber content and member perks.", perfectFor: ["Writers", "Media creators"] },
-    { name: "Learning Circle Community", category: "community", preset: "membership", shortDescription: "Cohorts, tasks, progress wall.", perfectFor: ["Course creators", "Schools"] },
-    { name: "Event Membership Club", category: "community", preset: "membership", shortDescription: "Tickets, private members, chat.", perfectFor: ["Event brands", "Community clubs"] },
-    { name: "Forum Plus Help Center", category: "community", preset: "helpdesk", shortDescription: "Community forum with support queue.", perfectFor: ["SaaS products", "Support communities"] },
-
-    { name: "Clinic Appointment Desk", category: "service", preset: "booking", shortDescription: "Patient booking and reminders.", perfectFor: ["Clinics", "Medical teams"] },
-    { name: "Home Services Scheduler", category: "service", preset: "booking", shortDescription: "Jobs, calendars, crew dispatch.", perfectFor: ["Field service teams", "Contractors"] },
-    { name: "Pool Marketing Calculator", category: "service", preset: "saas", shortDescription: "Lead forms and ROI estimator.", perfectFor: ["Marketing teams", "Pool service companies"] },
-    { name: "Pressure Washing Website", category: "service", preset: "realestate", shortDescription: "Lead capture and service booking.", perfectFor: ["Pressure washing teams", "Local businesses"] },
-    { name: "Mental Wellness Practice", category: "service", preset: "booking", shortDescription: "Sessions, intake, follow-up workflow.", perfectFor: ["Therapists", "Wellness clinics"] },
-    { name: "Car Wash Booking App", category: "service", preset: "booking", shortDescription: "Packages, schedules, payment flow.", perfectFor: ["Car wash teams", "Auto detailers"] },
-    { name: "Repair Ticket Center", category: "service", preset: "helpdesk", shortDescription: "Service tickets and status updates.", perfectFor: ["Repair shops", "Tech support teams"] },
-    { name: "Travel Itinerary Planner", category: "service", preset: "realestate", shortDescription: "Trip plans, bookings, reminders.", perfectFor: ["Travel agencies", "Tour planners"] },
-    { name: "Restaurant Table Booking", category: "service", preset: "restaurant", shortDescription: "Reservations, waitlist, guest notes.", perfectFor: ["Restaurants", "Hospitality teams"] },
-    { name: "Cyber Security Consultancy Site", category: "service", preset: "realestate", shortDescription: "Service pages, lead forms, audits.", perfectFor: ["Security consultants", "B2B firms"] },
-  ];
-
-  const statusCycle = ["Featured", "Popular", "Customizable", "Fast launch", "Enterprise ready"];
-  const slugify = (value) =>
-    String(value || "")
-      .toLowerCase()
-      .replace(/[^a-z0-9]+/g, "-")
-      .replace(/^-+|-+$/g, "")
-      .replace(/-{2,}/g, "-");
-
-  const usedIds = new Set(coreTemplates.map((item) => String(item.id || "")));
-  const expandedTemplates = expansionSeeds.map((seed, index) => {
-    const preset = String(seed.preset || "saas").toLowerCase();
-    const profile = profileByPreset[preset] || profileByPreset.saas;
-    const baseId = slugify(seed.name);
-    let id = baseId;
-    let suffix = 2;
-    while (usedIds.has(id)) {
-      id = `${baseId}-${suffix}`;
-      suffix += 1;
-    }
-    usedIds.add(id);
-
-    return {
-      id,
-      name: seed.name,
-      category: seed.category,
-      status: seed.status || statusCycle[index % statusCycle.length],
-      thumbClass: `template-thumb-${preset}`,
-      image: createTemplatePhotoImage(preset, `${seed.name} template preview`),
-      shortDescription: seed.shortDescription,
-      longDescription: `${seed.shortDescription} Built for ${seed.perfectFor.join(", ").toLowerCase()} with launch-ready structure.`,
-      stack: seed.stack || profile.stack,
-      target: seed.target || profile.target,
-      clones: Number(seed.clones || 120 + ((index * 37) % 880)),
-      perfectFor: Array.isArray(seed.perfectFor) && seed.perfectFor.length > 0 ? seed.perfectFor : profile.perfectFor,
-      techTags: Array.isArray(seed.techTags) && seed.techTags.length > 0 ? seed.techTags : profile.techTags,
-      features: Array.isArray(seed.features) && seed.features.length > 0 ? seed.features : profile.features,
-    };
-  });
+function loadTemplateCatalogPayload() {
+  const embedded = takeBootstrapPayload(TEMPLATE_CATALOG_URL);
+  if (embedded !== undefined) return embedded;
+  // Callers render synchronously, so the fallback has to block.
+  try {
+    const request = new XMLHttpRequest();
+    request.open("GET", TEMPLATE_CATALOG_URL, false);
+    request.send();
+    return request.status === 200 ? JSON.parse(request.responseText) : null;
+  } catch (_error) {
+    return null;
+  }
+}
 
-  const templates = [...coreTemplates, ...expandedTemplates];
-  return templates.map((item) => ({
-    status: "Customizable",
-    clones: 0,
-    perfectFor: [],
-    techTags: [],
-    liveUrl: `template-live.html?template=${item.id}`,
-    ...item,
-  }));
+function getTemplateCatalog() {
+  if (templateCatalogCache !== null) return templateCatalogCache;
+  const payload = loadTemplateCatalogPayload();
+  const templates = payload && Array.isArray(payload.templates) ? payload.templates : [];
+  templateCatalogCache = templates
+    .filter((item) => item && typeof item === "object" && item.id && item.name)
+    .map((item) => {
+      const preset = String(item.thumbClass || "").replace(/^template-thumb-/, "") || "saas";
+      const image = item.image && typeof item.image === "object" ? item.image : {};
+      return {
+        thumbClass: `template-thumb-${preset}`,
+        features: [],
+        ...item,
+        image: createImportedTemplateImage(image.src, image.alt || `${item.name} template preview`, preset),
+      };
+    });
+  return templateCatalogCache;
 }
 
 function findTemplateById(templateId) {
@@ -1885,6 +1445,10 @@ function initTemplatesPage() {
   const catalogCount = document.querySelector("#templatesCatalogCount");
   const templates = getTemplateCatalog();
   let activeTag = "all";
+  // Rank of each template id for the current search, from /api/templates; null falls back to local matching.
+  let serverRanking = null;
+  let searchSequence = 0;
+  let searchTimer = 0;
 
   const deriveDiscoverTags = (template) => {
     const statusLabel = getTemplateStatusLabel(template.status || "Customizable");
@@ -1901,7 +1465,7 @@ function initTemplatesPage() {
 
   const renderCards = () => {
     grid.innerHTML = templates
-      .map((template) => {
+      .map((template, index) => {
         const discoverTags = deriveDiscoverTags(template);
         const descriptionSearchText = [
           template.shortDescription,
@@ -1921,6 +1485,8 @@ function initTemplatesPage() {
           <article
             class="template-showcase-card"
             data-template-card
+            data-template-id="${escapeAttribute(String(template.id || ""))}"
+            data-order="${index}"
             data-category="${escapeAttribute(String(template.category || ""))}"
             data-name="${escapeAttribute(String(template.name || ""))}"
             data-description="${escapeAttribute(descriptionSearchText)}"
@@ -2009,19 +1575,29 @@ function initTemplatesPage() {
     const searchValue = searchInput instanceof HTMLInputElement ? searchInput.value.trim().toLowerCase() : "";
     let visibleCount = 0;
 
+    const ranking = searchValue ? serverRanking : null;
+
     cards.forEach((card) => {
       const category = String(card.getAttribute("data-category") || "").toLowerCase();
       const name = String(card.getAttribute("data-name") || "").toLowerCase();
       const description = String(card.getAttribute("data-description") || "").toLowerCase();
       const tags = String(card.getAttribute("data-tags") || "").toLowerCase();
       const categoryMatch = activeCategory === "all" || category === activeCategory;
-      const searchMatch = !searchValue || name.includes(searchValue) || description.includes(searchValue);
+      const searchMatch = ranking
+        ? ranking.has(String(card.getAttribute("data-template-id") || ""))
+        : !searchValue || name.includes(searchValue) || description.includes(searchValue);
       const tagMatch = activeTag === "all" || tags.includes(activeTag);
       const visible = categoryMatch && searchMatch && tagMatch;
       if (visible) visibleCount += 1;
       card.classList.toggle("hidden", !visible);
     });
 
+    const rankOf = (card) => {
+      const id = String(card.getAttribute("data-template-id") || "");
+      return ranking && ranking.has(id) ? ranking.get(id) : templates.length + Number(card.getAttribute("data-order") || 0);
+    };
+    cards.sort((a, b) => rankOf(a) - rankOf(b)).forEach((card) => grid.appendChild(card));
+
     if (catalogCount instanceof HTMLElement) {
       catalogCount.textContent = getTemplateCountLabel(visibleCount);
     }
@@ -2036,8 +1612,37 @@ function initTemplatesPage() {
     });
   }
 
+  const fetchSearchRanking = async () => {
+    const searchValue = searchInput instanceof HTMLInputElement ? searchInput.value.trim() : "";
+    const sequence = ++searchSequence;
+    if (!searchValue) {
+      serverRanking = null;
+      applyFilters();
+      return;
+    }
+    let ranking = null;
+    try {
+      const params = new URLSearchParams({ q: searchValue, pageSize: "100" });
+      const response = await fetch(`/api/templates?${params.toString()}`);
+      const data = await response.json();
+      if (response.ok && data.ok && Array.isArray(data.templates) && data.total <= data.templates.length) {
+        ranking = new Map(data.templates.map((template, index) => [String(template.id || ""), index]));
+      }
+    } catch {
+      ranking = null;
+    }
+    if (sequence !== searchSequence) return;
+    serverRanking = ranking;
+    applyFilters();
+  };
+
   if (searchInput instanceof HTMLInputElement) {
-    searchInput.addEventListener("input", applyFilters);
+    searchInput.addEventListener("input", () => {
+      serverRanking = null;
+      applyFilters();
+      window.clearTimeout(searchTimer);
+      searchTimer = window.setTimeout(fetchSearchRanking, 150);
+    });
   }
 
   renderCards();
@@ -2476,7 +2081,7 @@ function initOnboardingAICoach() {
 
   const loadProviderHealth = async () => {
     try {
-      const response = await fetch("/api/provider-health");
+      const response = await bootstrapFetch("/api/provider-health");
       const payload = await response.json();
       if (!response.ok || !payload.ok) throw new Error(payload.error || "Provider health unavailable");
       const providers = Array.isArray(payload.providers) ? payload.providers : [];
@@ -2767,7 +2372,7 @@ function initGuidePage() {
 
   const loadProviderHealth = async () => {
     try {
-      const response = await fetch("/api/provider-health");
+      const response = await bootstrapFetch("/api/provider-health");
       const payload = await response.json();
       if (!response.ok || !payload.ok) throw new Error(payload.error || "Provider health unavailable");
       const providers = Array.isArray(payload.providers) ? payload.providers : [];
@@ -2795,7 +2400,7 @@ function initGuidePage() {
 
   const loadProjects = async () => {
     try {
-      const response = await fetch("/api/projects");
+      const response = await bootstrapFetch("/api/projects");
       const payload = await response.json();
       if (!response.ok || !payload.ok) throw new Error(payload.error || "Projects unavailable");
       const projects = Array.isArray(payload.projects) ? payload.projects : [];
@@ -2815,7 +2420,7 @@ function initGuidePage() {
     };
 
     try {
-      const configResponse = await fetch("/api/auth-config");
+      const configResponse = await bootstrapFetch("/api/auth-config");
       const configPayload = await configResponse.json();
       if (configResponse.ok && configPayload.ok) {
         authState.bootstrapRequired = Boolean(configPayload.bootstrapRequired);
@@ -3633,7 +3238,7 @@ function initAppBuilder() {
 
   const loadProviderHealth = async () => {
     try {
-      const response = await fetch("/api/provider-health");
+      const response = await bootstrapFetch("/api/provider-health");
       const payload = await response.json();
       if (!response.ok || !payload.ok) throw new Error(payload.error || "Provider health unavailable");
       const providers = Array.isArray(payload.providers) ? payload.providers : [];
@@ -5173,7 +4778,7 @@ async function initProjectsPage() {
     list.innerHTML = "";
 
     try {
-      const response = await fetch("/api/projects");
+      const response = await bootstrapFetch("/api/projects");
       const payload = await response.json();
 
       if (!response.ok || !payload.ok) {
@@ -5446,6 +5051,7 @@ async function initOpsPage() {
       }
     }
 
+    syncEventStream(signedIn);
     if (signedIn && currentUser.role === "owner") {
       await loadUsers();
     } else {
@@ -5453,6 +5059,59 @@ async function initOpsPage() {
     }
   };
 
+  const renderQueue = () => {
+    const requests = queueRequests;
+    if (requests.length === 0) {
+      statusNode.textContent = "No requests in queue.";
+      list.innerHTML = "";
+      renderOpsAICoach();
+      return;
+    }
+
+    statusNode.textContent = `${requests.length} request(s) in queue`;
+    list.innerHTML = requests
+      .slice(0, 40)
+      .map((request) => {
+        const requestId = String(request.requestId || "");
+        const currentStatus = String(request.status || "submitted").toLowerCase();
+        const statusClass = `status-chip status-${escapeAttribute(currentStatus.replaceAll("_", "-"))}`;
+        const items = Array.isArray(request.items)
+          ? request.items.map((item) => `${item.providerName}: ${item.planLabel}`).join(", ")
+          : "No items";
+
+        const statusOptions = getRequestStatusOptions()
+          .map((status) => `<option value="${status}" ${status === currentStatus ? "selected" : ""}>${status}</option>`)
+          .join("");
+
+        return `
+          <article class="ops-request-card" data-request-id="${escapeAttribute(requestId)}">
+            <div class="ops-request-header">
+              <h3>${escapeHtml(requestId)}</h3>
+              <span class="${statusClass}">${escapeHtml(currentStatus)}</span>
+            </div>
+            <p><strong>Project:</strong> ${escapeHtml(String(request.projectName || ""))}</p>
+            <p><strong>Customer:</strong> ${escapeHtml(String(request.customerName || ""))} (${escapeHtml(String(request.email || ""))})</p>
+            <p><strong>Items:</strong> ${escapeHtml(items)}</p>
+            <p><strong>Total:</strong> $${Number(request.total || 0).toFixed(2)}</p>
+            <p><strong>Updated:</strong> ${escapeHtml(formatIsoDate(String(request.updatedAt || request.createdAt || "")))}</p>
+            <div class="ops-actions">
+              <label class="form-field">
+                Status
+                <select data-status-select>${statusOptions}</select>
+              </label>
+              <button class="btn btn-ghost btn-inline" type="button" data-ops-action="set-status">Update Status</button>
+              <button class="btn btn-primary btn-inline" type="button" data-ops-action="provision-all">Provision Now</button>
+              <button class="btn btn-ghost btn-inline" type="button" data-ops-action="retry-failed">Retry Failed</button>
+              <button class="btn btn-ghost btn-inline" type="button" data-ops-action="suggest-domains">Suggest Domains</button>
+            </div>
+            <div class="ops-actions" data-domain-suggestions></div>
+          </article>
+        `;
+      })
+      .join("");
+    renderOpsAICoach();
+  };
+
   const loadRequests = async () => {
     statusNode.textContent = "Loading request queue...";
     list.innerHTML = "";
@@ -5462,52 +5121,7 @@ async function initOpsPage() {
       if (!response.ok || !payload.ok) throw new Error(payload.error || "Queue unavailable");
       const requests = Array.isArray(payload.requests) ? payload.requests : [];
       queueRequests = requests;
-      if (requests.length === 0) {
-        statusNode.textContent = "No requests in queue.";
-        renderOpsAICoach();
-        return;
-      }
-
-      statusNode.textContent = `${requests.length} request(s) in queue`;
-      list.innerHTML = requests
-        .slice(0, 40)
-        .map((request) => {
-          const requestId = String(request.requestId || "");
-          const currentStatus = String(request.status || "submitted").toLowerCase();
-          const statusClass = `status-chip status-${escapeAttribute(currentStatus.replaceAll("_", "-"))}`;
-          const items = Array.isArray(request.items)
-            ? request.items.map((item) => `${item.providerName}: ${item.planLabel}`).join(", ")
-            : "No items";
-
-          const statusOptions = getRequestStatusOptions()
-            .map((status) => `<option value="${status}" ${status === currentStatus ? "selected" : ""}>${status}</option>`)
-            .join("");
-
-          return `
-            <article class="ops-request-card" data-request-id="${escapeAttribute(requestId)}">
-              <div class="ops-request-header">
-                <h3>${escapeHtml(requestId)}</h3>
-                <span class="${statusClass}">${escapeHtml(currentStatus)}</span>
-              </div>
-              <p><strong>Project:</strong> ${escapeHtml(String(request.projectName || ""))}</p>
-              <p><strong>Customer:</strong> ${escapeHtml(String(request.customerName || ""))} (${escapeHtml(String(request.email || ""))})</p>
-              <p><strong>Items:</strong> ${escapeHtml(items)}</p>
-              <p><strong>Total:</strong> $${Number(request.total || 0).toFixed(2)}</p>
-              <p><strong>Updated:</strong> ${escapeHtml(formatIsoDate(String(request.updatedAt || request.createdAt || "")))}</p>
-              <div class="ops-actions">
-                <label class="form-field">
-                  Status
-                  <select data-status-select>${statusOptions}</select>
-                </label>
-                <button class="btn btn-ghost btn-inline" type="button" data-ops-action="set-status">Update Status</button>
-                <button class="btn btn-primary btn-inline" type="button" data-ops-action="provision-all">Provision Now</button>
-                <button class="btn btn-ghost btn-inline" type="button" data-ops-action="retry-failed">Retry Failed</button>
-              </div>
-            </article>
-          `;
-        })
-        .join("");
-      renderOpsAICoach();
+      renderQueue();
     } catch (_error) {
       queueRequests = [];
       statusNode.textContent = "Queue unavailable. Run python3 dev_server.py.";
@@ -5515,6 +5129,60 @@ async function initOpsPage() {
     }
   };
 
+  let eventStream = null;
+
+  const applyRequestEvent = (type, data) => {
+    const requestId = String(data.requestId || "");
+    if (!requestId) return;
+    const index = queueRequests.findIndex((item) => String(item.requestId || "") === requestId);
+    if (type === "request.created") {
+      if (index !== -1) return;
+      queueRequests = [data, ...queueRequests];
+    } else {
+      if (index === -1) return;
+      const current = queueRequests[index];
+      const next = { ...current, status: data.status || current.status, updatedAt: data.updatedAt || current.updatedAt };
+      if (Array.isArray(data.provisioning)) next.provisioning = data.provisioning;
+      queueRequests = queueRequests.map((item, itemIndex) => (itemIndex === index ? next : item));
+    }
+    renderQueue();
+  };
+
+  const syncEventStream = (signedIn) => {
+    if (!signedIn || typeof EventSource === "undefined") {
+      if (eventStream) eventStream.close();
+      eventStream = null;
+      return;
+    }
+    const token = getOpsSessionToken() || getOpsToken();
+    if (eventStream || !token) return;
+    eventStream = new EventSource(`/api/events?token=${encodeURIComponent(token)}`);
+    ["request.created", "request.status", "request.provisioning"].forEach((type) => {
+      eventStream.addEventListener(type, (event) => {
+        try {
+          applyRequestEvent(type, JSON.parse(event.data));
+        } catch (_error) {
+          // Ignore malformed events; the next reset or refresh reloads the queue.
+        }
+      });
+    });
+    eventStream.addEventListener("requests.archived", (event) => {
+      try {
+        const archivedIds = new Set(JSON.parse(event.data).requestIds || []);
+        queueRequests = queueRequests.filter((item) => !archivedIds.has(String(item.requestId || "")));
+        renderQueue();
+      } catch (_error) {
+        // Ignore malformed events; the next reset or refresh reloads the queue.
+      }
+    });
+    eventStream.addEventListener("reset", () => {
+      loadRequests();
+    });
+    eventStream.onerror = () => {
+      if (eventStream && eventStream.readyState === EventSource.CLOSED) eventStream = null;
+    };
+  };
+
   const submitProvision = async (requestId, retryFailed) => {
     const payload = {
       requestId,
@@ -5554,7 +5222,7 @@ async function initOpsPage() {
 
   const loadProviderHealth = async () => {
     try {
-      const response = await fetch("/api/provider-health");
+      const response = await bootstrapFetch("/api/provider-health");
       const payload = await response.json();
       if (!response.ok || !payload.ok) throw new Error(payload.error || "Provider health unavailable");
       const providers = Array.isArray(payload.providers) ? payload.providers : [];
@@ -5573,7 +5241,7 @@ async function initOpsPage() {
 
   const refreshAuthState = async () => {
     try {
-      const configResponse = await fetch("/api/auth-config");
+      const configResponse = await bootstrapFetch("/api/auth-config");
       const configPayload = await configResponse.json();
       if (configResponse.ok && configPayload.ok) {
         authConfig = {
@@ -5615,6 +5283,12 @@ async function initOpsPage() {
   list.addEventListener("click", async (event) => {
     const target = event.target;
     if (!(target instanceof Element)) return;
+    const pick = target.closest("[data-domain-pick]");
+    if (pick instanceof HTMLElement && domainInput instanceof HTMLInputElement) {
+      domainInput.value = pick.dataset.domainPick || "";
+      statusNode.textContent = `Domain override set to ${domainInput.value}.`;
+      return;
+    }
     const button = target.closest("[data-ops-action]");
     if (!(button instanceof HTMLButtonElement)) return;
     const card = button.closest("[data-request-id]");
@@ -5628,6 +5302,29 @@ async function initOpsPage() {
     button.textContent = "Working...";
 
     try {
+      if (action === "suggest-domains") {
+        const request = queueRequests.find((item) => String(item.requestId || "") === requestId) || {};
+        const response = await fetch(
+          `/api/domain-suggestions?name=${encodeURIComponent(String(request.projectName || ""))}`,
+          { headers: buildAdminHeaders() }
+        );
+        const result = await response.json();
+        if (!response.ok || !result.ok) throw new Error(result.error || "Domain search failed");
+        const suggestions = Array.isArray(result.suggestions) ? result.suggestions : [];
+        const suggestionsRoot = card.querySelector("[data-domain-suggestions]");
+        if (suggestionsRoot) {
+          suggestionsRoot.innerHTML = suggestions.length
+            ? suggestions
+                .map((item) => {
+                  const domain = String(item.domain || "");
+                  const price = item.price ? ` (${escapeHtml(String(item.price))})` : "";
+                  return `<button class="btn btn-ghost btn-inline" type="button" data-domain-pick="${escapeAttribute(domain)}">${escapeHtml(domain)}${price}</button>`;
+                })
+                .join("")
+            : "<p class='muted'>No available domains found.</p>";
+        }
+        return;
+      }
       if (action === "set-status") {
         const select = card.querySelector("[data-status-select]");
         if (!(select instanceof HTMLSelectElement)) throw new Error("Missing status selector");
@@ -6083,7 +5780,7 @@ async function initServicesPage() {
   const loadCatalog = async () => {
     catalogRoot.innerHTML = "<p class='muted'>Loading provider catalog...</p>";
     try {
-      const response = await fetch("/api/providers");
+      const response = await bootstrapFetch("/api/providers");
       const payload = await response.json();
       if (!response.ok || !payload.ok) throw new Error(payload.error || "Catalog unavailable");
       catalog = payload.catalog || { providers: [] };
@@ -6102,7 +5799,7 @@ async function initServicesPage() {
     if (!providerHealthRoot) return;
     providerHealthRoot.innerHTML = "<p class='muted'>Checking provider API configuration...</p>";
     try {
-      const response = await fetch("/api/provider-health");
+      const response = await bootstrapFetch("/api/provider-health");
       const payload = await response.json();
       if (!response.ok || !payload.ok) throw new Error(payload.error || "Provider health unavailable");
       const providers = Array.isArray(payload.providers) ? payload.providers : [];
@@ -6117,11 +5814,17 @@ async function initServicesPage() {
           const configured = Boolean(provider.configured);
           const required = Array.isArray(provider.required) ? provider.required.join(", ") : "";
           const note = String(provider.note || "");
+          const live = provider.live && typeof provider.live === "object" ? provider.live : {};
+          let liveText = "";
+          if (live.state === "ok") liveText = `Reachable (${Number(live.latencyMs || 0)} ms)`;
+          if (live.state === "error") liveText = `Unreachable: ${String(live.error || "check failed")}`;
+          if (live.state === "pending") liveText = "Live check pending";
           return `
             <div class="provider-health-item ${configured ? "is-ready" : "is-missing"}">
               <strong>${escapeHtml(String(provider.id || "provider"))}</strong>
               <span>${configured ? "Configured" : "Missing keys"}</span>
               <small>${escapeHtml(required)}</small>
+              ${liveText ? `<small>${escapeHtml(liveText)}</small>` : ""}
               ${note ? `<small>${escapeHtml(note)}</small>` : ""}
             </div>
           `;
@@ -6244,12 +5947,14 @@ async function initServicesPage() {
       })),
     };
 
+    const idempotency = claimIdempotencyKey("/api/service-request", payload);
     try {
       const response = await fetch("/api/service-request", {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
+        headers: { "Content-Type": "application/json", "Idempotency-Key": idempotency.key },
         body: JSON.stringify(payload),
       });
+      releaseIdempotencyKey(idempotency);
       const result = await response.json();
       if (!response.ok || !result.ok) throw new Error(result.error || "Submission failed");
 
@@ -6415,7 +6120,7 @@ async function initProviderSetupPage() {
 
   const refreshHealth = async () => {
     try {
-      const response = await fetch("/api/provider-health");
+      const response = await bootstrapFetch("/api/provider-health");
       const payload = await response.json();
       if (!response.ok || !payload.ok) throw new Error(payload.error || "Health check failed");
       renderHealth(payload.providers);
@@ -6503,12 +6208,14 @@ async function initProviderSetupPage() {
 }
 
 async function provisionServiceRequest(payload) {
+  const idempotency = claimIdempotencyKey("/api/provision-request", payload);
   try {
     const response = await fetch("/api/provision-request", {
       method: "POST",
-      headers: buildAdminHeaders({ "Content-Type": "application/json" }),
+      headers: buildAdminHeaders({ "Content-Type": "application/json", "Idempotency-Key": idempotency.key }),
       body: JSON.stringify(payload),
     });
+    releaseIdempotencyKey(idempotency);
     const result = await response.json();
     if (!response.ok || !result.ok) {
       return { ok: false, error: result.error || "Provisioning request failed" };
@@ -7099,6 +6806,26 @@ function setOpsSessionToken(token) {
   }
 }
 
+// Identical submissions share a key until the server answers, so double-clicks and
+// retries after a dropped connection replay the first result instead of running twice.
+const pendingIdempotencyKeys = new Map();
+
+function claimIdempotencyKey(route, payload) {
+  const fingerprint = `${route}:${JSON.stringify(payload)}`;
+  if (!pendingIdempotencyKeys.has(fingerprint)) {
+    const key =
+      window.crypto && typeof window.crypto.randomUUID === "function"
+        ? window.crypto.randomUUID()
+        : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+    pendingIdempotencyKeys.set(fingerprint, key);
+  }
+  return { fingerprint, key: pendingIdempotencyKeys.get(fingerprint) };
+}
+
+function releaseIdempotencyKey(claim) {
+  pendingIdempotencyKeys.delete(claim.fingerprint);
+}
+
 function buildAdminHeaders(baseHeaders = {}) {
   const headers = { ...baseHeaders };
   const token = getOpsToken();
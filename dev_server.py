@@ -1,22 +1,41 @@
 #!/usr/bin/env python3
 """Local development server for islaAPP with scaffold and project APIs."""
 
+# ruff: noqa: E402 - the boot timestamp is taken before the remaining imports so startup stats include them.
 from __future__ import annotations
 
+import time
+
+BOOT_STARTED = time.perf_counter()
+
+import base64
+import bisect
+import csv
+import gzip
+import io
 import json
+import mimetypes
 import hmac
 import hashlib
 import os
+import queue
+import random
 import re
 import secrets
+import socket
+import stat
+import sys
+import threading
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta, timezone
+from email.utils import formatdate, parsedate_to_datetime
 from http import HTTPStatus
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any
-from urllib import error as urlerror
-from urllib import request as urlrequest
-from urllib.parse import urlencode, urlparse
+from typing import Any, Iterator
+from urllib.parse import parse_qs, unquote, urlencode, urlparse
+
+IMPORTS_DONE = time.perf_counter()
 
 ROOT = Path(__file__).resolve().parent
 PROJECTS_DIR = ROOT / "projects"
@@ -25,6 +44,15 @@ SERVICE_REQUESTS_FILE = DATA_DIR / "service-requests.json"
 AUTH_USERS_FILE = DATA_DIR / "auth-users.json"
 AUTH_SESSIONS_FILE = DATA_DIR / "auth-sessions.json"
 PROVIDER_CONFIG_FILE = DATA_DIR / "provider-config.json"
+IDEMPOTENCY_FILE = DATA_DIR / "idempotency-keys.json"
+ARCHIVE_DIR = DATA_DIR / "archive"
+BLOBS_DIR = DATA_DIR / "blobs"
+ASSET_MANIFEST_FILE = DATA_DIR / "asset-manifest.json"
+SESSION_KEY_FILE = DATA_DIR / "session-signing-key"
+SESSION_REVOCATIONS_FILE = DATA_DIR / "session-revocations.json"
+# Shipped content rather than runtime state, so it stays under ROOT when DATA_DIR moves.
+TEMPLATE_CATALOG_FILE = ROOT / "data" / "template-catalog.json"
+TEMPLATE_SEED_DIR = ROOT / "data" / "shuffle-imports"
 IS_RENDER = bool(str(os.environ.get("RENDER", "")).strip()) or bool(str(os.environ.get("RENDER_SERVICE_ID", "")).strip())
 HOST = "0.0.0.0" if IS_RENDER else (os.environ.get("HOST", "0.0.0.0").strip() or "0.0.0.0")
 _default_port = "10000" if IS_RENDER else "4173"
@@ -35,6 +63,147 @@ except ValueError:
     PORT = int(_default_port)
 if PORT < 1 or PORT > 65535:
     PORT = int(_default_port)
+
+
+def _int_setting(name: str, default: int, minimum: int = 0) -> int:
+    raw = str(os.environ.get(name, "")).strip()
+    try:
+        value = int(raw) if raw else default
+    except ValueError:
+        value = default
+    return max(minimum, value)
+
+
+def _bool_setting(name: str, default: bool) -> bool:
+    raw = str(os.environ.get(name, "")).strip().lower()
+    if not raw:
+        return default
+    return raw in {"1", "true", "yes", "y", "on"}
+
+
+_raw_access_log = str(os.environ.get("ACCESS_LOG_FILE", "")).strip()
+ACCESS_LOG_FILE: Path | None = (
+    None if _raw_access_log.lower() in {"off", "none", "-"} else Path(_raw_access_log or DATA_DIR / "logs" / "access.log")
+)
+ACCESS_LOG_STDOUT = _bool_setting("ACCESS_LOG_STDOUT", True)
+ACCESS_LOG_MAX_BYTES = _int_setting("ACCESS_LOG_MAX_BYTES", 10 * 1024 * 1024, minimum=64 * 1024)
+ACCESS_LOG_BACKUPS = _int_setting("ACCESS_LOG_BACKUPS", 5, minimum=1)
+ACCESS_LOG_QUEUE_SIZE = _int_setting("ACCESS_LOG_QUEUE_SIZE", 10000, minimum=100)
+ACCESS_LOG_FLUSH_SECONDS = 0.5
+QUIET_ROUTES = {"/healthz", "/api/healthz", "/api/livez", "/api/readyz"}
+READINESS_CHECK_SECONDS = _int_setting("READINESS_CHECK_SECONDS", 15, minimum=1)
+MAX_ACTIVE_REQUESTS = _int_setting("MAX_ACTIVE_REQUESTS", 64, minimum=1)
+SERVER_WARMUP = _bool_setting("SERVER_WARMUP", True)
+PRECOMPRESS_DIRS = ["", "css", "js"]
+PRECOMPRESS_SUFFIXES = {".html", ".js", ".css", ".svg", ".json", ".txt"}
+PRECOMPRESS_MIN_BYTES = 1024
+STATIC_SENDFILE = _bool_setting("STATIC_SENDFILE", True) and hasattr(os, "sendfile")
+STATIC_FILE_CACHE_ENTRIES = _int_setting("STATIC_FILE_CACHE_ENTRIES", 256, minimum=8)
+STATIC_STAT_INTERVAL_SECONDS = 1.0
+STATIC_COPY_CHUNK_BYTES = 64 * 1024
+STATIC_MAX_RANGES = 16
+STATIC_BODY_CACHE_BYTES = _int_setting("STATIC_BODY_CACHE_BYTES", 32 * 1024 * 1024, minimum=0)
+STATIC_BODY_MAX_FILE_BYTES = _int_setting("STATIC_BODY_MAX_FILE_BYTES", 1024 * 1024, minimum=0)
+ASSET_DEDUP_ENABLED = _bool_setting("ASSET_DEDUP_ENABLED", True)
+# Earlier folders win when choosing which copy of a duplicated file backs its canonical URL.
+ASSET_SOURCE_DIRS = ["flex-ui-assets", "images", "data/shuffle-imports"]
+# Only self-contained media; HTML/CSS/JS would break their relative references if moved.
+ASSET_DEDUP_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".svg", ".ico", ".woff", ".woff2", ".ttf", ".otf", ".mp4", ".webm"
+}
+ASSET_URL_PREFIX = "/assets/"
+ASSET_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+ASSET_REDIRECT_CACHE_CONTROL = "public, max-age=3600"
+TEMPLATE_PAGE_SIZE = 12
+TEMPLATE_MAX_PAGE_SIZE = 100
+# The whole catalog in one page; app.js asks for exactly this URL.
+TEMPLATE_CATALOG_ROUTE = f"/api/templates?pageSize={TEMPLATE_MAX_PAGE_SIZE}"
+BOOTSTRAP_INLINE = _bool_setting("BOOTSTRAP_INLINE", True)
+# Pages that get the first response of these public GET endpoints embedded as JSON.
+BOOTSTRAP_PAGES = {
+    "/ops.html": ("/api/auth-config", "/api/provider-health"),
+    "/services.html": ("/api/providers", "/api/provider-health"),
+    "/setup.html": ("/api/provider-health",),
+    "/projects.html": ("/api/projects",),
+    # getTemplateCatalog() renders synchronously from this response.
+    "/templates.html": (TEMPLATE_CATALOG_ROUTE,),
+    "/template-view.html": (TEMPLATE_CATALOG_ROUTE,),
+    "/template-live.html": (TEMPLATE_CATALOG_ROUTE,),
+    "/use-cases.html": (TEMPLATE_CATALOG_ROUTE,),
+    "/app-builder.html": (TEMPLATE_CATALOG_ROUTE,),
+}
+BUNDLE_ENABLED = _bool_setting("BUNDLE_ENABLED", False)
+BUNDLE_DIR = ROOT / "dist"
+BUNDLE_MANIFEST_FILE = BUNDLE_DIR / "manifest.json"
+BUNDLE_URL_PREFIX = "/dist/"
+BUNDLE_FILE_PATTERN = re.compile(rf"^{BUNDLE_URL_PREFIX}[\w-]+\.[0-9a-f]{{16}}\.(?:js|css)$")
+BUNDLE_SCRIPT = "app.js"
+BUNDLE_STYLESHEET = "styles.css"
+TEMPLATE_INDEX_CHECK_SECONDS = 1.0
+TEMPLATE_FIELD_WEIGHTS = {"name": 8, "category": 4, "techTags": 4, "perfectFor": 4, "stack": 2, "shortDescription": 1}
+STARTUP_STATS: dict[str, float | None] = {
+    "importMs": round((IMPORTS_DONE - BOOT_STARTED) * 1000, 2),
+    "warmupMs": None,
+    "readyMs": None,
+    "firstByteMs": None,
+}
+SERVER_STATE = {"ready": False}
+READINESS: dict[str, Any] = {"dataDirWritable": None, "requestStoreLoaded": None, "checkedAt": ""}
+HTTP_KEEPALIVE = _bool_setting("HTTP_KEEPALIVE", True)
+KEEPALIVE_IDLE_SECONDS = _int_setting("KEEPALIVE_IDLE_SECONDS", 15, minimum=1)
+KEEPALIVE_MAX_REQUESTS = _int_setting("KEEPALIVE_MAX_REQUESTS", 100, minimum=1)
+KEEPALIVE_DRAIN_BYTES = 65536
+MAX_BODY_BYTES = _int_setting("MAX_BODY_BYTES", 64 * 1024, minimum=1024)
+AUTH_MAX_BODY_BYTES = _int_setting("AUTH_MAX_BODY_BYTES", 8 * 1024, minimum=1024)
+AI_BUILD_MAX_BODY_BYTES = _int_setting("AI_BUILD_MAX_BODY_BYTES", 256 * 1024, minimum=1024)
+BULK_MAX_BODY_BYTES = _int_setting("BULK_MAX_BODY_BYTES", 1024 * 1024, minimum=1024)
+# Routes not listed here get MAX_BODY_BYTES.
+BODY_LIMITS = {
+    "/api/auth-bootstrap": AUTH_MAX_BODY_BYTES,
+    "/api/auth-login": AUTH_MAX_BODY_BYTES,
+    "/api/auth-logout": AUTH_MAX_BODY_BYTES,
+    "/api/auth-users": AUTH_MAX_BODY_BYTES,
+    "/api/ai-build": AI_BUILD_MAX_BODY_BYTES,
+    "/api/bulk/service-request-status": BULK_MAX_BODY_BYTES,
+    "/api/bulk/provision-request": BULK_MAX_BODY_BYTES,
+}
+BODY_READ_IDLE_SECONDS = _int_setting("BODY_READ_IDLE_SECONDS", 10, minimum=1)
+BODY_READ_DEADLINE_SECONDS = _int_setting("BODY_READ_DEADLINE_SECONDS", 30, minimum=1)
+BODY_READ_CHUNK_BYTES = 16 * 1024
+BODY_LINGER_SECONDS = 2.0
+BODY_LINGER_BYTES = 1024 * 1024
+PROVIDER_PROBE_ENABLED = _bool_setting("PROVIDER_PROBE_ENABLED", True)
+PROVIDER_PROBE_SECONDS = _int_setting("PROVIDER_PROBE_SECONDS", 300, minimum=10)
+PROVIDER_PROBE_MAX_SECONDS = _int_setting("PROVIDER_PROBE_MAX_SECONDS", 1800, minimum=10)
+PROVIDER_PROBE_TIMEOUT = 8
+PROVIDER_RETRY_ATTEMPTS = _int_setting("PROVIDER_RETRY_ATTEMPTS", 3, minimum=1)
+PROVIDER_RETRY_BASE_SECONDS = 0.5
+PROVIDER_RETRY_MAX_SECONDS = _int_setting("PROVIDER_RETRY_MAX_SECONDS", 10, minimum=0)
+PROVIDER_BREAKER_FAILURES = _int_setting("PROVIDER_BREAKER_FAILURES", 5, minimum=1)
+PROVIDER_BREAKER_COOLDOWN_SECONDS = _int_setting("PROVIDER_BREAKER_COOLDOWN_SECONDS", 30, minimum=1)
+DOMAIN_SEARCH_BATCH_SIZE = _int_setting("DOMAIN_SEARCH_BATCH_SIZE", 20, minimum=1)
+DOMAIN_SEARCH_CACHE_SECONDS = _int_setting("DOMAIN_SEARCH_CACHE_SECONDS", 600, minimum=0)
+DOMAIN_SUGGESTION_TLDS = ["com", "io", "app", "co", "dev", "net"]
+RECONCILE_ENABLED = _bool_setting("RECONCILE_ENABLED", True)
+RECONCILE_MIN_SECONDS = _int_setting("RECONCILE_MIN_SECONDS", 10, minimum=1)
+RECONCILE_MAX_SECONDS = _int_setting("RECONCILE_MAX_SECONDS", 600, minimum=1)
+RECONCILE_GIVE_UP_HOURS = _int_setting("RECONCILE_GIVE_UP_HOURS", 24, minimum=1)
+RECONCILE_BATCH_SIZE = _int_setting("RECONCILE_BATCH_SIZE", 25, minimum=1)
+EVENTS_BUFFER_SIZE = _int_setting("EVENTS_BUFFER_SIZE", 1000, minimum=10)
+EVENTS_MAX_STREAMS = _int_setting("EVENTS_MAX_STREAMS", 32, minimum=1)
+EVENTS_HEARTBEAT_SECONDS = 15
+BULK_MAX_ITEMS = _int_setting("BULK_MAX_ITEMS", 500, minimum=1)
+BULK_PROVISION_WORKERS = _int_setting("BULK_PROVISION_WORKERS", 4, minimum=1)
+ARCHIVE_ENABLED = _bool_setting("ARCHIVE_ENABLED", True)
+ARCHIVE_AFTER_DAYS = _int_setting("ARCHIVE_AFTER_DAYS", 90, minimum=1)
+ARCHIVE_INTERVAL_HOURS = _int_setting("ARCHIVE_INTERVAL_HOURS", 6, minimum=1)
+ARCHIVE_STATUSES = {"cancelled", "provision_failed"}
+IDEMPOTENCY_TTL_SECONDS = _int_setting("IDEMPOTENCY_TTL_SECONDS", 86400, minimum=60)
+IDEMPOTENCY_MAX_KEYS = _int_setting("IDEMPOTENCY_MAX_KEYS", 5000, minimum=10)
+IDEMPOTENCY_WAIT_SECONDS = 300
+# The request blocks for the whole window; keep it well inside proxy idle timeouts (~100 s).
+PROFILE_MAX_SECONDS = 60
+PROFILE_DEFAULT_INTERVAL_MS = 5
 ALLOWED_REQUEST_STATUSES = {
     "submitted",
     "reviewing",
@@ -48,6 +217,10 @@ ALLOWED_REQUEST_STATUSES = {
 }
 ALLOWED_USER_ROLES = {"owner", "admin", "viewer"}
 SESSION_HOURS = 12
+SESSION_TOUCH_SECONDS = 60
+SESSION_SIGNED_TOKENS = _bool_setting("SESSION_SIGNED_TOKENS", False)
+SESSION_TOKEN_PREFIX = "v1."
+SESSION_REVOCATION_CHECK_SECONDS = 1.0
 ALLOWED_PROVIDER_CONFIG_KEYS = {
     "RENDER_API_KEY",
     "RENDER_SERVICE_REPO",
@@ -74,6 +247,13 @@ ALLOWED_PROVIDER_CONFIG_KEYS = {
     "OPENAI_API_KEY",
     "OPENAI_MODEL",
 }
+PROVIDER_API_BASES = {
+    "render": "https://api.render.com",
+    "dynadot": "https://api.dynadot.com",
+    "supabase": "https://api.supabase.com",
+    "neon": "https://console.neon.tech",
+    "openai": "https://api.openai.com",
+}
 AI_TEMPLATE_OPTIONS = [
     "SaaS Dashboard",
     "Client Portal",
@@ -111,25 +291,41 @@ AI_TARGET_OPTIONS = [
 
 
 class AppHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" if HTTP_KEEPALIVE else "HTTP/1.0"
+    # Headers and body go out as separate writes; Nagle would hold the body for the peer's delayed ACK.
+    disable_nagle_algorithm = True
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._requests_handled = 0
+        self._body_remaining = 0
+        self._body_error_status = HTTPStatus.BAD_REQUEST
+        self._expect_continue = False
         super().__init__(*args, directory=str(ROOT), **kwargs)
 
     def do_GET(self) -> None:  # noqa: N802 - stdlib method name
         route = urlparse(self.path).path
-        if route in {"/healthz", "/api/healthz"}:
+        if route == "/healthz":
             self.send_text(HTTPStatus.OK, "ok")
             return
-        if route == "/api/auth-config":
+        if route == "/api/healthz":
             self.send_json(
                 HTTPStatus.OK,
-                {
-                    "ok": True,
-                    "bootstrapRequired": auth_bootstrap_required(),
-                    "requiresAdminToken": admin_token_required(),
-                    "sessionHours": SESSION_HOURS,
-                },
+                {"ok": True, "ready": SERVER_STATE["ready"], "startup": STARTUP_STATS, "staticCache": static_cache_stats()},
+            )
+            return
+        if route == "/api/livez":
+            self.send_json(
+                HTTPStatus.OK,
+                {"ok": True, "alive": True, "uptimeSeconds": round(time.perf_counter() - BOOT_STARTED, 1)},
             )
             return
+        if route == "/api/readyz":
+            report = readiness_report()
+            self.send_json(HTTPStatus.OK if report["ready"] else HTTPStatus.SERVICE_UNAVAILABLE, report)
+            return
+        if route == "/api/auth-config":
+            self.send_json(HTTPStatus.OK, auth_config_payload())
+            return
         if route == "/api/auth-session":
             auth = authorize_request(self.headers)
             if not auth.get("ok"):
@@ -171,8 +367,17 @@ class AppHandler(SimpleHTTPRequestHandler):
         if route == "/api/providers":
             self.send_json(HTTPStatus.OK, {"ok": True, "catalog": provider_catalog()})
             return
+        if route == "/api/templates":
+            self.handle_templates()
+            return
         if route == "/api/provider-health":
-            self.send_json(HTTPStatus.OK, {"ok": True, "providers": provider_health()})
+            self.send_json(HTTPStatus.OK, {"ok": True, "providers": provider_health_with_probes()})
+            return
+        if route == "/api/domain-suggestions":
+            self.handle_domain_suggestions()
+            return
+        if route == "/api/events":
+            self.handle_events()
             return
         if route == "/api/provider-config":
             self.handle_provider_config_get()
@@ -180,11 +385,234 @@ class AppHandler(SimpleHTTPRequestHandler):
         if route == "/api/service-requests":
             self.send_json(HTTPStatus.OK, {"ok": True, "requests": list_service_requests()})
             return
+        if route == "/api/export/service-requests":
+            self.handle_export_service_requests()
+            return
+        if route == "/api/service-request":
+            self.handle_service_request_detail()
+            return
+        if route == "/api/archive/service-requests":
+            self.handle_archive_search()
+            return
+        if route == "/api/provisioning-payload":
+            self.handle_provisioning_payload()
+            return
         if route == "/api/projects":
             self.send_json(HTTPStatus.OK, {"ok": True, "projects": list_projects()})
             return
+        if self.send_static_file():
+            return
         super().do_GET()
 
+    def send_static_file(self, head: bool = False) -> bool:
+        # Regular files only; directories, redirects and 404s stay with SimpleHTTPRequestHandler.
+        route = unquote(urlparse(self.path).path)
+        record = None
+        if ASSET_DEDUP_ENABLED and route.startswith(ASSET_URL_PREFIX):
+            record = asset_blob_record(route)
+            if record is None:
+                self.send_error(HTTPStatus.NOT_FOUND, "Unknown asset")
+                return True
+            path = ROOT / str(record["path"]).lstrip("/")
+        else:
+            path = Path(self.translate_path(self.path))
+            if private_data_path(path):
+                self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+                return True
+            if route.endswith("/"):
+                path = path / "index.html"
+        entry = cached_static_body(path)
+        pinned = None
+        if entry is None:
+            pinned = acquire_static_file(path)
+            if pinned is None:
+                if record is not None:
+                    self.send_error(HTTPStatus.NOT_FOUND, "Unknown asset")
+                    return True
+                return False
+            entry = admit_static_body(pinned) or pinned
+        try:
+            if record is not None:
+                # A content-addressed URL must never serve bytes other than the ones that were hashed.
+                if (int(entry["size"]), int(entry["mtimeNs"])) != (record["size"], record["mtimeNs"]):
+                    self.send_error(HTTPStatus.NOT_FOUND, "Asset changed since it was indexed")
+                    return True
+                self.send_static_entry(entry, head, cache_control=ASSET_IMMUTABLE_CACHE_CONTROL)
+                return True
+            location = asset_redirect_url(route, entry) if ASSET_DEDUP_ENABLED else None
+            if location:
+                self.send_response(HTTPStatus.TEMPORARY_REDIRECT)
+                self.send_header("Location", location)
+                self.send_header("Cache-Control", ASSET_REDIRECT_CACHE_CONTROL)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return True
+            cache_control = None
+            if BOOTSTRAP_INLINE and route in BOOTSTRAP_PAGES:
+                # The embedded data changes without the file changing, so browsers must revalidate.
+                entry = render_bootstrap_page(route, entry)
+                cache_control = "no-cache"
+            if BUNDLE_ENABLED and path.suffix == ".html" and path.parent == ROOT:
+                bundled = bundle_page(f"/{path.name}", entry)
+                if bundled is not entry:
+                    entry = bundled
+                    cache_control = "no-cache"
+            elif BUNDLE_FILE_PATTERN.match(route):
+                cache_control = ASSET_IMMUTABLE_CACHE_CONTROL
+            self.send_static_entry(entry, head, cache_control=cache_control)
+        finally:
+            if pinned is not None:
+                release_static_file(pinned)
+        return True
+
+    def send_static_entry(self, entry: dict[str, Any], head: bool, cache_control: str | None = None) -> None:
+        size = int(entry["size"])
+        last_modified = str(entry["lastModified"])
+        etag = entry.get("etag")
+        ranged = bool(self.headers.get("Range"))
+        # Byte ranges refer to the identity body, so ranged requests never get the gzip variant.
+        use_gzip = (
+            entry.get("gzip") is not None
+            and not ranged
+            and "gzip" in str(self.headers.get("Accept-Encoding", "")).lower()
+        )
+        if use_gzip:
+            etag = entry["gzipEtag"]
+        vary = entry.get("gzip") is not None
+
+        if not_modified(self.headers, entry["mtime"], etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("Last-Modified", last_modified)
+            if cache_control:
+                self.send_header("Cache-Control", cache_control)
+            if etag:
+                self.send_header("ETag", etag)
+            if vary:
+                self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+        ranges = None
+        if ranged and self.headers.get("If-Range", last_modified).strip() in {last_modified, entry.get("etag")}:
+            ranges = parse_byte_ranges(str(self.headers.get("Range")), size)
+        if ranges == []:
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if ranges:
+            self.send_static_ranges(entry, ranges, last_modified, head)
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", entry["contentType"])
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(entry["gzip"])))
+        else:
+            self.send_header("Content-Length", str(size))
+        self.send_header("Last-Modified", last_modified)
+        if etag:
+            self.send_header("ETag", etag)
+        if vary:
+            self.send_header("Vary", "Accept-Encoding")
+        if cache_control:
+            self.send_header("Cache-Control", cache_control)
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        if head:
+            return
+        if use_gzip:
+            try:
+                self.wfile.write(entry["gzip"])
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+            return
+        self.write_static_body(entry, 0, size)
+
+    def send_static_ranges(
+        self, entry: dict[str, Any], ranges: list[tuple[int, int]], last_modified: str, head: bool
+    ) -> None:
+        size = int(entry["size"])
+        self.send_response(HTTPStatus.PARTIAL_CONTENT)
+        self.send_header("Last-Modified", last_modified)
+        if entry.get("etag"):
+            self.send_header("ETag", entry["etag"])
+        self.send_header("Accept-Ranges", "bytes")
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            self.send_header("Content-Type", entry["contentType"])
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+            if not head:
+                self.write_static_body(entry, start, end - start + 1)
+            return
+
+        boundary = secrets.token_hex(12)
+        part_heads = [
+            (
+                f"\r\n--{boundary}\r\nContent-Type: {entry['contentType']}\r\n"
+                f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+            ).encode("ascii")
+            for start, end in ranges
+        ]
+        closing = f"\r\n--{boundary}--\r\n".encode("ascii")
+        length = sum(len(part) for part in part_heads) + sum(end - start + 1 for start, end in ranges) + len(closing)
+        self.send_header("Content-Type", f"multipart/byteranges; boundary={boundary}")
+        self.send_header("Content-Length", str(length))
+        self.end_headers()
+        if head:
+            return
+        try:
+            for part_head, (start, end) in zip(part_heads, ranges):
+                self.wfile.write(part_head)
+                self.write_static_body(entry, start, end - start + 1)
+                if self.close_connection:
+                    return
+            self.wfile.write(closing)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def write_static_body(self, entry: dict[str, Any], start: int, length: int) -> None:
+        if entry.get("body") is not None:
+            try:
+                self.wfile.write(memoryview(entry["body"])[start : start + length])
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+            return
+        offset = start
+        end = start + length
+        # sendfile bypasses anything layered on the socket (e.g. TLS), so only use it on plain sockets.
+        if entry["fd"] is not None and type(self.connection) is socket.socket:
+            out_fd = self.connection.fileno()
+            try:
+                while offset < end:
+                    sent = os.sendfile(out_fd, entry["fd"], offset, end - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+                return
+            except OSError:
+                pass
+        if offset < end:
+            try:
+                with open(entry["path"], "rb") as handle:
+                    handle.seek(offset)
+                    while offset < end:
+                        chunk = handle.read(min(STATIC_COPY_CHUNK_BYTES, end - offset))
+                        if not chunk:
+                            break
+                        self.wfile.write(chunk)
+                        offset += len(chunk)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+                return
+        if offset < end:
+            # The file shrank underneath us; the declared Content-Length can no longer be met.
+            self.close_connection = True
+
     def do_POST(self) -> None:  # noqa: N802 - stdlib method name
         route = urlparse(self.path).path
         if route == "/api/auth-bootstrap":
@@ -217,12 +645,46 @@ class AppHandler(SimpleHTTPRequestHandler):
         if route == "/api/provider-config":
             self.handle_provider_config_update()
             return
+        if route == "/api/bulk/service-request-status":
+            self.handle_bulk_service_request_status()
+            return
+        if route == "/api/bulk/provision-request":
+            self.handle_bulk_provision_request()
+            return
+        if route == "/api/debug/profile":
+            self.handle_debug_profile()
+            return
         self.send_error(HTTPStatus.NOT_FOUND, "Route not found")
 
+    def handle_debug_profile(self) -> None:
+        if not self.require_role("owner"):
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        try:
+            seconds = float(query.get("seconds", ["10"])[0])
+            interval_ms = float(query.get("interval", [str(PROFILE_DEFAULT_INTERVAL_MS)])[0])
+        except ValueError:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "seconds and interval must be numbers"})
+            return
+        if seconds <= 0 or seconds > PROFILE_MAX_SECONDS:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": f"seconds must be between 0 and {PROFILE_MAX_SECONDS}"})
+            return
+        interval_ms = min(max(interval_ms, 1.0), 1000.0)
+
+        result = run_sampling_profile(seconds=seconds, interval=interval_ms / 1000, exclude={threading.get_ident()})
+        if not result.get("ok"):
+            self.send_json(HTTPStatus.CONFLICT, result)
+            return
+        if query.get("format", ["json"])[0] == "collapsed":
+            self.send_text(HTTPStatus.OK, result["collapsed"])
+            return
+        self.send_json(HTTPStatus.OK, result)
+
     def handle_create_project(self) -> None:
         body, error = self.read_json_body()
         if error:
-            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": error})
+            self.send_json(self._body_error_status, {"ok": False, "error": error})
             return
 
         validation_error = validate_body(body)
@@ -236,7 +698,7 @@ class AppHandler(SimpleHTTPRequestHandler):
     def handle_ai_build(self) -> None:
         body, error = self.read_json_body()
         if error:
-            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": error})
+            self.send_json(self._body_error_status, {"ok": False, "error": error})
             return
 
         prompt = str(body.get("prompt", "")).strip() if isinstance(body, dict) else ""
@@ -255,7 +717,7 @@ class AppHandler(SimpleHTTPRequestHandler):
     def handle_service_request(self) -> None:
         body, error = self.read_json_body()
         if error:
-            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": error})
+            self.send_json(self._body_error_status, {"ok": False, "error": error})
             return
 
         validation_error = validate_service_request_payload(body)
@@ -263,11 +725,11 @@ class AppHandler(SimpleHTTPRequestHandler):
             self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": validation_error})
             return
 
-        result = create_service_request(body)
-        if not result.get("ok"):
-            self.send_json(HTTPStatus.BAD_REQUEST, result)
-            return
-        self.send_json(HTTPStatus.OK, result)
+        def run() -> tuple[HTTPStatus, dict[str, Any]]:
+            result = create_service_request(body)
+            return (HTTPStatus.OK if result.get("ok") else HTTPStatus.BAD_REQUEST), result
+
+        self.send_idempotent("/api/service-request", body, run)
 
     def handle_provision_request(self) -> None:
         if not self.require_role("admin"):
@@ -275,7 +737,7 @@ class AppHandler(SimpleHTTPRequestHandler):
 
         body, error = self.read_json_body()
         if error:
-            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": error})
+            self.send_json(self._body_error_status, {"ok": False, "error": error})
             return
 
         validation_error = validate_provision_payload(body)
@@ -283,19 +745,58 @@ class AppHandler(SimpleHTTPRequestHandler):
             self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": validation_error})
             return
 
-        result = provision_service_request(
-            request_id=body["requestId"].strip(),
-            options={
-                "domainName": str(body.get("domainName", "")).strip(),
-                "region": str(body.get("region", "")).strip(),
-                "dbPassword": str(body.get("dbPassword", "")).strip(),
-                "retryFailed": bool(body.get("retryFailed", False)),
-            },
-        )
-        if not result.get("ok"):
-            self.send_json(HTTPStatus.BAD_REQUEST, result)
+        def run() -> tuple[HTTPStatus, dict[str, Any]]:
+            result = provision_service_request(
+                request_id=body["requestId"].strip(),
+                options={
+                    "domainName": str(body.get("domainName", "")).strip(),
+                    "region": str(body.get("region", "")).strip(),
+                    "dbPassword": str(body.get("dbPassword", "")).strip(),
+                    "retryFailed": bool(body.get("retryFailed", False)),
+                },
+            )
+            return (HTTPStatus.OK if result.get("ok") else HTTPStatus.BAD_REQUEST), result
+
+        self.send_idempotent("/api/provision-request", body, run)
+
+    def send_idempotent(self, route: str, body: dict[str, Any], run: Any) -> None:
+        key = str(self.headers.get("Idempotency-Key", "")).strip()
+        if not key:
+            status, payload = run()
+            self.send_json(status, payload)
+            return
+        if not re.match(r"^[\x21-\x7e]{1,255}$", key):
+            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "Idempotency-Key must be 1-255 visible ASCII characters"})
+            return
+
+        context = current_request_context() or {}
+        scoped_key = f"{route}|{context.get('userId', '')}|{key}"
+        fingerprint = idempotency_fingerprint(route, body)
+        claim = claim_idempotency_key(scoped_key, fingerprint)
+        if claim["state"] == "wait":
+            if not claim["event"].wait(timeout=IDEMPOTENCY_WAIT_SECONDS):
+                self.send_json(HTTPStatus.CONFLICT, {"ok": False, "error": "A request with this Idempotency-Key is still in progress."})
+                return
+            claim = claim_idempotency_key(scoped_key, fingerprint)
+        if claim["state"] == "conflict":
+            self.send_json(
+                HTTPStatus.UNPROCESSABLE_ENTITY,
+                {"ok": False, "error": "Idempotency-Key was already used with a different request body."},
+            )
+            return
+        if claim["state"] == "replay":
+            self.send_json(HTTPStatus(claim["status"]), claim["response"], headers={"Idempotent-Replayed": "true"})
+            return
+        if claim["state"] == "wait":
+            self.send_json(HTTPStatus.CONFLICT, {"ok": False, "error": "A request with this Idempotency-Key is still in progress."})
             return
-        self.send_json(HTTPStatus.OK, result)
+
+        status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, None
+        try:
+            status, payload = run()
+        finally:
+            complete_idempotency_key(scoped_key, fingerprint, int(status), payload)
+        self.send_json(status, payload)
 
     def handle_service_request_status(self) -> None:
         if not self.require_role("admin"):
@@ -303,7 +804,7 @@ class AppHandler(SimpleHTTPRequestHandler):
 
         body, error = self.read_json_body()
         if error:
-            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": error})
+            self.send_json(self._body_error_status, {"ok": False, "error": error})
             return
 
         validation_error = validate_status_update_payload(body)
@@ -321,10 +822,44 @@ class AppHandler(SimpleHTTPRequestHandler):
             return
         self.send_json(HTTPStatus.OK, result)
 
+    def handle_bulk_service_request_status(self) -> None:
+        if not self.require_role("admin"):
+            return
+
+        body, error = self.read_json_body()
+        if error:
+            self.send_json(self._body_error_status, {"ok": False, "error": error})
+            return
+
+        items = expand_bulk_items(body, {"status", "reason"})
+        if isinstance(items, str):
+            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": items})
+            return
+        self.send_json(HTTPStatus.OK, bulk_update_service_request_status(items))
+
+    def handle_bulk_provision_request(self) -> None:
+        if not self.require_role("admin"):
+            return
+
+        body, error = self.read_json_body()
+        if error:
+            self.send_json(self._body_error_status, {"ok": False, "error": error})
+            return
+
+        items = expand_bulk_items(body, {"region", "dbPassword", "retryFailed"})
+        if isinstance(items, str):
+            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": items})
+            return
+
+        def run() -> tuple[HTTPStatus, dict[str, Any]]:
+            return HTTPStatus.OK, bulk_provision_service_requests(items)
+
+        self.send_idempotent("/api/bulk/provision-request", body, run)
+
     def handle_auth_bootstrap(self) -> None:
         body, error = self.read_json_body()
         if error:
-            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": error})
+            self.send_json(self._body_error_status, {"ok": False, "error": error})
             return
 
         if not auth_bootstrap_required():
@@ -350,7 +885,7 @@ class AppHandler(SimpleHTTPRequestHandler):
     def handle_auth_login(self) -> None:
         body, error = self.read_json_body()
         if error:
-            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": error})
+            self.send_json(self._body_error_status, {"ok": False, "error": error})
             return
 
         username = str(body.get("username", "")).strip()
@@ -384,7 +919,7 @@ class AppHandler(SimpleHTTPRequestHandler):
 
         body, error = self.read_json_body()
         if error:
-            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": error})
+            self.send_json(self._body_error_status, {"ok": False, "error": error})
             return
 
         username = str(body.get("username", "")).strip()
@@ -406,6 +941,224 @@ class AppHandler(SimpleHTTPRequestHandler):
 
         self.send_json(HTTPStatus.OK, {"ok": True, "user": strip_private_user(created["user"])})
 
+    def handle_events(self) -> None:
+        query = parse_qs(urlparse(self.path).query)
+        headers: Any = self.headers
+        token = str(query.get("token", [""])[0]).strip()
+        # EventSource cannot set headers, so the browser passes its token in the query.
+        if token and not extract_admin_token(self.headers):
+            headers = {"Authorization": f"Bearer {token}"}
+        if not authorize_request(headers).get("ok"):
+            self.send_json(HTTPStatus.UNAUTHORIZED, {"ok": False, "error": "Unauthorized. Sign in first."})
+            return
+
+        last_event_id = str(self.headers.get("Last-Event-ID", "") or query.get("lastEventId", [""])[0])
+        cursor = event_cursor(last_event_id)
+        with _events_cond:
+            if _events_state["streams"] >= EVENTS_MAX_STREAMS:
+                self.send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"ok": False, "error": "Too many event streams"})
+                return
+            _events_state["streams"] += 1
+        # Long-lived streams should not count against readiness load shedding.
+        if self._active_counted:
+            track_active_request(-1)
+            self._active_counted = False
+        try:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Connection", "close")
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("X-Accel-Buffering", "no")
+            self.end_headers()
+            self.wfile.write(b"retry: 3000\n\n")
+            if cursor is None:
+                self.wfile.write(b"event: reset\ndata: {}\n\n")
+                cursor = event_cursor("")
+            self.wfile.flush()
+            # The session can be revoked or expire while the stream is open, so re-check it
+            # once per heartbeat interval and end the stream when it no longer authorizes.
+            next_auth_check = time.monotonic() + EVENTS_HEARTBEAT_SECONDS
+            while True:
+                chunks, cursor, reset = wait_for_events(cursor, EVENTS_HEARTBEAT_SECONDS)
+                if time.monotonic() >= next_auth_check:
+                    if not authorize_request(headers).get("ok"):
+                        self.close_connection = True
+                        return
+                    next_auth_check = time.monotonic() + EVENTS_HEARTBEAT_SECONDS
+                if reset:
+                    chunks = [b"event: reset\ndata: {}\n\n"]
+                self.wfile.write(b"".join(chunks) or b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            pass
+        finally:
+            with _events_cond:
+                _events_state["streams"] -= 1
+
+    def handle_templates(self) -> None:
+        query = parse_qs(urlparse(self.path).query)
+        search = str(query.get("q", [""])[0]).strip()[:200]
+        category = str(query.get("category", [""])[0]).strip().lower()
+        try:
+            page = max(1, int(query.get("page", ["1"])[0]))
+            page_size = min(TEMPLATE_MAX_PAGE_SIZE, max(1, int(query.get("pageSize", [str(TEMPLATE_PAGE_SIZE)])[0])))
+        except ValueError:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "page and pageSize must be integers"})
+            return
+
+        # The ETag covers the catalog version and the normalized query, so it is known before searching.
+        version = template_index()["version"]
+        key = f"{version}|{' '.join(template_tokens(search))}|{category}|{page}|{page_size}"
+        etag = f'"{hashlib.sha256(key.encode("utf-8")).hexdigest()[:20]}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        self.send_json(HTTPStatus.OK, search_templates(search, category, page, page_size), headers=headers)
+
+    def handle_export_service_requests(self) -> None:
+        if not self.require_role("admin"):
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        export_format = str(query.get("format", ["csv"])[0]).strip().lower()
+        if export_format not in {"csv", "ndjson"}:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "format must be csv or ndjson"})
+            return
+        date_from = str(query.get("from", [""])[0]).strip()
+        date_to = str(query.get("to", [""])[0]).strip()
+        for value in (date_from, date_to):
+            if value and not re.match(r"^\d{4}-\d{2}-\d{2}$", value):
+                self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "from and to must be YYYY-MM-DD"})
+                return
+        raw_statuses = str(query.get("status", [""])[0]).strip().lower()
+        statuses = {value.strip() for value in raw_statuses.split(",") if value.strip()}
+        if statuses - ALLOWED_REQUEST_STATUSES:
+            self.send_json(
+                HTTPStatus.BAD_REQUEST,
+                {"ok": False, "error": f"status must be one of: {', '.join(sorted(ALLOWED_REQUEST_STATUSES))}"},
+            )
+            return
+
+        chunks = iter_export_chunks(export_format, date_from=date_from, date_to=date_to, statuses=statuses)
+        # Chunked framing needs an HTTP/1.1 response; 1.0 clients get a close-delimited body.
+        chunked = self.request_version == "HTTP/1.1" and self.protocol_version == "HTTP/1.1"
+        if not chunked:
+            self.close_connection = True
+        filename = f"service-requests-{now_utc().strftime('%Y%m%d')}.{export_format}"
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/csv; charset=utf-8" if export_format == "csv" else "application/x-ndjson")
+        self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+        self.send_header("Cache-Control", "no-store")
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        context = current_request_context()
+        try:
+            for chunk in chunks:
+                self.wfile.write(f"{len(chunk):X}\r\n".encode("ascii") + chunk + b"\r\n" if chunked else chunk)
+                if context is not None:
+                    context["bytes"] = int(context.get("bytes", 0)) + len(chunk)
+            if chunked:
+                self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            self.close_connection = True
+
+    def handle_service_request_detail(self) -> None:
+        if not self.require_role("admin"):
+            return
+
+        request_id = str(parse_qs(urlparse(self.path).query).get("requestId", [""])[0]).strip()
+        if not request_id:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "requestId is required"})
+            return
+        record = find_service_request(list_service_requests(), request_id)
+        archived = False
+        if record is None:
+            record = find_archived_service_request(request_id)
+            archived = record is not None
+        if record is None:
+            self.send_json(HTTPStatus.NOT_FOUND, {"ok": False, "error": "Request not found"})
+            return
+        self.send_json(HTTPStatus.OK, {"ok": True, "archived": archived, "request": record})
+
+    def handle_provisioning_payload(self) -> None:
+        if not self.require_role("admin"):
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        request_id = str(query.get("requestId", [""])[0]).strip()
+        try:
+            item_index = int(query.get("itemIndex", [""])[0])
+        except ValueError:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "requestId and itemIndex are required"})
+            return
+        record = find_service_request(list_service_requests(), request_id) or find_archived_service_request(request_id)
+        entries = record.get("provisioning", []) if record else []
+        entry = next((item for item in entries if isinstance(item, dict) and item.get("itemIndex") == item_index), None)
+        if entry is None:
+            self.send_json(HTTPStatus.NOT_FOUND, {"ok": False, "error": "Provisioning entry not found"})
+            return
+        result = entry.get("result", {}) if isinstance(entry.get("result"), dict) else {}
+        payload = read_blob(str(result.get("rawRef", "")))
+        if payload is None:
+            self.send_json(HTTPStatus.NOT_FOUND, {"ok": False, "error": "No raw provider payload stored for this entry"})
+            return
+        self.send_json(HTTPStatus.OK, {"ok": True, "requestId": request_id, "itemIndex": item_index, "rawRef": result["rawRef"], "payload": payload})
+
+    def handle_archive_search(self) -> None:
+        if not self.require_role("admin"):
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        date_from = str(query.get("from", [""])[0]).strip()
+        date_to = str(query.get("to", [""])[0]).strip()
+        for value in (date_from, date_to):
+            if value and not re.match(r"^\d{4}-\d{2}-\d{2}$", value):
+                self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "from and to must be YYYY-MM-DD"})
+                return
+        statuses = {value.strip() for value in str(query.get("status", [""])[0]).lower().split(",") if value.strip()}
+        try:
+            limit = min(max(int(query.get("limit", ["50"])[0]), 1), 500)
+        except ValueError:
+            limit = 50
+
+        results = search_archived_service_requests(
+            query=str(query.get("q", [""])[0]),
+            statuses=statuses,
+            date_from=date_from,
+            date_to=date_to,
+            limit=limit,
+        )
+        self.send_json(HTTPStatus.OK, {"ok": True, "requests": results, "count": len(results)})
+
+    def handle_domain_suggestions(self) -> None:
+        if not self.require_role("admin"):
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        name = str(query.get("name", [""])[0]).strip()
+        if not name:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "name is required"})
+            return
+        raw_tlds = str(query.get("tlds", [""])[0]).strip().lower()
+        tlds = [tld.strip().lstrip(".") for tld in raw_tlds.split(",") if tld.strip()] if raw_tlds else None
+        try:
+            limit = int(query.get("limit", ["10"])[0])
+        except ValueError:
+            limit = 10
+
+        result = suggest_domains(project_name=name, tlds=tlds, limit=min(max(limit, 1), 50))
+        if not result.get("ok"):
+            self.send_json(HTTPStatus.BAD_REQUEST, result)
+            return
+        self.send_json(HTTPStatus.OK, result)
+
     def handle_provider_config_get(self) -> None:
         if not self.require_role("admin"):
             return
@@ -419,7 +1172,7 @@ class AppHandler(SimpleHTTPRequestHandler):
 
         body, error = self.read_json_body()
         if error:
-            self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": error})
+            self.send_json(self._body_error_status, {"ok": False, "error": error})
             return
 
         raw_values = body.get("values")
@@ -427,19 +1180,18 @@ class AppHandler(SimpleHTTPRequestHandler):
             self.send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "values must be an object"})
             return
 
-        current = read_provider_config()
-        updated = dict(current)
-
-        for key, value in raw_values.items():
-            if key not in ALLOWED_PROVIDER_CONFIG_KEYS:
-                continue
-            cleaned = str(value if value is not None else "").strip()
-            if cleaned:
-                updated[key] = cleaned
-            elif key in updated:
-                del updated[key]
-
-        write_provider_config(updated)
+        with store_lock:
+            updated = dict(read_provider_config())
+            for key, value in raw_values.items():
+                if key not in ALLOWED_PROVIDER_CONFIG_KEYS:
+                    continue
+                cleaned = str(value if value is not None else "").strip()
+                if cleaned:
+                    updated[key] = cleaned
+                elif key in updated:
+                    del updated[key]
+            write_provider_config(updated)
+        request_provider_probe()
         masked = {key: mask_secret(str(value)) for key, value in updated.items() if key in ALLOWED_PROVIDER_CONFIG_KEYS}
         self.send_json(
             HTTPStatus.OK,
@@ -452,8 +1204,11 @@ class AppHandler(SimpleHTTPRequestHandler):
         )
 
     def read_json_body(self) -> tuple[dict[str, Any], str | None]:
-        length = int(self.headers.get("Content-Length", "0"))
-        payload = self.rfile.read(length)
+        # Content-Length was already checked against the route limit in parse_request.
+        self._body_error_status = HTTPStatus.BAD_REQUEST
+        payload, error = self.read_request_body(self._body_remaining)
+        if error:
+            return {}, error
         try:
             body = json.loads(payload.decode("utf-8"))
         except (UnicodeDecodeError, json.JSONDecodeError):
@@ -462,6 +1217,34 @@ class AppHandler(SimpleHTTPRequestHandler):
             return {}, "Request body must be a JSON object"
         return body, None
 
+    def read_request_body(self, length: int) -> tuple[bytearray, str | None]:
+        # Reads at most `length` bytes in small chunks. Each read waits at most
+        # BODY_READ_IDLE_SECONDS, and the whole body must arrive within
+        # BODY_READ_DEADLINE_SECONDS, so a trickling sender cannot pin a worker thread.
+        buffer = bytearray()
+        deadline = time.monotonic() + BODY_READ_DEADLINE_SECONDS
+        self.connection.settimeout(BODY_READ_IDLE_SECONDS)
+        try:
+            while len(buffer) < length:
+                if time.monotonic() > deadline:
+                    raise TimeoutError
+                chunk = self.rfile.read1(min(BODY_READ_CHUNK_BYTES, length - len(buffer)))
+                if not chunk:
+                    break
+                buffer += chunk
+        except OSError:
+            self._body_remaining = 0
+            self.close_connection = True
+            self._body_error_status = HTTPStatus.REQUEST_TIMEOUT
+            return buffer, "Request body was not received in time"
+        finally:
+            self.connection.settimeout(None)
+        self._body_remaining = 0
+        if len(buffer) < length:
+            self.close_connection = True
+            return buffer, "Request body ended before Content-Length bytes"
+        return buffer, None
+
     def require_role(self, minimum_role: str) -> dict[str, Any] | None:
         auth = authorize_request(self.headers)
         if not auth.get("ok"):
@@ -478,6 +1261,8 @@ class AppHandler(SimpleHTTPRequestHandler):
         if route in {
             "/healthz",
             "/api/healthz",
+            "/api/livez",
+            "/api/readyz",
             "/api/auth-config",
             "/api/auth-session",
             "/api/auth-users",
@@ -494,12 +1279,20 @@ class AppHandler(SimpleHTTPRequestHandler):
             self.send_header("Cache-Control", "no-store")
             self.end_headers()
             return
+        if self.send_static_file(head=True):
+            return
         super().do_HEAD()
 
+    def send_head(self) -> Any:
+        if private_data_path(Path(self.translate_path(self.path))):
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        return super().send_head()
+
     def do_OPTIONS(self) -> None:  # noqa: N802 - stdlib method name
         self.send_response(HTTPStatus.NO_CONTENT)
         self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type, Authorization, X-Admin-Token")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type, Authorization, X-Admin-Token, X-Request-Id, Idempotency-Key")
         self.send_header("Access-Control-Allow-Methods", "GET,POST,OPTIONS")
         self.end_headers()
 
@@ -510,12 +1303,15 @@ class AppHandler(SimpleHTTPRequestHandler):
             return
         super().send_error(code, message, explain)
 
-    def send_json(self, status: HTTPStatus, payload: dict[str, Any]) -> None:
+    def send_json(self, status: HTTPStatus, payload: dict[str, Any], headers: dict[str, str] | None = None) -> None:
         response = json.dumps(payload).encode("utf-8")
         self.send_response(int(status))
         self.send_header("Content-Type", "application/json; charset=utf-8")
-        self.send_header("Cache-Control", "no-store")
+        if "Cache-Control" not in (headers or {}):
+            self.send_header("Cache-Control", "no-store")
         self.send_header("Content-Length", str(len(response)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.end_headers()
         self.wfile.write(response)
 
@@ -528,13 +1324,176 @@ class AppHandler(SimpleHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(response)
 
+    def handle_one_request(self) -> None:
+        self.command = None
+        self._active_counted = False
+        self._body_remaining = 0
+        self._expect_continue = False
+        # Only the wait for the next request line is bounded; parse_request lifts it.
+        self.connection.settimeout(KEEPALIVE_IDLE_SECONDS)
+        context = begin_request_context()
+        try:
+            super().handle_one_request()
+            if not self.close_connection:
+                self.discard_unread_body()
+        finally:
+            end_request_context()
+            if self._active_counted:
+                track_active_request(-1)
+            if self.command:
+                self.write_access_log(context)
+
+    def parse_request(self) -> bool:
+        parsed = super().parse_request()
+        context = current_request_context()
+        self.connection.settimeout(None)
+        if parsed:
+            track_active_request(1)
+            self._active_counted = True
+            self._requests_handled += 1
+        if context is not None:
+            context["startedAt"] = time.perf_counter()
+            context["route"] = urlparse(self.path).path
+            context["method"] = str(self.command or "")
+            context["requestId"] = normalize_request_id(self.headers.get("X-Request-Id", "") if parsed else "")
+        if not (parsed and self.accept_request_body()):
+            return False
+        if self._expect_continue:
+            self.send_response_only(HTTPStatus.CONTINUE)
+            super().end_headers()
+        return True
+
+    def accept_request_body(self) -> bool:
+        # Decided from the headers alone, before any body bytes are read or 100 Continue is sent.
+        if "chunked" in str(self.headers.get("Transfer-Encoding", "")).lower():
+            self.reject_request_body(HTTPStatus.LENGTH_REQUIRED, "Chunked request bodies are not supported", 0)
+            return False
+        try:
+            length = int(self.headers.get("Content-Length", "0") or "0")
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.reject_request_body(HTTPStatus.BAD_REQUEST, "Invalid Content-Length", 0)
+            return False
+        limit = BODY_LIMITS.get(urlparse(self.path).path, MAX_BODY_BYTES)
+        if length > limit:
+            self.reject_request_body(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Request body is larger than {limit} bytes", length, limit
+            )
+            return False
+        self._body_remaining = length
+        return True
+
+    def reject_request_body(self, status: HTTPStatus, error: str, length: int, limit: int | None = None) -> None:
+        payload: dict[str, Any] = {"ok": False, "error": error}
+        if limit is not None:
+            payload["limitBytes"] = limit
+        self.send_json(status, payload, headers={"Connection": "close"})
+        # Closing with the body still unread makes the kernel reset the connection, which can
+        # discard the response before the client reads it. Half-close instead, and read and drop
+        # a bounded amount of what the client is still sending.
+        if not length or self.command == "HEAD":
+            return
+        try:
+            self.connection.shutdown(socket.SHUT_WR)
+            self.connection.settimeout(BODY_LINGER_SECONDS)
+            deadline = time.monotonic() + BODY_LINGER_SECONDS
+            drained = 0
+            while drained < min(length, BODY_LINGER_BYTES) and time.monotonic() < deadline:
+                chunk = self.rfile.read1(BODY_READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                drained += len(chunk)
+        except OSError:
+            pass
+
+    def send_header(self, keyword: str, value: str) -> None:
+        if keyword.lower() == "content-length" and self.command != "HEAD":
+            context = current_request_context()
+            if context is not None:
+                try:
+                    context["bytes"] += int(value)
+                except (TypeError, ValueError):
+                    pass
+        super().send_header(keyword, value)
+
+    def end_headers(self) -> None:
+        if STARTUP_STATS["firstByteMs"] is None:
+            note_first_byte()
+        context = current_request_context()
+        if context is not None and context.get("requestId"):
+            super().send_header("X-Request-Id", str(context["requestId"]))
+        if not self.close_connection:
+            if self._requests_handled >= KEEPALIVE_MAX_REQUESTS:
+                super().send_header("Connection", "close")
+            elif self.request_version == "HTTP/1.0" and self.protocol_version == "HTTP/1.1":
+                super().send_header("Connection", "keep-alive")
+        super().end_headers()
+
+    def handle_expect_100(self) -> bool:
+        # Called from inside super().parse_request(); defer both the body check and the interim
+        # response until the request context exists, so a rejection is logged and tagged like any other.
+        self._expect_continue = True
+        return True
+
+    def discard_unread_body(self) -> None:
+        # A handler that answered without reading the body (e.g. 401 before read_json_body)
+        # leaves bytes that would otherwise be parsed as the next request.
+        if self._body_remaining > KEEPALIVE_DRAIN_BYTES:
+            self.close_connection = True
+            return
+        if self._body_remaining:
+            self.connection.settimeout(KEEPALIVE_IDLE_SECONDS)
+            try:
+                self.rfile.read(self._body_remaining)
+            except OSError:
+                self.close_connection = True
+            self._body_remaining = 0
+
+    def log_request(self, code: int | str = "-", size: int | str = "-") -> None:
+        context = current_request_context()
+        if context is not None and isinstance(code, int):
+            context["status"] = code
+
+    def log_error(self, fmt: str, *args: Any) -> None:
+        context = current_request_context()
+        if context is not None:
+            context["error"] = fmt % args
+            return
+        self.log_message(fmt, *args)
+
     def log_message(self, fmt: str, *args: Any) -> None:
-        route = urlparse(self.path).path
-        if route in {"/healthz", "/api/healthz"}:
+        write_log_record(
+            {
+                "type": "message",
+                "ts": now_utc().isoformat(timespec="milliseconds"),
+                "client": self.client_address[0] if self.client_address else "-",
+                "message": fmt % args,
+            }
+        )
+
+    def write_access_log(self, context: dict[str, Any]) -> None:
+        route = str(context.get("route", ""))
+        if route in QUIET_ROUTES:
             return
-        stamp = datetime.now().strftime("%H:%M:%S")
-        client_ip = self.client_address[0] if self.client_address else "-"
-        print(f"[{stamp}] {client_ip} - {fmt % args}")
+        record = {
+            "type": "access",
+            "ts": now_utc().isoformat(timespec="milliseconds"),
+            "requestId": context.get("requestId", ""),
+            "method": context.get("method", ""),
+            "route": route,
+            "status": context.get("status", 0),
+            "bytes": context.get("bytes", 0),
+            "durationMs": round((time.perf_counter() - float(context["startedAt"])) * 1000, 2),
+            "client": self.client_address[0] if self.client_address else "-",
+            "userId": context.get("userId", ""),
+            "username": context.get("username", ""),
+            "role": context.get("role", ""),
+            "upstreamCalls": context.get("upstreamCalls", 0),
+        }
+        if context.get("error"):
+            record["error"] = context["error"]
+        write_log_record(record)
 
 
 def validate_body(body: Any) -> str | None:
@@ -568,32 +1527,63 @@ def admin_token_required() -> bool:
     return bool(env("ADMIN_API_TOKEN"))
 
 
-def read_json_list(path: Path) -> list[dict[str, Any]]:
-    DATA_DIR.mkdir(exist_ok=True)
-    if not path.exists():
-        return []
+# Parsed JSON stores are cached in memory and revalidated with one stat() per read.
+# Records handed out are shared with the cache: mutate them only while holding
+# store_lock and save the store before releasing it.
+store_lock = threading.RLock()
+_store_cache: dict[Path, tuple[tuple[int, int, int], Any]] = {}
+
+
+def load_json_store(path: Path) -> Any:
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        return []
+        stat = path.stat()
+    except OSError:
+        return None
+    key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    with store_lock:
+        cached = _store_cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+            return None
+        _store_cache[path] = (key, payload)
+        return payload
+
+
+def save_json_store(path: Path, payload: Any, *, compact: bool = False) -> None:
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with store_lock:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            text = json.dumps(payload, separators=(",", ":")) if compact else json.dumps(payload, indent=2)
+            temp_path.write_text(text, encoding="utf-8")
+            os.replace(temp_path, path)
+        except OSError:
+            READINESS["dataDirWritable"] = False
+            # Callers mutate cached records in place before saving; forget them so the next read
+            # re-parses what actually reached disk.
+            _store_cache.pop(path, None)
+            raise
+        READINESS["dataDirWritable"] = True
+        stat = path.stat()
+        _store_cache[path] = ((stat.st_ino, stat.st_mtime_ns, stat.st_size), payload)
+
+
+def read_json_list(path: Path) -> list[dict[str, Any]]:
+    payload = load_json_store(path)
     if not isinstance(payload, list):
         return []
     return [item for item in payload if isinstance(item, dict)]
 
 
 def write_json_list(path: Path, values: list[dict[str, Any]]) -> None:
-    DATA_DIR.mkdir(exist_ok=True)
-    path.write_text(json.dumps(values, indent=2), encoding="utf-8")
+    save_json_store(path, values)
 
 
 def read_provider_config() -> dict[str, str]:
-    DATA_DIR.mkdir(exist_ok=True)
-    if not PROVIDER_CONFIG_FILE.exists():
-        return {}
-    try:
-        payload = json.loads(PROVIDER_CONFIG_FILE.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        return {}
+    payload = load_json_store(PROVIDER_CONFIG_FILE)
     if not isinstance(payload, dict):
         return {}
     cleaned: dict[str, str] = {}
@@ -607,13 +1597,22 @@ def read_provider_config() -> dict[str, str]:
 
 
 def write_provider_config(values: dict[str, str]) -> None:
-    DATA_DIR.mkdir(exist_ok=True)
     clean_values = {
         key: str(value).strip()
         for key, value in values.items()
         if key in ALLOWED_PROVIDER_CONFIG_KEYS and str(value).strip()
     }
-    PROVIDER_CONFIG_FILE.write_text(json.dumps(clean_values, indent=2), encoding="utf-8")
+    save_json_store(PROVIDER_CONFIG_FILE, clean_values)
+
+
+def private_data_path(path: Path) -> bool:
+    # Runtime stores live under the served tree by default, and each new one (logs, idempotency
+    # replays, archives, blobs, keys) would otherwise become downloadable. Refuse everything in
+    # DATA_DIR, its listing included, except the shipped template content.
+    # translate_path already normalised the path, so plain comparisons suffice.
+    if not path.is_relative_to(DATA_DIR):
+        return False
+    return not any(path.is_relative_to(public) for public in (TEMPLATE_CATALOG_FILE, TEMPLATE_SEED_DIR))
 
 
 def mask_secret(value: str) -> str:
@@ -711,52 +1710,57 @@ def create_auth_user(*, username: str, password: str, role: str) -> dict[str, An
     if normalized_role not in ALLOWED_USER_ROLES:
         return {"ok": False, "error": "Invalid role"}
 
-    users = list_auth_users(public_only=False)
-    if any(normalize_username(str(user.get("username", ""))) == normalized_username for user in users):
-        return {"ok": False, "error": "username already exists"}
-
-    timestamp = now_utc().isoformat()
     salt = secrets.token_hex(16)
-    record = {
-        "id": f"user_{secrets.token_hex(8)}",
-        "username": normalized_username,
-        "role": normalized_role,
-        "createdAt": timestamp,
-        "updatedAt": timestamp,
-        "lastLoginAt": "",
-        "passwordSalt": salt,
-        "passwordHash": password_hash(password, salt),
-    }
-    users.append(record)
-    write_json_list(AUTH_USERS_FILE, users)
+    hashed = password_hash(password, salt)
+    with store_lock:
+        users = list_auth_users(public_only=False)
+        if any(normalize_username(str(user.get("username", ""))) == normalized_username for user in users):
+            return {"ok": False, "error": "username already exists"}
+
+        timestamp = now_utc().isoformat()
+        record = {
+            "id": f"user_{secrets.token_hex(8)}",
+            "username": normalized_username,
+            "role": normalized_role,
+            "createdAt": timestamp,
+            "updatedAt": timestamp,
+            "lastLoginAt": "",
+            "passwordSalt": salt,
+            "passwordHash": hashed,
+        }
+        users.append(record)
+        write_json_list(AUTH_USERS_FILE, users)
     return {"ok": True, "user": record}
 
 
 def authenticate_user(*, username: str, password: str) -> dict[str, Any] | None:
     normalized_username = normalize_username(username)
-    users = list_auth_users(public_only=False)
+    candidate = next(
+        (user for user in list_auth_users(public_only=False) if user.get("username") == normalized_username),
+        None,
+    )
+    if candidate is None:
+        return None
+    salt = str(candidate.get("passwordSalt", ""))
+    stored_hash = str(candidate.get("passwordHash", ""))
+    if not salt or not stored_hash:
+        return None
+    if not hmac.compare_digest(stored_hash, password_hash(password, salt)):
+        return None
 
-    changed = False
-    authenticated: dict[str, Any] | None = None
-    for user in users:
-        if normalize_username(str(user.get("username", ""))) != normalized_username:
-            continue
-        salt = str(user.get("passwordSalt", ""))
-        stored_hash = str(user.get("passwordHash", ""))
-        if not salt or not stored_hash:
-            return None
-        computed_hash = password_hash(password, salt)
-        if not hmac.compare_digest(stored_hash, computed_hash):
-            return None
-        now_iso = now_utc().isoformat()
-        user["lastLoginAt"] = now_iso
-        user["updatedAt"] = now_iso
-        authenticated = user
-        changed = True
-        break
-
-    if changed:
-        write_json_list(AUTH_USERS_FILE, users)
+    with store_lock:
+        users = list_auth_users(public_only=False)
+        authenticated: dict[str, Any] | None = None
+        for user in users:
+            if user.get("id") != candidate.get("id"):
+                continue
+            now_iso = now_utc().isoformat()
+            user["lastLoginAt"] = now_iso
+            user["updatedAt"] = now_iso
+            authenticated = user
+            break
+        if authenticated is not None:
+            write_json_list(AUTH_USERS_FILE, users)
     return authenticated
 
 
@@ -782,7 +1786,8 @@ def clean_sessions(sessions: list[dict[str, Any]]) -> list[dict[str, Any]]:
 
 
 def create_auth_session(user: dict[str, Any]) -> dict[str, Any]:
-    sessions = clean_sessions(read_json_list(AUTH_SESSIONS_FILE))
+    if SESSION_SIGNED_TOKENS:
+        return create_signed_session(user)
     timestamp = now_utc()
     expires_at = timestamp + timedelta(hours=SESSION_HOURS)
     raw_token = secrets.token_urlsafe(32)
@@ -796,46 +1801,239 @@ def create_auth_session(user: dict[str, Any]) -> dict[str, Any]:
         "lastSeenAt": timestamp.isoformat(),
         "expiresAt": expires_at.isoformat(),
     }
-    sessions.insert(0, session)
-    write_json_list(AUTH_SESSIONS_FILE, sessions)
+    with store_lock:
+        sessions = clean_sessions(read_json_list(AUTH_SESSIONS_FILE))
+        sessions.insert(0, session)
+        write_json_list(AUTH_SESSIONS_FILE, sessions)
     return {"token": raw_token, "session": session}
 
 
 def find_auth_session(token: str) -> dict[str, Any] | None:
     if not token:
         return None
+    # Stored-session tokens never contain ".", so signed tokens are recognised by shape and
+    # stay valid if SESSION_SIGNED_TOKENS is switched off before they expire.
+    if token.startswith(SESSION_TOKEN_PREFIX):
+        return find_signed_session(token)
 
-    sessions = read_json_list(AUTH_SESSIONS_FILE)
-    cleaned = clean_sessions(sessions)
     token_hash = hash_session_token(token)
-    now_iso = now_utc().isoformat()
-
-    match: dict[str, Any] | None = None
-    for session in cleaned:
-        stored_hash = str(session.get("tokenHash", ""))
-        if not stored_hash:
-            continue
-        if hmac.compare_digest(stored_hash, token_hash):
-            session["lastSeenAt"] = now_iso
-            match = session
-            break
+    now = now_utc()
+    with store_lock:
+        sessions = read_json_list(AUTH_SESSIONS_FILE)
+        cleaned = clean_sessions(sessions)
+
+        match: dict[str, Any] | None = None
+        touched = False
+        for session in cleaned:
+            stored_hash = str(session.get("tokenHash", ""))
+            if not stored_hash:
+                continue
+            if hmac.compare_digest(stored_hash, token_hash):
+                last_seen = parse_iso_datetime(str(session.get("lastSeenAt", "")))
+                if last_seen is None or (now - last_seen).total_seconds() >= SESSION_TOUCH_SECONDS:
+                    session["lastSeenAt"] = now.isoformat()
+                    touched = True
+                match = session
+                break
 
-    if cleaned != sessions or match is not None:
-        write_json_list(AUTH_SESSIONS_FILE, cleaned)
+        if len(cleaned) != len(sessions) or touched:
+            write_json_list(AUTH_SESSIONS_FILE, cleaned)
     return match
 
 
 def revoke_auth_session(token: str) -> None:
     if not token:
         return
-    sessions = read_json_list(AUTH_SESSIONS_FILE)
+    if token.startswith(SESSION_TOKEN_PREFIX):
+        claims = verify_session_token(token)
+        if claims is not None:
+            record_session_revocation(token_id=str(claims["sid"]), expires_at=float(claims["exp"]))
+        return
     token_hash = hash_session_token(token)
-    filtered = [item for item in sessions if not hmac.compare_digest(str(item.get("tokenHash", "")), token_hash)]
-    if len(filtered) != len(sessions):
-        write_json_list(AUTH_SESSIONS_FILE, filtered)
+    with store_lock:
+        sessions = read_json_list(AUTH_SESSIONS_FILE)
+        filtered = [item for item in sessions if not hmac.compare_digest(str(item.get("tokenHash", "")), token_hash)]
+        if len(filtered) != len(sessions):
+            write_json_list(AUTH_SESSIONS_FILE, filtered)
 
 
-def extract_bearer_token(headers: Any) -> str:
+def revoke_user_sessions(user_id: str) -> None:
+    # For role changes and removed users: ends every session the user holds in both modes.
+    if not user_id:
+        return
+    with store_lock:
+        sessions = read_json_list(AUTH_SESSIONS_FILE)
+        filtered = [item for item in sessions if str(item.get("userId", "")) != user_id]
+        if len(filtered) != len(sessions):
+            write_json_list(AUTH_SESSIONS_FILE, filtered)
+    record_session_revocation(user_id=user_id)
+
+
+_session_keys: dict[Path, bytes] = {}
+_session_keys_lock = threading.Lock()
+
+
+def session_signing_key() -> bytes:
+    key = load_session_signing_key(create=True)
+    if key is None:
+        raise RuntimeError("no session signing key")
+    return key
+
+
+def load_session_signing_key(*, create: bool) -> bytes | None:
+    configured = str(os.environ.get("SESSION_SIGNING_KEY", "")).strip()
+    if configured:
+        return configured.encode("utf-8")
+    # Without a configured key, processes sharing a data directory share a generated one.
+    with _session_keys_lock:
+        key = _session_keys.get(SESSION_KEY_FILE)
+        if key:
+            return key
+        try:
+            key = SESSION_KEY_FILE.read_bytes().strip()
+        except FileNotFoundError:
+            if not create:
+                return None
+            SESSION_KEY_FILE.parent.mkdir(parents=True, exist_ok=True)
+            key = secrets.token_hex(32).encode("ascii")
+            try:
+                descriptor = os.open(SESSION_KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                key = SESSION_KEY_FILE.read_bytes().strip()
+            else:
+                with os.fdopen(descriptor, "wb") as handle:
+                    handle.write(key)
+        if len(key) < 32:
+            if not create:
+                return None
+            raise RuntimeError(f"{SESSION_KEY_FILE} does not hold a usable signing key")
+        _session_keys[SESSION_KEY_FILE] = key
+        return key
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def sign_session_token(claims: dict[str, Any]) -> str:
+    body = SESSION_TOKEN_PREFIX + _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    signature = hmac.new(session_signing_key(), body.encode("utf-8"), hashlib.sha256).digest()
+    return f"{body}.{_b64encode(signature)}"
+
+
+def verify_session_token(token: str) -> dict[str, Any] | None:
+    body, _, signature = token.rpartition(".")
+    key = load_session_signing_key(create=False)
+    if not body.startswith(SESSION_TOKEN_PREFIX) or key is None:
+        return None
+    expected = _b64encode(hmac.new(key, body.encode("utf-8"), hashlib.sha256).digest())
+    if not hmac.compare_digest(expected, signature):
+        return None
+    encoded = body[len(SESSION_TOKEN_PREFIX) :]
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if not isinstance(claims, dict) or not isinstance(claims.get("exp"), (int, float)):
+        return None
+    if claims["exp"] <= time.time():
+        return None
+    return claims
+
+
+def create_signed_session(user: dict[str, Any]) -> dict[str, Any]:
+    issued_at = time.time()
+    claims = {
+        "sid": secrets.token_hex(8),
+        "uid": str(user.get("id", "")),
+        "usr": normalize_username(str(user.get("username", ""))),
+        "role": valid_session_role(str(user.get("role", "viewer"))),
+        "iat": round(issued_at, 3),
+        "exp": int(issued_at + SESSION_HOURS * 3600),
+    }
+    return {"token": sign_session_token(claims), "session": signed_session_record(claims)}
+
+
+def signed_session_record(claims: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": f"session_{claims.get('sid', '')}",
+        "userId": str(claims.get("uid", "")),
+        "username": str(claims.get("usr", "")),
+        "role": valid_session_role(str(claims.get("role", "viewer"))),
+        "createdAt": datetime.fromtimestamp(float(claims.get("iat", 0)), timezone.utc).isoformat(),
+        "expiresAt": datetime.fromtimestamp(float(claims["exp"]), timezone.utc).isoformat(),
+    }
+
+
+def find_signed_session(token: str) -> dict[str, Any] | None:
+    # One HMAC plus a lookup in the in-memory revocation set; no session store access.
+    claims = verify_session_token(token)
+    if claims is None:
+        return None
+    revocations = session_revocations()
+    if str(claims.get("sid", "")) in revocations["tokens"]:
+        return None
+    cutoff = revocations["users"].get(str(claims.get("uid", "")))
+    if cutoff is not None and float(claims.get("iat", 0)) <= float(cutoff):
+        return None
+    return signed_session_record(claims)
+
+
+_session_revocations: dict[str, Any] = {"checkedAt": -1e9, "path": None, "tokens": {}, "users": {}}
+_session_revocations_lock = threading.Lock()
+
+
+def session_revocations() -> dict[str, Any]:
+    # Re-read at most once per SESSION_REVOCATION_CHECK_SECONDS, which is how quickly a logout
+    # in another process sharing the data directory takes effect here.
+    now = time.monotonic()
+    with _session_revocations_lock:
+        if (
+            now - _session_revocations["checkedAt"] < SESSION_REVOCATION_CHECK_SECONDS
+            and _session_revocations["path"] == SESSION_REVOCATIONS_FILE
+        ):
+            return _session_revocations
+    stored = load_json_store(SESSION_REVOCATIONS_FILE)
+    stored = stored if isinstance(stored, dict) else {}
+    with _session_revocations_lock:
+        _session_revocations.update(
+            {
+                "checkedAt": now,
+                "path": SESSION_REVOCATIONS_FILE,
+                "tokens": stored.get("tokens") if isinstance(stored.get("tokens"), dict) else {},
+                "users": stored.get("users") if isinstance(stored.get("users"), dict) else {},
+            }
+        )
+        return _session_revocations
+
+
+def record_session_revocation(*, token_id: str = "", expires_at: float = 0.0, user_id: str = "") -> None:
+    now = time.time()
+    with store_lock:
+        stored = load_json_store(SESSION_REVOCATIONS_FILE)
+        stored = stored if isinstance(stored, dict) else {}
+        # A revoked token only needs remembering until it would have expired anyway, and a
+        # per-user cutoff only until every token issued before it has expired.
+        tokens = {
+            key: value
+            for key, value in (stored.get("tokens") or {}).items()
+            if isinstance(value, (int, float)) and value > now
+        }
+        users = {
+            key: value
+            for key, value in (stored.get("users") or {}).items()
+            if isinstance(value, (int, float)) and value > now - SESSION_HOURS * 3600
+        }
+        if token_id:
+            tokens[token_id] = expires_at
+        if user_id:
+            users[user_id] = round(now, 3)
+        save_json_store(SESSION_REVOCATIONS_FILE, {"tokens": tokens, "users": users}, compact=True)
+    with _session_revocations_lock:
+        _session_revocations["checkedAt"] = -1e9
+
+
+def extract_bearer_token(headers: Any) -> str:
     try:
         auth = str(headers.get("Authorization", "") or "")
     except Exception:  # noqa: BLE001
@@ -866,25 +2064,29 @@ def authorize_request(headers: Any) -> dict[str, Any]:
     configured = env("ADMIN_API_TOKEN")
     provided_admin = extract_admin_token(headers)
     if configured and provided_admin and hmac.compare_digest(configured, provided_admin):
-        return {
-            "ok": True,
-            "source": "admin_token",
-            "userId": "system_admin_token",
-            "username": "token-admin",
-            "role": "owner",
-        }
+        return note_request_auth(
+            {
+                "ok": True,
+                "source": "admin_token",
+                "userId": "system_admin_token",
+                "username": "token-admin",
+                "role": "owner",
+            }
+        )
 
     session_token = extract_bearer_token(headers)
     session = find_auth_session(session_token)
     if session:
         role = valid_session_role(str(session.get("role", "viewer")))
-        return {
-            "ok": True,
-            "source": "session",
-            "userId": str(session.get("userId", "")),
-            "username": normalize_username(str(session.get("username", ""))),
-            "role": role,
-        }
+        return note_request_auth(
+            {
+                "ok": True,
+                "source": "session",
+                "userId": str(session.get("userId", "")),
+                "username": normalize_username(str(session.get("username", ""))),
+                "role": role,
+            }
+        )
 
     return {"ok": False}
 
@@ -1073,8 +2275,142 @@ def provider_health() -> list[dict[str, Any]]:
     ]
 
 
+PROVIDER_PROBE_IDS = ["render", "dynadot", "supabase", "neon", "openai"]
+_provider_probes: dict[str, dict[str, Any]] = {}
+_provider_probe_wakeup = threading.Event()
+
+
+def probe_provider(provider_id: str) -> dict[str, Any] | None:
+    if provider_id == "render":
+        token = env("RENDER_API_KEY")
+        if not token:
+            return None
+        response = provider_api_request(
+            method="GET",
+            idempotent=True,
+            url=f"{provider_api_base('render')}/v1/owners?limit=1",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=PROVIDER_PROBE_TIMEOUT,
+        )
+    elif provider_id == "dynadot":
+        api_key = env("DYNADOT_API_KEY")
+        if not api_key:
+            return None
+        response = provider_api_request(
+            method="GET",
+            idempotent=True,
+            url=f"{provider_api_base('dynadot')}/api3.json?{urlencode({'key': api_key, 'command': 'account_info'})}",
+            timeout=PROVIDER_PROBE_TIMEOUT,
+        )
+        if response.get("ok"):
+            payload = dynadot_get_response(response.get("data"), "AccountInfoResponse")
+            if payload and not dynadot_status_ok(payload):
+                response = {"ok": False, "status": response.get("status", 0), "error": dynadot_error(payload, "Dynadot rejected the API key")}
+    elif provider_id == "supabase":
+        token = env("SUPABASE_ACCESS_TOKEN")
+        if not token:
+            return None
+        response = provider_api_request(
+            method="GET",
+            idempotent=True,
+            url=f"{provider_api_base('supabase')}/v1/organizations",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=PROVIDER_PROBE_TIMEOUT,
+        )
+    elif provider_id == "neon":
+        token = env("NEON_API_KEY")
+        if not token:
+            return None
+        response = provider_api_request(
+            method="GET",
+            idempotent=True,
+            url=f"{provider_api_base('neon')}/api/v2/projects?limit=1",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=PROVIDER_PROBE_TIMEOUT,
+        )
+    elif provider_id == "openai":
+        api_key = env("OPENAI_API_KEY")
+        if not api_key:
+            return None
+        response = provider_api_request(
+            method="GET",
+            idempotent=True,
+            url=f"{provider_api_base('openai')}/v1/models",
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=PROVIDER_PROBE_TIMEOUT,
+        )
+    else:
+        return None
+    return response
+
+
+def run_provider_probe(provider_id: str) -> float:
+    previous = _provider_probes.get(provider_id, {})
+    started = time.perf_counter()
+    response = probe_provider(provider_id)
+    checked_at = now_utc().isoformat()
+    if response is None:
+        _provider_probes[provider_id] = {"state": "not_configured", "lastCheckedAt": checked_at}
+        return float(PROVIDER_PROBE_SECONDS)
+
+    failures = 0 if response.get("ok") else int(previous.get("consecutiveFailures", 0)) + 1
+    error = response.get("error", "")
+    record = {
+        "state": "ok" if response.get("ok") else "error",
+        "httpStatus": int(response.get("status", 0)),
+        "latencyMs": round((time.perf_counter() - started) * 1000, 1),
+        "lastCheckedAt": checked_at,
+        "lastSuccessAt": checked_at if response.get("ok") else previous.get("lastSuccessAt", ""),
+        "error": "" if response.get("ok") else (error if isinstance(error, str) else json.dumps(error))[:300],
+        "consecutiveFailures": failures,
+    }
+    delay = min(PROVIDER_PROBE_SECONDS * (2 ** min(failures, 10)), max(PROVIDER_PROBE_SECONDS, PROVIDER_PROBE_MAX_SECONDS))
+    delay *= random.uniform(0.8, 1.2)
+    record["nextCheckAt"] = (now_utc() + timedelta(seconds=delay)).isoformat()
+    _provider_probes[provider_id] = record
+    return delay
+
+
+def provider_probe_loop() -> None:
+    next_due = {provider_id: 0.0 for provider_id in PROVIDER_PROBE_IDS}
+    while True:
+        if _provider_probe_wakeup.is_set():
+            _provider_probe_wakeup.clear()
+            next_due = {provider_id: 0.0 for provider_id in PROVIDER_PROBE_IDS}
+        now = time.monotonic()
+        for provider_id in PROVIDER_PROBE_IDS:
+            if next_due[provider_id] > now:
+                continue
+            try:
+                delay = run_provider_probe(provider_id)
+            except Exception as exc:  # noqa: BLE001
+                _provider_probes[provider_id] = {"state": "error", "error": f"Probe exception: {exc}", "lastCheckedAt": now_utc().isoformat()}
+                delay = float(PROVIDER_PROBE_SECONDS)
+            next_due[provider_id] = time.monotonic() + delay
+        wait = max(1.0, min(next_due.values()) - time.monotonic())
+        _provider_probe_wakeup.wait(timeout=wait)
+
+
+def request_provider_probe() -> None:
+    _provider_probe_wakeup.set()
+
+
+def provider_health_with_probes() -> list[dict[str, Any]]:
+    providers = provider_health()
+    for provider in providers:
+        probe = _provider_probes.get(str(provider.get("id", "")))
+        if not provider.get("configured"):
+            provider["live"] = {"state": "not_configured"}
+        elif probe is None or probe.get("state") == "not_configured":
+            provider["live"] = {"state": "pending" if PROVIDER_PROBE_ENABLED else "disabled"}
+        else:
+            provider["live"] = dict(probe)
+        provider["breaker"] = breaker_snapshot(urlparse(provider_api_base(str(provider.get("id", "")))).netloc)
+    return providers
+
+
 def create_service_request(body: dict[str, Any]) -> dict[str, Any]:
-    catalog_index = build_catalog_index(provider_catalog())
+    catalog_index = cached_catalog_index()
     resolved_items: list[dict[str, Any]] = []
     total = 0.0
 
@@ -1107,42 +2443,315 @@ def create_service_request(body: dict[str, Any]) -> dict[str, Any]:
             }
         )
 
-    requests = list_service_requests()
-    request_id = next_service_request_id(requests)
-    timestamp = datetime.now(timezone.utc).isoformat()
+    with store_lock:
+        requests = list_service_requests()
+        request_id = next_service_request_id(requests)
+        timestamp = datetime.now(timezone.utc).isoformat()
+
+        record = {
+            "requestId": request_id,
+            "createdAt": timestamp,
+            "updatedAt": timestamp,
+            "customerName": body["customerName"].strip(),
+            "email": body["email"].strip(),
+            "projectName": body["projectName"].strip(),
+            "notes": body.get("notes", "").strip(),
+            "items": resolved_items,
+            "total": round(total, 2),
+            "status": "submitted",
+            "statusHistory": [{"status": "submitted", "timestamp": timestamp, "reason": "request created"}],
+            "provisioning": [],
+        }
 
-    record = {
-        "requestId": request_id,
-        "createdAt": timestamp,
-        "updatedAt": timestamp,
-        "customerName": body["customerName"].strip(),
-        "email": body["email"].strip(),
-        "projectName": body["projectName"].strip(),
-        "notes": body.get("notes", "").strip(),
-        "items": resolved_items,
-        "total": round(total, 2),
-        "status": "submitted",
-        "statusHistory": [{"status": "submitted", "timestamp": timestamp, "reason": "request created"}],
-        "provisioning": [],
+        requests.insert(0, record)
+        write_service_requests(requests)
+        publish_event("request.created", record)
+
+    return {"ok": True, "request": record}
+
+
+EXPORT_COLUMNS = [
+    "requestId",
+    "createdAt",
+    "updatedAt",
+    "status",
+    "customerName",
+    "email",
+    "projectName",
+    "total",
+    "itemIndex",
+    "providerId",
+    "serviceId",
+    "planId",
+    "planLabel",
+    "billingCycle",
+    "unitPrice",
+    "provisioned",
+    "provisionedAt",
+    "resourceId",
+    "resourceState",
+    "provisioningError",
+]
+EXPORT_CHUNK_RECORDS = 500
+
+
+def export_rows(record: dict[str, Any]) -> list[dict[str, Any]]:
+    base = {key: record.get(key, "") for key in EXPORT_COLUMNS[:8]}
+    provisioning = {
+        entry.get("itemIndex"): entry for entry in record.get("provisioning", []) or [] if isinstance(entry, dict)
     }
+    items = [item for item in record.get("items", []) or [] if isinstance(item, dict)]
+    rows: list[dict[str, Any]] = []
+    for index, item in enumerate(items or [{}]):
+        entry = provisioning.get(index) if items else None
+        result = entry.get("result", {}) if isinstance(entry, dict) else {}
+        resource = entry.get("resource", {}) if isinstance(entry, dict) else {}
+        error = result.get("error", "") if isinstance(result, dict) else ""
+        rows.append(
+            {
+                **base,
+                "itemIndex": index if items else "",
+                "providerId": item.get("providerId", ""),
+                "serviceId": item.get("serviceId", ""),
+                "planId": item.get("planId", ""),
+                "planLabel": item.get("planLabel", ""),
+                "billingCycle": item.get("billingCycle", ""),
+                "unitPrice": item.get("unitPrice", ""),
+                "provisioned": bool(result.get("ok")) if entry else "",
+                "provisionedAt": entry.get("timestamp", "") if entry else "",
+                "resourceId": result.get("resourceId", "") if isinstance(result, dict) else "",
+                "resourceState": resource.get("state", "") if isinstance(resource, dict) else "",
+                "provisioningError": error if isinstance(error, str) else json.dumps(error),
+            }
+        )
+    return rows
 
-    requests.insert(0, record)
-    write_service_requests(requests)
 
-    return {"ok": True, "request": record}
+def export_matches(record: dict[str, Any], *, date_from: str, date_to: str, statuses: set[str]) -> bool:
+    created_day = str(record.get("createdAt", ""))[:10]
+    if date_from and created_day < date_from:
+        return False
+    if date_to and created_day > date_to:
+        return False
+    return not statuses or str(record.get("status", "")) in statuses
 
 
-def update_service_request_status(request_id: str, status: str, reason: str) -> dict[str, Any]:
-    requests = list_service_requests()
-    record = find_service_request(requests, request_id)
-    if record is None:
-        return {"ok": False, "error": "Request not found"}
+def csv_safe(value: Any) -> Any:
+    # Keep spreadsheet apps from evaluating customer-supplied text as formulas.
+    if isinstance(value, str) and value[:1] in {"=", "+", "-", "@", "\t", "\r"}:
+        return f"'{value}"
+    return value
+
+
+def export_chunk(
+    export_format: str, records: list[dict[str, Any]], *, date_from: str, date_to: str, statuses: set[str]
+) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        if not export_matches(record, date_from=date_from, date_to=date_to, statuses=statuses):
+            continue
+        for row in export_rows(record):
+            if export_format == "csv":
+                writer.writerow([csv_safe(row[column]) for column in EXPORT_COLUMNS])
+            else:
+                buffer.write(json.dumps(row, separators=(",", ":")) + "\n")
+    return buffer.getvalue().encode("utf-8")
+
+
+def iter_export_chunks(export_format: str, *, date_from: str, date_to: str, statuses: set[str]) -> Iterator[bytes]:
+    filters = {"date_from": date_from, "date_to": date_to, "statuses": statuses}
+    with store_lock:
+        records = list(list_service_requests())
+        hot_ids = {str(record.get("requestId", "")) for record in records}
+    if export_format == "csv":
+        yield (",".join(EXPORT_COLUMNS) + "\r\n").encode("utf-8")
+    for start in range(0, len(records), EXPORT_CHUNK_RECORDS):
+        # Records are shared with the store cache; read each slice under the lock.
+        with store_lock:
+            data = export_chunk(export_format, records[start : start + EXPORT_CHUNK_RECORDS], **filters)
+        if data:
+            yield data
+    # Archived requests still belong in exports for their dates. Skip any the hot store also holds,
+    # left there by an archive run that stopped before rewriting it.
+    batch: list[dict[str, Any]] = []
+    for name in archive_segments(date_from=date_from, date_to=date_to):
+        for record in iter_archive_segment(name):
+            if str(record.get("requestId", "")) in hot_ids:
+                continue
+            batch.append(record)
+            if len(batch) >= EXPORT_CHUNK_RECORDS:
+                data = export_chunk(export_format, batch, **filters)
+                batch = []
+                if data:
+                    yield data
+    data = export_chunk(export_format, batch, **filters)
+    if data:
+        yield data
+
+
+# Archived requests live in gzip NDJSON segments partitioned by creation month
+# (archive/service-requests-YYYY-MM.ndjson.gz). Each run appends one gzip member,
+# and archive/index.json maps request IDs to their segment for lookups.
+def archive_index_path() -> Path:
+    return ARCHIVE_DIR / "index.json"
+
+
+def read_archive_index() -> dict[str, str]:
+    payload = load_json_store(archive_index_path())
+    return payload if isinstance(payload, dict) else {}
+
+
+def archive_segment_name(record: dict[str, Any]) -> str:
+    month = str(record.get("createdAt", ""))[:7]
+    if not re.match(r"^\d{4}-\d{2}$", month):
+        month = "undated"
+    return f"service-requests-{month}.ndjson.gz"
+
+
+def iter_archive_segment(name: str) -> Iterator[dict[str, Any]]:
+    path = ARCHIVE_DIR / name
+    if not path.exists():
+        return
+    # A run that crashed after appending but before saving the index appends the same records
+    # again next time; a record's segment follows from its createdAt, so duplicates share a file.
+    seen: set[str] = set()
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(record, dict):
+                continue
+            request_id = str(record.get("requestId", ""))
+            if request_id in seen:
+                continue
+            seen.add(request_id)
+            yield record
+
+
+def archive_segments(*, date_from: str, date_to: str) -> list[str]:
+    # Oldest first; monthly files entirely outside the date range are skipped.
+    names: list[str] = []
+    for name in sorted(set(read_archive_index().values())):
+        month = name.removeprefix("service-requests-").removesuffix(".ndjson.gz")
+        if month != "undated" and ((date_from and month < date_from[:7]) or (date_to and month > date_to[:7])):
+            continue
+        names.append(name)
+    return names
+
+
+def archive_service_requests(*, older_than_days: int | None = None) -> dict[str, Any]:
+    cutoff = (now_utc() - timedelta(days=ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days)).isoformat()
+    with store_lock:
+        requests = list_service_requests()
+        index = read_archive_index()
+        moving = [
+            record
+            for record in requests
+            if str(record.get("status", "")) in ARCHIVE_STATUSES and str(record.get("updatedAt", "")) < cutoff
+        ]
+        if not moving:
+            return {"ok": True, "archived": 0, "segments": [], "hot": len(requests)}
+
+        by_segment: dict[str, list[dict[str, Any]]] = {}
+        for record in moving:
+            # A record already indexed was written by an interrupted earlier run; only drop it from the hot store.
+            if str(record.get("requestId", "")) not in index:
+                by_segment.setdefault(archive_segment_name(record), []).append(record)
+
+        ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+        for name, records in by_segment.items():
+            lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+            with open(ARCHIVE_DIR / name, "ab") as handle:
+                handle.write(gzip.compress(lines.encode("utf-8")))
+                handle.flush()
+                os.fsync(handle.fileno())
+            for record in records:
+                index[str(record.get("requestId", ""))] = name
+        save_json_store(archive_index_path(), index)
+
+        moved_ids = {str(record.get("requestId", "")) for record in moving}
+        remaining = [record for record in requests if str(record.get("requestId", "")) not in moved_ids]
+        write_service_requests(remaining)
+        publish_event("requests.archived", {"requestIds": sorted(moved_ids)})
+    return {"ok": True, "archived": len(moving), "segments": sorted(by_segment), "hot": len(remaining)}
+
+
+def find_archived_service_request(request_id: str) -> dict[str, Any] | None:
+    name = read_archive_index().get(request_id)
+    if not name:
+        return None
+    for record in iter_archive_segment(name):
+        if str(record.get("requestId", "")) == request_id:
+            return record
+    return None
+
+
+def search_archived_service_requests(
+    *, query: str, statuses: set[str], date_from: str, date_to: str, limit: int
+) -> list[dict[str, Any]]:
+    needle = query.strip().lower()
+    matches: list[dict[str, Any]] = []
+    for name in reversed(archive_segments(date_from=date_from, date_to=date_to)):
+        for record in iter_archive_segment(name):
+            if not export_matches(record, date_from=date_from, date_to=date_to, statuses=statuses):
+                continue
+            if needle:
+                haystack = " ".join(
+                    str(record.get(key, "")) for key in ("requestId", "customerName", "email", "projectName")
+                ).lower()
+                if needle not in haystack:
+                    continue
+            matches.append(record)
+            if len(matches) >= limit:
+                return matches
+    return matches
+
+
+def archive_loop() -> None:
+    while True:
+        try:
+            result = archive_service_requests()
+            if result["archived"]:
+                write_log_record(
+                    {
+                        "type": "message",
+                        "ts": now_utc().isoformat(timespec="milliseconds"),
+                        "message": f"archived {result['archived']} service requests; {result['hot']} remain hot",
+                    }
+                )
+        except Exception as exc:  # noqa: BLE001
+            write_log_record({"type": "message", "ts": now_utc().isoformat(timespec="milliseconds"), "message": f"archive run failed: {exc}"})
+        time.sleep(ARCHIVE_INTERVAL_HOURS * 3600)
 
-    apply_status(record, status=status, reason=reason)
-    write_service_requests(requests)
+
+def update_service_request_status(request_id: str, status: str, reason: str) -> dict[str, Any]:
+    with store_lock:
+        requests = list_service_requests()
+        record = find_service_request(requests, request_id)
+        if record is None:
+            return {"ok": False, "error": "Request not found"}
+
+        events: list[dict[str, Any]] = []
+        apply_status(record, status=status, reason=reason, events=events)
+        write_service_requests(requests)
+        publish_status_events(events)
     return {"ok": True, "request": record}
 
 
+_catalog_index_cache: dict[str, dict[tuple[str, str, str, str], dict[str, Any]]] = {}
+
+
+def cached_catalog_index() -> dict[tuple[str, str, str, str], dict[str, Any]]:
+    indexed = _catalog_index_cache.get("providers")
+    if indexed is None:
+        indexed = build_catalog_index(provider_catalog())
+        _catalog_index_cache["providers"] = indexed
+    return indexed
+
+
 def build_catalog_index(catalog: dict[str, Any]) -> dict[tuple[str, str, str, str], dict[str, Any]]:
     indexed: dict[tuple[str, str, str, str], dict[str, Any]] = {}
     for provider in catalog.get("providers", []):
@@ -1173,22 +2782,182 @@ def build_catalog_index(catalog: dict[str, Any]) -> dict[tuple[str, str, str, st
     return indexed
 
 
+_template_index: dict[str, Any] = {}
+_template_index_lock = threading.Lock()
+
+
+def template_tokens(value: Any) -> list[str]:
+    if isinstance(value, list):
+        value = " ".join(str(item) for item in value)
+    return re.findall(r"[a-z0-9]+", str(value or "").lower())
+
+
+def build_template_index(sources: list[Any]) -> dict[str, Any]:
+    templates: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for payload in sources:
+        items = payload.get("templates") if isinstance(payload, dict) and "templates" in payload else [payload]
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            template_id = str(item.get("id", "")).strip()
+            if not template_id or template_id in seen:
+                continue
+            seen.add(template_id)
+            # Import manifests carry local export paths and notes that are not for the public API.
+            template = {key: value for key, value in item.items() if key not in {"source", "notes"}}
+            template.setdefault("status", "Customizable")
+            template.setdefault("clones", 0)
+            template.setdefault("perfectFor", [])
+            template.setdefault("techTags", [])
+            template.setdefault("liveUrl", f"template-live.html?template={template_id}")
+            templates.append(template)
+
+    # token -> {template position: weight}; a token found in several fields adds up.
+    postings: dict[str, dict[int, int]] = {}
+    categories: dict[str, int] = {}
+    for position, template in enumerate(templates):
+        for field, weight in TEMPLATE_FIELD_WEIGHTS.items():
+            for token in set(template_tokens(template.get(field))):
+                bucket = postings.setdefault(token, {})
+                bucket[position] = bucket.get(position, 0) + weight
+        category = str(template.get("category", "")).strip().lower()
+        categories[category] = categories.get(category, 0) + 1
+    version = hashlib.sha256(json.dumps(templates, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return {
+        "templates": templates,
+        "postings": postings,
+        "terms": sorted(postings),
+        "categories": categories,
+        "version": version,
+    }
+
+
+def template_index() -> dict[str, Any]:
+    now = time.monotonic()
+    with _template_index_lock:
+        cached = _template_index.get("index")
+        if cached is not None and now - _template_index["checkedAt"] < TEMPLATE_INDEX_CHECK_SECONDS:
+            return cached
+    paths = [TEMPLATE_CATALOG_FILE, *sorted(TEMPLATE_SEED_DIR.glob("template-seed.*.json"))]
+    sources = [payload for payload in (load_json_store(path) for path in paths) if payload is not None]
+    with _template_index_lock:
+        cached = _template_index.get("index")
+        previous = _template_index.get("sources", [])
+        # load_json_store hands back the same object until a file changes, so identity is the signature.
+        if cached is None or len(previous) != len(sources) or any(a is not b for a, b in zip(previous, sources)):
+            cached = build_template_index(sources)
+            _template_index.update({"index": cached, "sources": sources})
+        _template_index["checkedAt"] = now
+        return cached
+
+
+def search_templates(query: str, category: str, page: int, page_size: int) -> dict[str, Any]:
+    index = template_index()
+    templates = index["templates"]
+    tokens = template_tokens(query)
+    scores: dict[int, int] | None = None
+    for token in tokens:
+        # Each query token matches indexed terms by prefix; exact terms score double.
+        matched: dict[int, int] = {}
+        terms = index["terms"]
+        for term in terms[bisect.bisect_left(terms, token) :]:
+            if not term.startswith(token):
+                break
+            factor = 2 if term == token else 1
+            for position, weight in index["postings"][term].items():
+                matched[position] = max(matched.get(position, 0), weight * factor)
+        scores = matched if scores is None else {pos: scores[pos] + value for pos, value in matched.items() if pos in scores}
+        if not scores:
+            break
+
+    positions = list(range(len(templates))) if scores is None else list(scores)
+    facets: dict[str, int] = {}
+    for position in positions:
+        name = str(templates[position].get("category", "")).strip().lower()
+        facets[name] = facets.get(name, 0) + 1
+    if category:
+        positions = [pos for pos in positions if str(templates[pos].get("category", "")).strip().lower() == category]
+    if scores is not None:
+        positions.sort(key=lambda pos: (-scores[pos], -int(templates[pos].get("clones") or 0), pos))
+
+    total = len(positions)
+    start = (page - 1) * page_size
+    return {
+        "ok": True,
+        "query": query,
+        "category": category,
+        "page": page,
+        "pageSize": page_size,
+        "total": total,
+        "pages": max(1, -(-total // page_size)),
+        "categories": facets,
+        "templates": [templates[pos] for pos in positions[start : start + page_size]],
+    }
+
+
 def list_service_requests() -> list[dict[str, Any]]:
-    DATA_DIR.mkdir(exist_ok=True)
-    if not SERVICE_REQUESTS_FILE.exists():
-        return []
-    try:
-        payload = json.loads(SERVICE_REQUESTS_FILE.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        return []
-    if not isinstance(payload, list):
-        return []
-    return [item for item in payload if isinstance(item, dict)]
+    return read_json_list(SERVICE_REQUESTS_FILE)
 
 
 def write_service_requests(requests: list[dict[str, Any]]) -> None:
-    DATA_DIR.mkdir(exist_ok=True)
-    SERVICE_REQUESTS_FILE.write_text(json.dumps(requests, indent=2), encoding="utf-8")
+    save_json_store(SERVICE_REQUESTS_FILE, requests, compact=True)
+
+
+# Completed responses are persisted so a retry after a restart still replays;
+# in-flight keys only live in memory.
+_idempotency_lock = threading.Lock()
+_idempotency_in_flight: dict[str, dict[str, Any]] = {}
+
+
+def read_idempotency_entries() -> dict[str, dict[str, Any]]:
+    payload = load_json_store(IDEMPOTENCY_FILE)
+    if not isinstance(payload, dict):
+        return {}
+    now = time.time()
+    return {key: value for key, value in payload.items() if isinstance(value, dict) and float(value.get("expiresAt", 0)) > now}
+
+
+def idempotency_fingerprint(route: str, body: dict[str, Any]) -> str:
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{route}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+def claim_idempotency_key(scoped_key: str, fingerprint: str) -> dict[str, Any]:
+    with _idempotency_lock:
+        stored = read_idempotency_entries().get(scoped_key)
+        if stored is not None:
+            if stored.get("fingerprint") != fingerprint:
+                return {"state": "conflict"}
+            return {"state": "replay", "status": int(stored.get("status", 200)), "response": stored.get("response", {})}
+        pending = _idempotency_in_flight.get(scoped_key)
+        if pending is not None:
+            if pending["fingerprint"] != fingerprint:
+                return {"state": "conflict"}
+            return {"state": "wait", "event": pending["event"]}
+        _idempotency_in_flight[scoped_key] = {"fingerprint": fingerprint, "event": threading.Event()}
+        return {"state": "run"}
+
+
+def complete_idempotency_key(scoped_key: str, fingerprint: str, status: int, response: dict[str, Any] | None) -> None:
+    with _idempotency_lock:
+        pending = _idempotency_in_flight.pop(scoped_key, None)
+        try:
+            if response is not None:
+                entries = read_idempotency_entries()
+                entries[scoped_key] = {
+                    "fingerprint": fingerprint,
+                    "status": status,
+                    "response": response,
+                    "expiresAt": time.time() + IDEMPOTENCY_TTL_SECONDS,
+                }
+                if len(entries) > IDEMPOTENCY_MAX_KEYS:
+                    newest = sorted(entries.items(), key=lambda item: float(item[1].get("expiresAt", 0)))[-IDEMPOTENCY_MAX_KEYS:]
+                    entries = dict(newest)
+                save_json_store(IDEMPOTENCY_FILE, entries)
+        finally:
+            if pending is not None:
+                pending["event"].set()
 
 
 def next_service_request_id(existing: list[dict[str, Any]]) -> str:
@@ -1209,7 +2978,58 @@ def find_service_request(requests: list[dict[str, Any]], request_id: str) -> dic
     return None
 
 
-def apply_status(record: dict[str, Any], *, status: str, reason: str) -> None:
+# Event ids are "<epoch>.<seq>" so a client resuming against a restarted server
+# gets a reset instead of silently skipping events.
+EVENTS_EPOCH = str(int(time.time()))
+_events: deque[tuple[int, bytes]] = deque(maxlen=EVENTS_BUFFER_SIZE)
+_events_cond = threading.Condition()
+_events_state = {"lastSeq": 0, "streams": 0}
+
+
+def publish_event(kind: str, payload: dict[str, Any]) -> None:
+    data = json.dumps(payload, separators=(",", ":"))
+    with _events_cond:
+        _events_state["lastSeq"] += 1
+        seq = _events_state["lastSeq"]
+        _events.append((seq, f"id: {EVENTS_EPOCH}.{seq}\nevent: {kind}\ndata: {data}\n\n".encode("utf-8")))
+        _events_cond.notify_all()
+
+
+def event_cursor(last_event_id: str) -> int | None:
+    epoch, _, seq = str(last_event_id or "").strip().partition(".")
+    with _events_cond:
+        last_seq = _events_state["lastSeq"]
+        if not epoch:
+            return last_seq
+        if epoch != EVENTS_EPOCH or not seq.isdigit() or int(seq) > last_seq:
+            return None
+        oldest = _events[0][0] if _events else last_seq + 1
+        if int(seq) < oldest - 1:
+            return None
+        return int(seq)
+
+
+def wait_for_events(after: int, timeout: float) -> tuple[list[bytes], int, bool]:
+    with _events_cond:
+        if _events_state["lastSeq"] <= after:
+            _events_cond.wait(timeout=timeout)
+        last_seq = _events_state["lastSeq"]
+        if _events and after < _events[0][0] - 1:
+            return [], last_seq, True
+        return [data for seq, data in _events if seq > after], last_seq, False
+
+
+def request_event_payload(record: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "requestId": record.get("requestId", ""),
+        "status": record.get("status", ""),
+        "updatedAt": record.get("updatedAt", ""),
+        "provisioning": record.get("provisioning", []),
+    }
+
+
+def apply_status(record: dict[str, Any], *, status: str, reason: str, events: list[dict[str, Any]]) -> None:
+    # Status events are queued in `events`; callers publish them once the store write succeeds.
     status_value = status.strip().lower()
     if status_value not in ALLOWED_REQUEST_STATUSES:
         return
@@ -1223,6 +3043,12 @@ def apply_status(record: dict[str, Any], *, status: str, reason: str) -> None:
             history = []
             record["statusHistory"] = history
         history.insert(0, {"status": status_value, "timestamp": timestamp, "reason": reason})
+        events.append({"requestId": record.get("requestId", ""), "status": status_value, "previous": current, "reason": reason, "updatedAt": timestamp})
+
+
+def publish_status_events(events: list[dict[str, Any]]) -> None:
+    for payload in events:
+        publish_event("request.status", payload)
 
 
 def env(name: str, default: str = "") -> str:
@@ -1235,6 +3061,11 @@ def env(name: str, default: str = "") -> str:
     return str(default).strip()
 
 
+def provider_api_base(provider: str) -> str:
+    override = str(os.environ.get(f"{provider.upper()}_API_BASE", "")).strip().rstrip("/")
+    return override or PROVIDER_API_BASES[provider]
+
+
 def suggest_project_name_from_prompt(prompt: str) -> str:
     cleaned = re.sub(r"[^a-zA-Z0-9\s]", " ", prompt).strip()
     if not cleaned:
@@ -1441,7 +3272,7 @@ def generate_ai_build_plan(
 
     response = provider_api_request(
         method="POST",
-        url="https://api.openai.com/v1/chat/completions",
+        url=f"{provider_api_base('openai')}/v1/chat/completions",
         headers={"Authorization": f"Bearer {api_key}"},
         payload={
             "model": model,
@@ -1551,7 +3382,7 @@ def generate_ai_static_files(*, context: dict[str, Any], prompt: str, instructio
 
     response = provider_api_request(
         method="POST",
-        url="https://api.openai.com/v1/chat/completions",
+        url=f"{provider_api_base('openai')}/v1/chat/completions",
         headers={"Authorization": f"Bearer {api_key}"},
         payload={
             "model": model,
@@ -1705,7 +3536,7 @@ def generate_ai_framework_files(
 
     response = provider_api_request(
         method="POST",
-        url="https://api.openai.com/v1/chat/completions",
+        url=f"{provider_api_base('openai')}/v1/chat/completions",
         headers={"Authorization": f"Bearer {api_key}"},
         payload={
             "model": model,
@@ -1793,8 +3624,25 @@ def generate_ai_framework_files(
 
 
 def provision_service_request(request_id: str, options: dict[str, str]) -> dict[str, Any]:
-    requests = list_service_requests()
-    request_record = find_service_request(requests, request_id)
+    run = run_provisioning(request_id, options)
+    if not run.get("ok"):
+        return run
+
+    with store_lock:
+        requests = list_service_requests()
+        events: list[dict[str, Any]] = []
+        result = merge_provisioning(requests, run, events)
+        if result.get("ok"):
+            write_service_requests(requests)
+            publish_status_events(events)
+            publish_event("request.provisioning", request_event_payload(result["request"]))
+
+    request_reconcile()
+    return result
+
+
+def run_provisioning(request_id: str, options: dict[str, str]) -> dict[str, Any]:
+    request_record = find_service_request(list_service_requests(), request_id)
 
     if request_record is None:
         return {"ok": False, "error": "Request not found"}
@@ -1861,87 +3709,543 @@ def provision_service_request(request_id: str, options: dict[str, str]) -> dict[
             "result": result,
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
+        if RECONCILE_ENABLED and result.get("ok") and result.get("resourceId") and result.get("provider") in RESOURCE_STATUS_PROVIDERS:
+            entry["resource"] = {"state": "pending", "checks": 0, "nextCheckAt": entry["timestamp"], "intervalSeconds": RECONCILE_MIN_SECONDS}
         provisioning_results.append(entry)
-        existing_map[idx] = entry
         if result.get("ok"):
             success_count += 1
 
     total_processed = len(provisioning_results)
     if total_processed == 0:
         return {"ok": False, "error": "No provisioning items processed"}
+    return {
+        "ok": True,
+        "requestId": request_id,
+        "entries": provisioning_results,
+        "retryFailed": retry_failed,
+        "summary": {"success": success_count, "failed": total_processed - success_count, "total": total_processed},
+    }
 
-    finalized_entries = [existing_map[i] for i in sorted(existing_map.keys())]
-    request_record["provisioning"] = finalized_entries
-
-    has_all_items = len(existing_map) == len(items)
-    if has_all_items:
-        total_ok = 0
-        for idx in range(len(items)):
-            entry = existing_map.get(idx, {})
-            result = entry.get("result", {}) if isinstance(entry, dict) else {}
-            if isinstance(result, dict) and result.get("ok"):
-                total_ok += 1
-        if total_ok == len(items):
-            next_status = "active"
-        elif total_ok == 0:
-            next_status = "provision_failed"
-        else:
-            next_status = "partially_active"
-    else:
-        next_status = "provisioning"
 
+# Callers hold store_lock and save the store after merging one or more runs.
+def merge_provisioning(requests: list[dict[str, Any]], run: dict[str, Any], events: list[dict[str, Any]]) -> dict[str, Any]:
+    request_record = find_service_request(requests, run["requestId"])
+    if request_record is None:
+        return {"ok": False, "error": "Request not found"}
+
+    merged_map: dict[int, dict[str, Any]] = {}
+    current_entries = request_record.get("provisioning", [])
+    if isinstance(current_entries, list):
+        for entry in current_entries:
+            if isinstance(entry, dict) and isinstance(entry.get("itemIndex"), int):
+                merged_map[entry["itemIndex"]] = entry
+    for entry in run["entries"]:
+        merged_map[entry["itemIndex"]] = entry
+    request_record["provisioning"] = [merged_map[i] for i in sorted(merged_map.keys())]
+
+    items = request_record.get("items", [])
+    next_status = provisioning_status(len(items) if isinstance(items, list) else 0, merged_map)
     apply_status(
         request_record,
         status=next_status,
-        reason="retry failed provisioning" if retry_failed else "provisioning run",
+        reason="retry failed provisioning" if run["retryFailed"] else "provisioning run",
+        events=events,
     )
-    write_service_requests(requests)
+    return {"ok": True, "request": request_record, "summary": run["summary"]}
 
-    return {
-        "ok": True,
-        "request": request_record,
-        "summary": {"success": success_count, "failed": total_processed - success_count, "total": total_processed},
-    }
 
+def expand_bulk_items(body: dict[str, Any], shared_fields: set[str]) -> list[Any] | str:
+    defaults = {key: body[key] for key in shared_fields if key in body}
+    if isinstance(body.get("items"), list):
+        raw_items = body["items"]
+        items = [{**defaults, **item} if isinstance(item, dict) else item for item in raw_items]
+    elif isinstance(body.get("requestIds"), list):
+        items = [{**defaults, "requestId": request_id} for request_id in body["requestIds"]]
+    else:
+        return "items or requestIds must be an array"
+    if not items:
+        return "At least one request is required"
+    if len(items) > BULK_MAX_ITEMS:
+        return f"At most {BULK_MAX_ITEMS} requests per call"
+    return items
 
-def provider_api_request(
-    *,
-    method: str,
-    url: str,
-    headers: dict[str, str] | None = None,
-    payload: dict[str, Any] | None = None,
-    timeout: int = 20,
-) -> dict[str, Any]:
-    body = None
-    merged_headers = {"Content-Type": "application/json"}
-    if headers:
-        merged_headers.update(headers)
-    if payload is not None:
-        body = json.dumps(payload).encode("utf-8")
 
-    request = urlrequest.Request(url=url, method=method.upper(), headers=merged_headers, data=body)
-    try:
-        with urlrequest.urlopen(request, timeout=timeout) as response:  # noqa: S310 - deliberate trusted API call
-            raw = response.read().decode("utf-8", errors="replace")
-            status = int(response.status)
-            parsed: Any
-            try:
-                parsed = json.loads(raw) if raw else {}
-            except json.JSONDecodeError:
-                parsed = {"raw": raw}
-            return {"ok": 200 <= status < 300, "status": status, "data": parsed}
-    except urlerror.HTTPError as exc:
-        raw_error = exc.read().decode("utf-8", errors="replace")
-        try:
-            parsed_error = json.loads(raw_error) if raw_error else {}
-        except json.JSONDecodeError:
-            parsed_error = {"raw": raw_error}
-        return {"ok": False, "status": int(exc.code), "error": parsed_error}
-    except Exception as exc:  # noqa: BLE001
-        return {"ok": False, "status": 0, "error": str(exc)}
+def bulk_update_service_request_status(items: list[Any]) -> dict[str, Any]:
+    results: list[dict[str, Any]] = []
+    events: list[dict[str, Any]] = []
+    updated = 0
+    with store_lock:
+        requests = list_service_requests()
+        by_id = {str(record.get("requestId", "")): record for record in requests}
+        for item in items:
+            request_id = str(item.get("requestId", "")).strip() if isinstance(item, dict) else ""
+            error = validate_status_update_payload(item)
+            record = by_id.get(request_id)
+            if error is None and record is None:
+                error = "Request not found"
+            if error:
+                results.append({"requestId": request_id, "ok": False, "error": error})
+                continue
+            apply_status(
+                record,
+                status=str(item.get("status", "")).strip().lower(),
+                reason=str(item.get("reason", "bulk update")).strip() or "bulk update",
+                events=events,
+            )
+            results.append({"requestId": request_id, "ok": True, "status": record.get("status", "")})
+            updated += 1
+        if updated:
+            write_service_requests(requests)
+            publish_status_events(events)
+    return {"ok": True, "results": results, "summary": {"updated": updated, "failed": len(items) - updated, "total": len(items)}}
+
+
+def bulk_provision_service_requests(items: list[Any]) -> dict[str, Any]:
+    from concurrent.futures import ThreadPoolExecutor
+
+    results: list[dict[str, Any] | None] = [None] * len(items)
+    jobs: list[tuple[int, str, dict[str, Any]]] = []
+    seen: set[str] = set()
+    for index, item in enumerate(items):
+        request_id = str(item.get("requestId", "")).strip() if isinstance(item, dict) else ""
+        error = validate_provision_payload(item)
+        if error is None and request_id in seen:
+            error = "Duplicate requestId in batch"
+        if error:
+            results[index] = {"requestId": request_id, "ok": False, "error": error}
+            continue
+        seen.add(request_id)
+        options = {
+            "domainName": str(item.get("domainName", "")).strip(),
+            "region": str(item.get("region", "")).strip(),
+            "dbPassword": str(item.get("dbPassword", "")).strip(),
+            "retryFailed": bool(item.get("retryFailed", False)),
+        }
+        jobs.append((index, request_id, options))
 
+    # Worker threads don't inherit the thread-local request context; without it their
+    # provider calls are logged with no requestId and missing from upstreamCalls.
+    context = current_request_context()
 
-def provision_render_hosting(*, project_name: str, plan_id: str) -> dict[str, Any]:
+    def run(job: tuple[int, str, dict[str, Any]]) -> dict[str, Any]:
+        _request_context.value = context
+        try:
+            return run_provisioning(job[1], job[2])
+        except Exception as exc:  # noqa: BLE001
+            return {"ok": False, "error": f"Provisioning exception: {exc}"}
+        finally:
+            end_request_context()
+
+    runs: list[dict[str, Any]] = []
+    if jobs:
+        with ThreadPoolExecutor(max_workers=min(BULK_PROVISION_WORKERS, len(jobs)), thread_name_prefix="bulk-provision") as pool:
+            runs = list(pool.map(run, jobs))
+
+    merged: list[dict[str, Any]] = []
+    events: list[dict[str, Any]] = []
+    with store_lock:
+        requests = list_service_requests()
+        for (index, request_id, _), outcome in zip(jobs, runs):
+            if outcome.get("ok"):
+                outcome = merge_provisioning(requests, outcome, events)
+            if not outcome.get("ok"):
+                results[index] = {"requestId": request_id, "ok": False, "error": outcome.get("error", "Provisioning failed")}
+                continue
+            merged.append(outcome["request"])
+            results[index] = {
+                "requestId": request_id,
+                "ok": True,
+                "status": outcome["request"].get("status", ""),
+                "summary": outcome["summary"],
+            }
+        if merged:
+            write_service_requests(requests)
+            publish_status_events(events)
+            for record in merged:
+                publish_event("request.provisioning", request_event_payload(record))
+
+    request_reconcile()
+    succeeded = sum(1 for result in results if result and result.get("ok"))
+    return {"ok": True, "results": results, "summary": {"provisioned": succeeded, "failed": len(items) - succeeded, "total": len(items)}}
+
+
+def provisioning_status(item_count: int, entries: dict[int, dict[str, Any]]) -> str:
+    if len(entries) < item_count:
+        return "provisioning"
+    up = pending = 0
+    for idx in range(item_count):
+        entry = entries.get(idx, {})
+        result = entry.get("result", {}) if isinstance(entry, dict) else {}
+        if not (isinstance(result, dict) and result.get("ok")):
+            continue
+        resource = entry.get("resource")
+        state = resource.get("state") if isinstance(resource, dict) else "ready"
+        if state == "pending":
+            pending += 1
+        elif state != "failed":
+            up += 1
+    if up == item_count:
+        return "active"
+    if up + pending == item_count:
+        return "provisioning"
+    if up + pending == 0:
+        return "provision_failed"
+    return "partially_active"
+
+
+# Provisioning entries whose resource is still coming up carry a "resource" block
+# that the reconciler polls with a per-entry backoff until it settles.
+RESOURCE_STATUS_PROVIDERS = {"render", "supabase", "neon"}
+RECONCILED_REQUEST_STATUSES = {"provisioning", "partially_active", "active"}
+_reconcile_wakeup = threading.Event()
+
+
+def request_reconcile() -> None:
+    _reconcile_wakeup.set()
+
+
+def render_deploy_states(resource_ids: list[str]) -> dict[str, tuple[str, str]]:
+    token = env("RENDER_API_KEY")
+    states: dict[str, tuple[str, str]] = {}
+    for service_id in resource_ids:
+        response = provider_api_request(
+            method="GET",
+            idempotent=True,
+            url=f"{provider_api_base('render')}/v1/services/{service_id}/deploys?limit=1",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=10,
+        )
+        if not response.get("ok"):
+            continue
+        data = response.get("data")
+        first = data[0] if isinstance(data, list) and data and isinstance(data[0], dict) else {}
+        deploy = first.get("deploy", first) if isinstance(first.get("deploy", first), dict) else {}
+        detail = str(deploy.get("status", "")).strip().lower()
+        if detail == "live":
+            states[service_id] = ("ready", detail)
+        elif detail.endswith("failed") or detail in {"canceled", "deactivated"}:
+            states[service_id] = ("failed", detail)
+        elif detail:
+            states[service_id] = ("pending", detail)
+    return states
+
+
+def supabase_project_states(resource_ids: list[str]) -> dict[str, tuple[str, str]]:
+    token = env("SUPABASE_ACCESS_TOKEN")
+    response = provider_api_request(
+        method="GET",
+        idempotent=True,
+        url=f"{provider_api_base('supabase')}/v1/projects",
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=10,
+    )
+    data = response.get("data")
+    if not response.get("ok") or not isinstance(data, list):
+        return {}
+    wanted = set(resource_ids)
+    states: dict[str, tuple[str, str]] = {}
+    for project in data:
+        if not isinstance(project, dict):
+            continue
+        ref = str(project.get("id", project.get("ref", "")))
+        if ref not in wanted:
+            continue
+        detail = str(project.get("status", "")).strip().upper()
+        if detail == "ACTIVE_HEALTHY":
+            states[ref] = ("ready", detail)
+        elif detail in {"INIT_FAILED", "REMOVED", "INACTIVE"}:
+            states[ref] = ("failed", detail)
+        elif detail:
+            states[ref] = ("pending", detail)
+    return states
+
+
+def neon_project_states(resource_ids: list[str]) -> dict[str, tuple[str, str]]:
+    token = env("NEON_API_KEY")
+    states: dict[str, tuple[str, str]] = {}
+    for project_id in resource_ids:
+        response = provider_api_request(
+            method="GET",
+            idempotent=True,
+            url=f"{provider_api_base('neon')}/api/v2/projects/{project_id}/operations?limit=10",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=10,
+        )
+        data = response.get("data")
+        if not response.get("ok") or not isinstance(data, dict):
+            continue
+        operations = [item for item in data.get("operations", []) if isinstance(item, dict)]
+        statuses = {str(item.get("status", "")).strip().lower() for item in operations}
+        if statuses & {"failed", "error"}:
+            states[project_id] = ("failed", "operation failed")
+        elif statuses <= {"finished", "skipped", "cancelled"}:
+            states[project_id] = ("ready", "finished")
+        else:
+            states[project_id] = ("pending", ", ".join(sorted(statuses)))
+    return states
+
+
+RESOURCE_STATE_CHECKS = {
+    "render": render_deploy_states,
+    "supabase": supabase_project_states,
+    "neon": neon_project_states,
+}
+
+
+def due_resource_checks(now: datetime) -> tuple[dict[str, list[tuple[str, int, str]]], datetime | None]:
+    due: dict[str, list[tuple[str, int, str]]] = {}
+    next_due: datetime | None = None
+    with store_lock:
+        for record in list_service_requests():
+            if str(record.get("status", "")) not in RECONCILED_REQUEST_STATUSES:
+                continue
+            for entry in record.get("provisioning", []) or []:
+                resource = entry.get("resource") if isinstance(entry, dict) else None
+                if not isinstance(resource, dict) or resource.get("state") != "pending":
+                    continue
+                when = parse_iso_datetime(str(resource.get("nextCheckAt") or "")) or now
+                if when > now:
+                    next_due = when if next_due is None else min(next_due, when)
+                    continue
+                provider = str(entry.get("result", {}).get("provider", ""))
+                batch = due.setdefault(provider, [])
+                if len(batch) >= RECONCILE_BATCH_SIZE:
+                    next_due = now
+                else:
+                    batch.append((str(record.get("requestId", "")), int(entry.get("itemIndex", -1)), str(entry["result"].get("resourceId", ""))))
+    return due, next_due
+
+
+def reconcile_resources() -> datetime | None:
+    now = now_utc()
+    due, next_due = due_resource_checks(now)
+    if not due:
+        return next_due
+
+    observed: dict[tuple[str, str], tuple[str, str]] = {}
+    for provider, checks in due.items():
+        check = RESOURCE_STATE_CHECKS.get(provider)
+        if check is None:
+            continue
+        try:
+            states = check(sorted({resource_id for _, _, resource_id in checks}))
+        except Exception as exc:  # noqa: BLE001
+            write_log_record({"type": "message", "ts": now_utc().isoformat(timespec="milliseconds"), "message": f"reconcile {provider} failed: {exc}"})
+            states = {}
+        for resource_id, state in states.items():
+            observed[(provider, resource_id)] = state
+
+    with store_lock:
+        requests = list_service_requests()
+        changed: dict[str, dict[str, Any]] = {}
+        events: list[dict[str, Any]] = []
+        for provider, checks in due.items():
+            for request_id, item_index, resource_id in checks:
+                record = find_service_request(requests, request_id)
+                entries = record.get("provisioning", []) if record else []
+                entry = next((item for item in entries if isinstance(item, dict) and item.get("itemIndex") == item_index), None)
+                resource = entry.get("resource") if entry else None
+                if not isinstance(resource, dict) or str(entry["result"].get("resourceId", "")) != resource_id:
+                    continue
+                state, detail = observed.get((provider, resource_id), ("pending", str(resource.get("detail", ""))))
+                started = parse_iso_datetime(str(entry.get("timestamp") or "")) or now
+                if state == "pending" and now - started > timedelta(hours=RECONCILE_GIVE_UP_HOURS):
+                    state, detail = "failed", f"not ready after {RECONCILE_GIVE_UP_HOURS}h ({detail})"
+                interval = int(resource.get("intervalSeconds", RECONCILE_MIN_SECONDS))
+                if detail != resource.get("detail"):
+                    interval = RECONCILE_MIN_SECONDS
+                else:
+                    interval = min(interval * 2, RECONCILE_MAX_SECONDS)
+                resource.update(
+                    {
+                        "state": state,
+                        "detail": detail,
+                        "checks": int(resource.get("checks", 0)) + 1,
+                        "checkedAt": now.isoformat(),
+                        "intervalSeconds": interval,
+                        "nextCheckAt": (now + timedelta(seconds=interval * random.uniform(0.9, 1.1))).isoformat() if state == "pending" else "",
+                    }
+                )
+                changed[request_id] = record
+                merged = {item["itemIndex"]: item for item in entries if isinstance(item, dict) and isinstance(item.get("itemIndex"), int)}
+                items = record.get("items", [])
+                next_status = provisioning_status(len(items) if isinstance(items, list) else 0, merged)
+                if next_status != record.get("status"):
+                    apply_status(record, status=next_status, reason=f"reconciled {provider} resource {detail}".strip(), events=events)
+        if changed:
+            write_service_requests(requests)
+            publish_status_events(events)
+            for record in changed.values():
+                publish_event("request.provisioning", request_event_payload(record))
+    return due_resource_checks(now_utc())[1]
+
+
+def reconcile_loop() -> None:
+    while True:
+        try:
+            next_due = reconcile_resources()
+        except Exception as exc:  # noqa: BLE001
+            write_log_record({"type": "message", "ts": now_utc().isoformat(timespec="milliseconds"), "message": f"reconcile loop error: {exc}"})
+            next_due = None
+        wait = float(RECONCILE_MAX_SECONDS)
+        if next_due is not None:
+            wait = (next_due - now_utc()).total_seconds()
+        _reconcile_wakeup.wait(timeout=min(max(wait, 1.0), 60.0))
+        _reconcile_wakeup.clear()
+
+
+_breaker_lock = threading.Lock()
+_provider_breakers: dict[str, dict[str, Any]] = {}
+
+
+def breaker_for(host: str) -> dict[str, Any]:
+    breaker = _provider_breakers.get(host)
+    if breaker is None:
+        breaker = {"state": "closed", "failures": 0, "trips": 0, "openedAt": 0.0, "trialInFlight": False}
+        _provider_breakers[host] = breaker
+    return breaker
+
+
+def breaker_allow(host: str) -> bool:
+    with _breaker_lock:
+        breaker = breaker_for(host)
+        if breaker["state"] == "closed":
+            return True
+        if breaker["state"] == "open" and time.monotonic() - breaker["openedAt"] >= PROVIDER_BREAKER_COOLDOWN_SECONDS:
+            breaker["state"] = "half_open"
+        if breaker["state"] == "half_open" and not breaker["trialInFlight"]:
+            breaker["trialInFlight"] = True
+            return True
+        return False
+
+
+def breaker_record(host: str, healthy: bool) -> None:
+    with _breaker_lock:
+        breaker = breaker_for(host)
+        breaker["trialInFlight"] = False
+        if healthy:
+            breaker["state"] = "closed"
+            breaker["failures"] = 0
+            return
+        breaker["failures"] += 1
+        if breaker["state"] == "half_open" or breaker["failures"] >= PROVIDER_BREAKER_FAILURES:
+            if breaker["state"] != "open":
+                breaker["trips"] += 1
+            breaker["state"] = "open"
+            breaker["openedAt"] = time.monotonic()
+
+
+def breaker_snapshot(host: str) -> dict[str, Any]:
+    with _breaker_lock:
+        breaker = dict(_provider_breakers.get(host) or breaker_for(host))
+    snapshot = {"state": breaker["state"], "consecutiveFailures": breaker["failures"], "trips": breaker["trips"]}
+    if breaker["state"] == "open":
+        remaining = PROVIDER_BREAKER_COOLDOWN_SECONDS - (time.monotonic() - breaker["openedAt"])
+        snapshot["retryInSeconds"] = round(max(0.0, remaining), 1)
+    return snapshot
+
+
+def upstream_failed(status: int) -> bool:
+    return status == 0 or status == 429 or status >= 500
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    cleaned = str(value or "").strip()
+    if not cleaned:
+        return None
+    if cleaned.isdigit():
+        return float(cleaned)
+    try:
+        when = parsedate_to_datetime(cleaned)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - now_utc()).total_seconds())
+
+
+def provider_api_request(
+    *,
+    method: str,
+    url: str,
+    headers: dict[str, str] | None = None,
+    payload: dict[str, Any] | None = None,
+    timeout: int = 20,
+    idempotent: bool = False,
+) -> dict[str, Any]:
+    # Callers opt in to blind retries; the verb says nothing about side effects (Dynadot's
+    # register is a GET).
+    host = urlparse(url).netloc
+    attempt = 0
+    while True:
+        attempt += 1
+        if not breaker_allow(host):
+            log_provider_call(method=method, url=url, status=0, started=time.perf_counter())
+            return {"ok": False, "status": 0, "error": f"Circuit open for {host}; provider is failing, retry later.", "circuitOpen": True}
+        result = send_provider_request(method=method, url=url, headers=headers, payload=payload, timeout=timeout)
+        status = int(result.get("status", 0))
+        # The raw header only steers the retry below; it must not leak into stored results.
+        retry_after = result.pop("retryAfter", None)
+        breaker_record(host, not upstream_failed(status))
+        # Non-idempotent calls are only retried when the upstream says it did not process them.
+        retryable = upstream_failed(status) if idempotent else status in {429, 503}
+        if not retryable or attempt >= PROVIDER_RETRY_ATTEMPTS:
+            return result
+        delay = retry_after_seconds(retry_after)
+        if delay is None:
+            delay = random.uniform(0, PROVIDER_RETRY_BASE_SECONDS * (2 ** (attempt - 1)))
+        if delay > PROVIDER_RETRY_MAX_SECONDS:
+            return result
+        time.sleep(delay)
+
+
+def send_provider_request(
+    *,
+    method: str,
+    url: str,
+    headers: dict[str, str] | None,
+    payload: dict[str, Any] | None,
+    timeout: int,
+) -> dict[str, Any]:
+    from urllib import error as urlerror
+    from urllib import request as urlrequest
+
+    body = None
+    merged_headers = {"Content-Type": "application/json"}
+    if headers:
+        merged_headers.update(headers)
+    if payload is not None:
+        body = json.dumps(payload).encode("utf-8")
+
+    request = urlrequest.Request(url=url, method=method.upper(), headers=merged_headers, data=body)
+    started = time.perf_counter()
+    result: dict[str, Any]
+    try:
+        with urlrequest.urlopen(request, timeout=timeout) as response:  # noqa: S310 - deliberate trusted API call
+            raw = response.read().decode("utf-8", errors="replace")
+            status = int(response.status)
+            parsed: Any
+            try:
+                parsed = json.loads(raw) if raw else {}
+            except json.JSONDecodeError:
+                parsed = {"raw": raw}
+            result = {"ok": 200 <= status < 300, "status": status, "data": parsed}
+    except urlerror.HTTPError as exc:
+        raw_error = exc.read().decode("utf-8", errors="replace")
+        try:
+            parsed_error = json.loads(raw_error) if raw_error else {}
+        except json.JSONDecodeError:
+            parsed_error = {"raw": raw_error}
+        result = {"ok": False, "status": int(exc.code), "error": parsed_error}
+        if exc.headers and exc.headers.get("Retry-After"):
+            result["retryAfter"] = exc.headers.get("Retry-After")
+    except Exception as exc:  # noqa: BLE001
+        result = {"ok": False, "status": 0, "error": str(exc)}
+    log_provider_call(method=method, url=url, status=int(result.get("status", 0)), started=started)
+    return result
+
+
+def provision_render_hosting(*, project_name: str, plan_id: str) -> dict[str, Any]:
     token = env("RENDER_API_KEY")
     repo = env("RENDER_SERVICE_REPO")
     branch = env("RENDER_SERVICE_BRANCH", "main")
@@ -1978,7 +4282,7 @@ def provision_render_hosting(*, project_name: str, plan_id: str) -> dict[str, An
     }
     response = provider_api_request(
         method="POST",
-        url="https://api.render.com/v1/services",
+        url=f"{provider_api_base('render')}/v1/services",
         headers={"Authorization": f"Bearer {token}"},
         payload=payload,
     )
@@ -1992,7 +4296,8 @@ def resolve_render_owner_id(token: str) -> str:
 
     response = provider_api_request(
         method="GET",
-        url="https://api.render.com/v1/owners",
+        idempotent=True,
+        url=f"{provider_api_base('render')}/v1/owners",
         headers={"Authorization": f"Bearer {token}"},
     )
     if not response.get("ok"):
@@ -2058,17 +4363,6 @@ def dynadot_get_response(data: Any, root_key: str) -> dict[str, Any]:
     return {}
 
 
-def dynadot_first_result(value: Any) -> dict[str, Any]:
-    if isinstance(value, dict):
-        if "SearchResult" in value:
-            return dynadot_first_result(value.get("SearchResult"))
-        return value
-    if isinstance(value, list) and value:
-        first = value[0]
-        return first if isinstance(first, dict) else {}
-    return {}
-
-
 def dynadot_status_ok(payload: dict[str, Any]) -> bool:
     code = str(payload.get("ResponseCode", ""))
     status = str(payload.get("Status", "")).strip().lower()
@@ -2080,36 +4374,127 @@ def dynadot_error(payload: dict[str, Any], fallback: str) -> str:
     return message or fallback
 
 
-def dynadot_search_domain(*, api_key: str, domain_name: str) -> dict[str, Any]:
-    params = {
-        "key": api_key,
-        "command": "search",
-        "domain0": domain_name,
-        "show_price": "1",
-        "currency": "USD",
-    }
-    response = provider_api_request(
-        method="GET",
-        url=f"https://api.dynadot.com/api3.json?{urlencode(params)}",
-    )
-    if not response.get("ok"):
-        return {"ok": False, "error": response.get("error", "Dynadot search failed"), "status": response.get("status", 0)}
+_domain_search_lock = threading.Lock()
+_domain_search_cache: dict[str, tuple[float, dict[str, Any]]] = {}
 
-    payload = dynadot_get_response(response.get("data"), "SearchResponse")
-    if not dynadot_status_ok(payload):
-        return {"ok": False, "error": dynadot_error(payload, "Dynadot search rejected"), "status": response.get("status", 0)}
 
-    first = dynadot_first_result(payload.get("SearchResults", {}))
+def dynadot_search_results(value: Any) -> list[dict[str, Any]]:
+    if isinstance(value, dict):
+        if "SearchResult" in value:
+            return dynadot_search_results(value.get("SearchResult"))
+        return [value]
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, dict)]
+    return []
+
+
+def dynadot_search_domains(*, api_key: str, domain_names: list[str]) -> dict[str, Any]:
+    results: dict[str, dict[str, Any]] = {}
+    pending: list[str] = []
+    now = time.monotonic()
+    with _domain_search_lock:
+        for name in dict.fromkeys(domain_names):
+            cached = _domain_search_cache.get(name)
+            if cached is not None and cached[0] > now:
+                results[name] = cached[1]
+            else:
+                pending.append(name)
+    cached_count = len(results)
+
+    batches = 0
+    for start in range(0, len(pending), DOMAIN_SEARCH_BATCH_SIZE):
+        batch = pending[start : start + DOMAIN_SEARCH_BATCH_SIZE]
+        params = {"key": api_key, "command": "search", "show_price": "1", "currency": "USD"}
+        params.update({f"domain{index}": name for index, name in enumerate(batch)})
+        response = provider_api_request(
+            method="GET",
+            idempotent=True,
+            url=f"{provider_api_base('dynadot')}/api3.json?{urlencode(params)}",
+        )
+        batches += 1
+        if not response.get("ok"):
+            return {"ok": False, "error": response.get("error", "Dynadot search failed"), "status": response.get("status", 0)}
+
+        payload = dynadot_get_response(response.get("data"), "SearchResponse")
+        if not dynadot_status_ok(payload):
+            return {"ok": False, "error": dynadot_error(payload, "Dynadot search rejected"), "status": response.get("status", 0)}
+
+        expires_at = time.monotonic() + DOMAIN_SEARCH_CACHE_SECONDS
+        for entry in dynadot_search_results(payload.get("SearchResults", {})):
+            domain = str(entry.get("DomainName", "")).strip().lower()
+            if domain not in batch:
+                continue
+            result = {
+                "domain": domain,
+                "available": str(entry.get("Available", "")).strip().lower() in {"yes", "true", "1"},
+                "price": str(entry.get("Price", "")).strip(),
+            }
+            results[domain] = result
+            if DOMAIN_SEARCH_CACHE_SECONDS:
+                with _domain_search_lock:
+                    _domain_search_cache[domain] = (expires_at, result)
+
+    with _domain_search_lock:
+        if len(_domain_search_cache) > 5000:
+            for key in [key for key, value in _domain_search_cache.items() if value[0] <= time.monotonic()]:
+                del _domain_search_cache[key]
+    return {"ok": True, "results": results, "cached": cached_count, "batches": batches}
+
+
+def dynadot_search_domain(*, api_key: str, domain_name: str) -> dict[str, Any]:
+    search = dynadot_search_domains(api_key=api_key, domain_names=[domain_name])
+    if not search.get("ok"):
+        return search
+    first = search["results"].get(domain_name)
     if not first:
-        return {"ok": False, "error": "Dynadot returned no search result", "status": response.get("status", 0)}
+        return {"ok": False, "error": "Dynadot returned no search result", "status": 0}
+    return {"ok": True, "status": 200, **first}
+
+
+def domain_candidates(project_name: str, tlds: list[str]) -> list[str]:
+    words = re.findall(r"[a-z0-9]+", project_name.lower())
+    if not words:
+        return []
+    base = "".join(words)[:50]
+    stems = [base]
+    if len(words) > 1:
+        stems.append("-".join(words)[:50])
+    stems.extend([f"get{base}", f"{base}app", f"try{base}", f"{base}hq"])
+    return [f"{stem}.{tld}" for stem in dict.fromkeys(stems) for tld in tlds]
+
 
-    available_text = str(first.get("Available", "")).strip().lower()
+def suggest_domains(*, project_name: str, tlds: list[str] | None = None, limit: int = 10) -> dict[str, Any]:
+    api_key = env("DYNADOT_API_KEY")
+    if not api_key:
+        return {"ok": False, "error": "Dynadot not configured. Required: DYNADOT_API_KEY"}
+
+    chosen_tlds = [tld for tld in (tlds or DOMAIN_SUGGESTION_TLDS) if re.match(r"^[a-z0-9-]{2,24}$", tld)][:12]
+    candidates = domain_candidates(project_name, chosen_tlds)
+    if not candidates:
+        return {"ok": False, "error": "Project name must contain letters or numbers"}
+
+    search = dynadot_search_domains(api_key=api_key, domain_names=candidates)
+    if not search.get("ok"):
+        return {"ok": False, "error": search.get("error", "Dynadot search failed"), "status": search.get("status", 0)}
+
+    def price_value(result: dict[str, Any]) -> float:
+        try:
+            return float(str(result.get("price", "")).replace("$", "").split()[0])
+        except (ValueError, IndexError):
+            return float("inf")
+
+    # Candidates are generated best-first (exact name before variants, preferred TLDs first).
+    order = {name: index for index, name in enumerate(candidates)}
+    available = [result for name, result in search["results"].items() if result.get("available") and name in order]
+    available.sort(key=lambda result: (order[result["domain"]], price_value(result)))
     return {
         "ok": True,
-        "status": response.get("status", 0),
-        "domain": str(first.get("DomainName", domain_name)).strip().lower() or domain_name,
-        "available": available_text in {"yes", "true", "1"},
-        "price": str(first.get("Price", "")).strip(),
+        "projectName": project_name,
+        "suggestions": available[: max(1, limit)],
+        "checked": len(candidates),
+        "available": len(available),
+        "cached": search["cached"],
+        "batches": search["batches"],
     }
 
 
@@ -2122,7 +4507,9 @@ def dynadot_register_domain(*, api_key: str, domain_name: str, years: int = 1) -
     }
     response = provider_api_request(
         method="GET",
-        url=f"https://api.dynadot.com/api3.json?{urlencode(params)}",
+        url=f"{provider_api_base('dynadot')}/api3.json?{urlencode(params)}",
+        # A paid registration may already have gone through when the call times out or 5xxs.
+        idempotent=False,
     )
     if not response.get("ok"):
         return {"ok": False, "error": response.get("error", "Dynadot register failed"), "status": response.get("status", 0)}
@@ -2161,12 +4548,17 @@ def provision_dynadot_domain(*, domain_name: str, plan_id: str) -> dict[str, Any
         }
 
     if not bool(search.get("available", False)):
+        alternatives = suggest_domains(project_name=parsed_domain[0], limit=5)
         return {
             "ok": False,
             "provider": "dynadot",
             "status": int(search.get("status", 0)),
             "error": "Domain is not available for registration.",
-            "data": {"domain": search.get("domain", normalized_domain), "available": False},
+            "data": {
+                "domain": search.get("domain", normalized_domain),
+                "available": False,
+                "suggestions": [item["domain"] for item in alternatives.get("suggestions", [])],
+            },
         }
 
     if not auto_register:
@@ -2226,7 +4618,7 @@ def provision_supabase_project(*, project_name: str, plan_id: str, region: str,
     }
     response = provider_api_request(
         method="POST",
-        url="https://api.supabase.com/v1/projects",
+        url=f"{provider_api_base('supabase')}/v1/projects",
         headers={"Authorization": f"Bearer {token}"},
         payload=payload,
     )
@@ -2251,7 +4643,7 @@ def provision_neon_project(*, project_name: str, region: str) -> dict[str, Any]:
 
     response = provider_api_request(
         method="POST",
-        url="https://console.neon.tech/api/v2/projects",
+        url=f"{provider_api_base('neon')}/api/v2/projects",
         headers={"Authorization": f"Bearer {token}"},
         payload=payload,
     )
@@ -2259,18 +4651,113 @@ def provision_neon_project(*, project_name: str, region: str) -> dict[str, Any]:
 
 
 def normalize_provider_response(response: dict[str, Any], provider: str) -> dict[str, Any]:
+    # Entries keep only the extracted fields; the upstream body goes to the blob store.
     if response.get("ok"):
         data = response.get("data", {})
-        identifier = extract_resource_id(provider, data)
-        return {"ok": True, "provider": provider, "status": response.get("status"), "resourceId": identifier, "data": data}
+        compact = {
+            "ok": True,
+            "provider": provider,
+            "status": response.get("status"),
+            "resourceId": extract_resource_id(provider, data),
+        }
+        compact.update(extract_resource_summary(provider, data))
+        compact["rawRef"] = store_blob(data)
+        return compact
 
     error_payload = response.get("error", response.get("data", {}))
-    return {
+    compact = {
         "ok": False,
         "provider": provider,
         "status": response.get("status", 0),
-        "error": error_payload,
+        "error": summarize_provider_error(error_payload),
     }
+    if isinstance(error_payload, (dict, list)) and error_payload:
+        compact["rawRef"] = store_blob(error_payload)
+    return compact
+
+
+def extract_resource_summary(provider: str, payload: Any) -> dict[str, str]:
+    if not isinstance(payload, dict):
+        return {}
+    summary: dict[str, str] = {}
+    if provider == "render":
+        details = payload.get("serviceDetails", {})
+        if isinstance(details, dict) and details.get("url"):
+            summary["url"] = str(details["url"])
+        if payload.get("dashboardUrl"):
+            summary["dashboardUrl"] = str(payload["dashboardUrl"])
+    elif provider == "supabase":
+        ref = str(payload.get("ref", payload.get("id", "")))
+        if ref:
+            summary["url"] = f"https://{ref}.supabase.co"
+        if payload.get("status"):
+            summary["providerStatus"] = str(payload["status"])
+    elif provider == "neon":
+        endpoints = payload.get("endpoints", [])
+        if isinstance(endpoints, list) and endpoints and isinstance(endpoints[0], dict) and endpoints[0].get("host"):
+            summary["url"] = str(endpoints[0]["host"])
+    return summary
+
+
+def summarize_provider_error(error: Any) -> str:
+    if isinstance(error, dict):
+        for key in ("message", "error", "detail", "msg"):
+            value = error.get(key)
+            if isinstance(value, str) and value.strip():
+                return value.strip()[:300]
+    if isinstance(error, str):
+        return error[:300]
+    return json.dumps(error)[:300]
+
+
+def blob_path(digest: str) -> Path:
+    return BLOBS_DIR / digest[:2] / f"{digest[2:]}.json.gz"
+
+
+def store_blob(payload: Any) -> str:
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha256(raw).hexdigest()
+    path = blob_path(digest)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(gzip.compress(raw))
+        os.replace(temp_path, path)
+    return digest
+
+
+def read_blob(digest: str) -> Any:
+    if not re.match(r"^[0-9a-f]{64}$", digest):
+        return None
+    try:
+        return json.loads(gzip.decompress(blob_path(digest).read_bytes()))
+    except (OSError, ValueError):
+        return None
+
+
+def compact_stored_provisioning() -> int:
+    compacted = 0
+    with store_lock:
+        requests = list_service_requests()
+        for record in requests:
+            for entry in record.get("provisioning", []) or []:
+                result = entry.get("result") if isinstance(entry, dict) else None
+                provider = str(result.get("provider", "")) if isinstance(result, dict) else ""
+                if provider not in RESOURCE_STATUS_PROVIDERS or "rawRef" in result:
+                    continue
+                if "data" not in result and isinstance(result.get("error"), str):
+                    continue
+                if result.get("ok"):
+                    response = {"ok": True, "status": result.get("status"), "data": result.get("data", {})}
+                else:
+                    response = {"ok": False, "status": result.get("status", 0), "error": result.get("error", "")}
+                entry["result"] = normalize_provider_response(response, provider)
+                if result.get("resourceId"):
+                    entry["result"]["resourceId"] = result["resourceId"]
+                compacted += 1
+        if compacted:
+            write_service_requests(requests)
+    return compacted
 
 
 def extract_resource_id(provider: str, payload: Any) -> str:
@@ -2799,19 +5286,1893 @@ def escape_html(raw: str) -> str:
     )
 
 
-def main() -> None:
-    server = ThreadingHTTPServer((HOST, PORT), AppHandler)
+_request_context = threading.local()
+_upstream_calls_lock = threading.Lock()
+_log_queue: queue.Queue[str | None] = queue.Queue(maxsize=ACCESS_LOG_QUEUE_SIZE)
+_log_writer_lock = threading.Lock()
+_log_writer_thread: threading.Thread | None = None
+_log_stats = {"dropped": 0}
+
+
+def begin_request_context() -> dict[str, Any]:
+    context: dict[str, Any] = {
+        "requestId": "",
+        "route": "",
+        "method": "",
+        "startedAt": time.perf_counter(),
+        "status": 0,
+        "bytes": 0,
+        "upstreamCalls": 0,
+    }
+    _request_context.value = context
+    return context
+
+
+def end_request_context() -> None:
+    _request_context.value = None
+
+
+def current_request_context() -> dict[str, Any] | None:
+    return getattr(_request_context, "value", None)
+
+
+def normalize_request_id(raw: str) -> str:
+    cleaned = str(raw or "").strip()
+    if cleaned and re.match(r"^[A-Za-z0-9._:-]{1,128}$", cleaned):
+        return cleaned
+    return secrets.token_hex(8)
+
+
+def note_request_auth(auth: dict[str, Any]) -> dict[str, Any]:
+    context = current_request_context()
+    if context is not None and auth.get("ok"):
+        context["userId"] = str(auth.get("userId", ""))
+        context["username"] = str(auth.get("username", ""))
+        context["role"] = str(auth.get("role", ""))
+    return auth
+
+
+def log_provider_call(*, method: str, url: str, status: int, started: float) -> None:
+    context = current_request_context()
+    if context is not None:
+        # Bulk provisioning workers share their request's context.
+        with _upstream_calls_lock:
+            context["upstreamCalls"] = int(context.get("upstreamCalls", 0)) + 1
+    parsed = urlparse(url)
+    write_log_record(
+        {
+            "type": "provider_call",
+            "ts": now_utc().isoformat(timespec="milliseconds"),
+            "requestId": context.get("requestId", "") if context else "",
+            "method": method.upper(),
+            "host": parsed.netloc,
+            "path": parsed.path,
+            "status": status,
+            "durationMs": round((time.perf_counter() - started) * 1000, 2),
+        }
+    )
+
+
+def write_log_record(record: dict[str, Any]) -> None:
+    ensure_log_writer()
+    try:
+        _log_queue.put_nowait(json.dumps(record, separators=(",", ":"), default=str))
+    except queue.Full:
+        _log_stats["dropped"] += 1
+
+
+def ensure_log_writer() -> None:
+    global _log_writer_thread
+    if _log_writer_thread is not None:
+        return
+    with _log_writer_lock:
+        if _log_writer_thread is None:
+            _log_writer_thread = threading.Thread(target=log_writer_loop, name="access-log-writer", daemon=True)
+            _log_writer_thread.start()
+
+
+def rotate_log_file(path: Path) -> None:
+    for index in range(ACCESS_LOG_BACKUPS - 1, 0, -1):
+        source = path.with_name(f"{path.name}.{index}")
+        if source.exists():
+            source.replace(path.with_name(f"{path.name}.{index + 1}"))
+    if path.exists():
+        path.replace(path.with_name(f"{path.name}.1"))
+
+
+def log_writer_loop() -> None:
+    handle = None
+    written = 0
+    if ACCESS_LOG_FILE is not None:
+        try:
+            ACCESS_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+            handle = ACCESS_LOG_FILE.open("a", encoding="utf-8")
+            written = ACCESS_LOG_FILE.stat().st_size
+        except OSError as exc:
+            print(f"Access log file disabled: {exc}", file=sys.stderr, flush=True)
+            handle = None
+
+    stopping = False
+    while not stopping:
+        try:
+            first = _log_queue.get(timeout=ACCESS_LOG_FLUSH_SECONDS)
+        except queue.Empty:
+            continue
+        batch: list[str] = []
+        if first is None:
+            stopping = True
+        else:
+            batch.append(first)
+        while len(batch) < 512:
+            try:
+                line = _log_queue.get_nowait()
+            except queue.Empty:
+                break
+            if line is None:
+                stopping = True
+                break
+            batch.append(line)
+        if not batch:
+            continue
+
+        chunk = "\n".join(batch) + "\n"
+        if ACCESS_LOG_STDOUT:
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+        if handle is not None and ACCESS_LOG_FILE is not None:
+            try:
+                if written + len(chunk) > ACCESS_LOG_MAX_BYTES and written > 0:
+                    handle.close()
+                    rotate_log_file(ACCESS_LOG_FILE)
+                    handle = ACCESS_LOG_FILE.open("a", encoding="utf-8")
+                    written = 0
+                handle.write(chunk)
+                handle.flush()
+                written += len(chunk)
+            except OSError as exc:
+                print(f"Access log write failed: {exc}", file=sys.stderr, flush=True)
+
+    if handle is not None:
+        handle.close()
+
+
+def flush_log_writer(timeout: float = 2.0) -> None:
+    thread = _log_writer_thread
+    if thread is None:
+        return
+    try:
+        _log_queue.put(None, timeout=timeout)
+    except queue.Full:
+        return
+    thread.join(timeout)
+
+
+def static_content_type(path: str) -> str:
+    # Same lookup as SimpleHTTPRequestHandler.guess_type, usable outside a request.
+    suffix = os.path.splitext(path)[1]
+    for candidate in (suffix, suffix.lower()):
+        if candidate in AppHandler.extensions_map:
+            return AppHandler.extensions_map[candidate]
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+_static_files: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_static_files_lock = threading.Lock()
+
+
+def _close_static_entry(entry: dict[str, Any]) -> None:
+    # Caller holds _static_files_lock; an fd still being sent from is closed on release instead.
+    entry["evicted"] = True
+    if entry["refs"] == 0 and entry["fd"] is not None:
+        os.close(entry["fd"])
+        entry["fd"] = None
+
+
+def acquire_static_file(path: Path) -> dict[str, Any] | None:
+    key = str(path)
+    now = time.monotonic()
+    with _static_files_lock:
+        entry = _static_files.get(key)
+        if entry is not None and now - entry["checkedAt"] < STATIC_STAT_INTERVAL_SECONDS:
+            _static_files.move_to_end(key)
+            entry["refs"] += 1
+            return entry
+    try:
+        info = os.stat(key)
+    except OSError:
+        info = None
+    if info is None or not stat.S_ISREG(info.st_mode):
+        with _static_files_lock:
+            if key in _static_files:
+                _close_static_entry(_static_files.pop(key))
+        return None
+    with _static_files_lock:
+        entry = _static_files.get(key)
+        if entry is not None and (entry["ino"], entry["mtimeNs"], entry["size"]) == (
+            info.st_ino,
+            info.st_mtime_ns,
+            info.st_size,
+        ):
+            entry["checkedAt"] = now
+            _static_files.move_to_end(key)
+            entry["refs"] += 1
+            return entry
+
+    fd = None
+    if STATIC_SENDFILE:
+        try:
+            fd = os.open(key, os.O_RDONLY)
+            info = os.fstat(fd)
+        except OSError:
+            if fd is not None:
+                os.close(fd)
+            return None
+    fresh = {
+        "path": key,
+        "fd": fd,
+        "ino": info.st_ino,
+        "mtimeNs": info.st_mtime_ns,
+        "mtime": info.st_mtime,
+        "size": info.st_size,
+        "lastModified": formatdate(int(info.st_mtime), usegmt=True),
+        "contentType": static_content_type(key),
+        "checkedAt": now,
+        "refs": 1,
+        "evicted": False,
+    }
+    with _static_files_lock:
+        if key in _static_files:
+            _close_static_entry(_static_files.pop(key))
+        _static_files[key] = fresh
+        while len(_static_files) > STATIC_FILE_CACHE_ENTRIES:
+            _close_static_entry(_static_files.popitem(last=False)[1])
+    return fresh
+
+
+def release_static_file(entry: dict[str, Any]) -> None:
+    with _static_files_lock:
+        entry["refs"] -= 1
+        if entry["evicted"]:
+            _close_static_entry(entry)
+
+
+def parse_byte_ranges(header: str, size: int) -> list[tuple[int, int]] | None:
+    # None means "ignore the header and send the whole file"; [] means nothing is satisfiable (416).
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec.strip():
+        return None
+    parts = spec.split(",")
+    if len(parts) > STATIC_MAX_RANGES:
+        return None
+    ranges: list[tuple[int, int]] = []
+    for part in parts:
+        match = re.fullmatch(r"\s*(\d*)\s*-\s*(\d*)\s*", part)
+        if match is None or not (match.group(1) or match.group(2)):
+            return None
+        first, last = match.group(1), match.group(2)
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            if last and int(last) < start:
+                return None
+        else:
+            start = max(0, size - int(last))
+            end = size - 1
+        if start > end or start >= size:
+            continue
+        ranges.append((start, end))
+    # Overlapping or adjacent ranges are merged so no byte is sent twice.
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+_asset_lookup: dict[str, Any] = {}
+_asset_lookup_lock = threading.Lock()
+
+
+def asset_url(digest: str, suffix: str) -> str:
+    return f"{ASSET_URL_PREFIX}{digest[:20]}{suffix}"
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_asset_manifest(*, hardlink: bool = False) -> dict[str, Any]:
+    previous = load_json_store(ASSET_MANIFEST_FILE)
+    previous_paths = previous.get("paths", {}) if isinstance(previous, dict) else {}
+    paths: dict[str, dict[str, Any]] = {}
+    blobs: dict[str, dict[str, Any]] = {}
+    for folder in ASSET_SOURCE_DIRS:
+        base = ROOT / folder
+        if not base.is_dir():
+            continue
+        for path in sorted(base.rglob("*")):
+            if path.suffix.lower() not in ASSET_DEDUP_SUFFIXES or path.name.startswith("."):
+                continue
+            try:
+                info = path.stat()
+            except OSError:
+                continue
+            if not stat.S_ISREG(info.st_mode) or info.st_size == 0:
+                continue
+            logical = "/" + path.relative_to(ROOT).as_posix()
+            known = previous_paths.get(logical)
+            # Unchanged files keep their hash, so re-indexing only reads what moved.
+            if isinstance(known, dict) and (known.get("size"), known.get("mtimeNs")) == (info.st_size, info.st_mtime_ns):
+                digest = str(known["sha256"])
+            else:
+                try:
+                    digest = hash_file(path)
+                except OSError:
+                    continue
+            paths[logical] = {"sha256": digest, "size": info.st_size, "mtimeNs": info.st_mtime_ns}
+            blob = blobs.setdefault(
+                digest,
+                {"size": info.st_size, "url": asset_url(digest, path.suffix.lower()), "canonical": logical, "paths": []},
+            )
+            blob["paths"].append(logical)
+
+    if hardlink:
+        for blob in blobs.values():
+            canonical = ROOT / blob["canonical"].lstrip("/")
+            for logical in blob["paths"][1:]:
+                target = ROOT / logical.lstrip("/")
+                try:
+                    if target.samefile(canonical):
+                        continue
+                    temp_path = target.with_name(f".{target.name}.{os.getpid()}.link")
+                    os.link(canonical, temp_path)
+                    os.replace(temp_path, target)
+                    info = target.stat()
+                except OSError:
+                    continue
+                paths[logical]["mtimeNs"] = info.st_mtime_ns
+
+    manifest = {
+        "generatedAt": now_utc().isoformat(timespec="seconds"),
+        "paths": paths,
+        "blobs": blobs,
+        "report": asset_savings_report(paths, blobs),
+    }
+    save_json_store(ASSET_MANIFEST_FILE, manifest, compact=True)
+    return manifest
+
+
+def asset_savings_report(paths: dict[str, dict[str, Any]], blobs: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    total_bytes = sum(int(entry["size"]) for entry in paths.values())
+    unique_bytes = sum(int(blob["size"]) for blob in blobs.values())
+    # Disk already shared through hard links shows up as fewer distinct inodes.
+    inodes: dict[tuple[int, int], int] = {}
+    for logical, entry in paths.items():
+        try:
+            info = (ROOT / logical.lstrip("/")).stat()
+        except OSError:
+            continue
+        inodes[(info.st_dev, info.st_ino)] = int(entry["size"])
+    folders: dict[str, dict[str, int]] = {}
+    for blob in blobs.values():
+        for position, logical in enumerate(blob["paths"]):
+            folder = next((name for name in ASSET_SOURCE_DIRS if logical.startswith(f"/{name}/")), "")
+            summary = folders.setdefault(folder, {"files": 0, "bytes": 0, "duplicateBytes": 0})
+            summary["files"] += 1
+            summary["bytes"] += int(blob["size"])
+            if position:
+                summary["duplicateBytes"] += int(blob["size"])
+    return {
+        "files": len(paths),
+        "uniqueBlobs": len(blobs),
+        "duplicatedBlobs": sum(1 for blob in blobs.values() if len(blob["paths"]) > 1),
+        "totalBytes": total_bytes,
+        "uniqueBytes": unique_bytes,
+        # A browser that loads every copy downloads each duplicated blob once instead of per path.
+        "transferSavedBytes": total_bytes - unique_bytes,
+        "diskBytes": sum(inodes.values()),
+        "diskSavedBytes": total_bytes - sum(inodes.values()),
+        "diskReclaimableBytes": sum(inodes.values()) - unique_bytes,
+        "byDirectory": folders,
+    }
+
+
+def refresh_asset_manifest() -> None:
+    started = time.perf_counter()
+    try:
+        manifest = build_asset_manifest()
+    except OSError:
+        return
+    report = manifest["report"]
+    write_log_record(
+        {
+            "type": "message",
+            "ts": now_utc().isoformat(timespec="milliseconds"),
+            "message": (
+                f"asset manifest: {report['files']} files, {report['uniqueBlobs']} unique, "
+                f"{report['transferSavedBytes']} duplicate bytes in {round(time.perf_counter() - started, 2)}s"
+            ),
+        }
+    )
+
+
+def asset_lookup() -> dict[str, Any] | None:
+    now = time.monotonic()
+    with _asset_lookup_lock:
+        if now - _asset_lookup.get("checkedAt", -1e9) < STATIC_STAT_INTERVAL_SECONDS:
+            return _asset_lookup.get("lookup")
+    manifest = load_json_store(ASSET_MANIFEST_FILE)
+    with _asset_lookup_lock:
+        if "lookup" not in _asset_lookup or manifest is not _asset_lookup.get("manifest"):
+            lookup = None
+            if isinstance(manifest, dict) and isinstance(manifest.get("blobs"), dict):
+                lookup = {
+                    "paths": manifest.get("paths", {}),
+                    "blobs": manifest["blobs"],
+                    "byUrl": {blob["url"]: blob for blob in manifest["blobs"].values()},
+                }
+            _asset_lookup.update({"manifest": manifest, "lookup": lookup})
+        _asset_lookup["checkedAt"] = now
+        return _asset_lookup["lookup"]
+
+
+def asset_blob_record(route: str) -> dict[str, Any] | None:
+    lookup = asset_lookup()
+    blob = lookup["byUrl"].get(route) if lookup else None
+    if blob is None:
+        return None
+    record = lookup["paths"].get(blob["canonical"])
+    return {"path": blob["canonical"], **record} if record else None
+
+
+def asset_redirect_url(route: str, entry: dict[str, Any]) -> str | None:
+    lookup = asset_lookup()
+    record = lookup["paths"].get(route) if lookup else None
+    if record is None:
+        return None
+    blob = lookup["blobs"].get(record["sha256"])
+    if blob is None or len(blob["paths"]) < 2:
+        return None
+    # Only redirect while the file on disk is still the one that was hashed.
+    if (int(entry["size"]), int(entry["mtimeNs"])) != (record["size"], record["mtimeNs"]):
+        return None
+    return str(blob["url"])
+
+
+JS_PUNCTUATORS = (
+    ">>>=", "...", "===", "!==", "**=", "<<=", ">>=", ">>>", "&&=", "||=", "??=",
+    "=>", "==", "!=", "<=", ">=", "&&", "||", "??", "?.", "++", "--",
+    "+=", "-=", "*=", "/=", "%=", "&=", "|=", "^=", "**", "<<", ">>",
+)
+# After these words a "/" starts a regular expression rather than a division.
+JS_REGEX_AFTER_WORDS = {
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw", "case", "do", "else", "yield", "await",
+}
+JS_LITERAL_KINDS = {"string", "template"}
+BUNDLE_SELECTOR_METHODS = {"querySelector", "querySelectorAll", "getElementById"}
+# String arguments of these calls look elements up rather than create markup.
+BUNDLE_LOOKUP_METHODS = BUNDLE_SELECTOR_METHODS | {"closest", "matches", "getAttribute", "hasAttribute", "removeAttribute"}
+
+
+def _js_word_char(char: str) -> bool:
+    return char.isalnum() or char in "_$" or ord(char) > 127
+
+
+def _scan_quoted(source: str, index: int, quote: str) -> int:
+    while index < len(source):
+        char = source[index]
+        if char == "\\":
+            index += 2
+            continue
+        index += 1
+        if char == quote or char == "\n":
+            break
+    return min(index, len(source))
+
+
+def _scan_template(source: str, index: int) -> tuple[int, bool]:
+    # Returns the end of this template chunk and whether it stopped at a "${" expression.
+    while index < len(source):
+        char = source[index]
+        if char == "\\":
+            index += 2
+        elif char == "`":
+            return index + 1, False
+        elif char == "$" and source.startswith("{", index + 1):
+            return index + 2, True
+        else:
+            index += 1
+    return len(source), False
+
+
+def _scan_regex(source: str, index: int) -> int:
+    in_class = False
+    while index < len(source):
+        char = source[index]
+        if char == "\\":
+            index += 2
+            continue
+        index += 1
+        if char == "\n":
+            break
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        elif char == "/" and not in_class:
+            break
+    while index < len(source) and _js_word_char(source[index]):
+        index += 1
+    return min(index, len(source))
+
+
+def _regex_allowed(previous: tuple[str, str]) -> bool:
+    kind, text = previous
+    if not kind:
+        return True
+    if kind == "punct":
+        return text not in {")", "]"}
+    return kind == "word" and text in JS_REGEX_AFTER_WORDS
+
+
+def js_tokens(source: str) -> list[tuple[str, str]]:
+    # Just enough of a lexer to keep strings, templates, regexes and comments intact.
+    tokens: list[tuple[str, str]] = []
+    braces: list[bool] = []
+    previous = ("", "")
+    index = 0
+    length = len(source)
+    while index < length:
+        char = source[index]
+        start = index
+        if char in " \t\r\n":
+            while index < length and source[index] in " \t\r\n":
+                index += 1
+            tokens.append(("space", source[start:index]))
+            continue
+        if source.startswith("//", index):
+            end = source.find("\n", index)
+            index = length if end < 0 else end
+            kind = "comment"
+        elif source.startswith("/*", index):
+            end = source.find("*/", index + 2)
+            index = length if end < 0 else end + 2
+            kind = "comment"
+        elif char in "'\"":
+            index = _scan_quoted(source, index + 1, char)
+            kind = "string"
+        elif char == "`" or (char == "}" and braces and braces[-1]):
+            if char == "}":
+                braces.pop()
+            index, expression = _scan_template(source, index + 1)
+            if expression:
+                braces.append(True)
+            kind = "template"
+        elif char == "/" and _regex_allowed(previous):
+            index = _scan_regex(source, index + 1)
+            kind = "regex"
+        elif char.isdigit() or (char == "." and source[index + 1 : index + 2].isdigit()):
+            index += 1
+            while index < length and (
+                _js_word_char(source[index])
+                or source[index] == "."
+                or (source[index] in "+-" and source[index - 1] in "eE" and not source[start : start + 2].lower() == "0x")
+            ):
+                index += 1
+            kind = "number"
+        elif _js_word_char(char):
+            while index < length and _js_word_char(source[index]):
+                index += 1
+            kind = "word"
+        else:
+            punctuator = next((item for item in JS_PUNCTUATORS if source.startswith(item, index)), char)
+            index += len(punctuator)
+            if punctuator == "{":
+                braces.append(False)
+            elif punctuator == "}" and braces:
+                braces.pop()
+            kind = "punct"
+        text = source[start:index]
+        tokens.append((kind, text))
+        if kind != "comment":
+            previous = (kind, text)
+    return tokens
+
+
+def _significant(tokens: list[tuple[str, str]]) -> list[tuple[int, str, str]]:
+    return [(position, kind, text) for position, (kind, text) in enumerate(tokens) if kind not in {"space", "comment"}]
+
+
+def _js_statement(tokens: list[tuple[str, str]]) -> dict[str, Any]:
+    words: list[str] = []
+    for _, kind, text in _significant(tokens)[:4]:
+        if kind != "word":
+            break
+        words.append(text)
+    statement: dict[str, Any] = {"tokens": tokens, "kind": "statement", "names": []}
+    if words[:1] == ["function"] or words[:2] == ["async", "function"]:
+        statement["kind"] = "function"
+        statement["names"] = words[1:2] if words[0] == "function" else words[2:3]
+    elif words[:1] == ["class"]:
+        statement["kind"] = "function"
+        statement["names"] = words[1:2]
+    elif words[:1] and words[0] in {"const", "let", "var"}:
+        statement["kind"] = "variable"
+        statement["names"] = words[1:2]
+    return statement
+
+
+def js_statements(tokens: list[tuple[str, str]]) -> list[dict[str, Any]]:
+    # Top-level statements end at a ";" or, for declarations, at the brace closing the body.
+    statements: list[dict[str, Any]] = []
+    current: list[tuple[str, str]] = []
+    depth = 0
+    for kind, text in tokens:
+        current.append((kind, text))
+        if kind != "punct":
+            continue
+        if text in {"(", "[", "{"}:
+            depth += 1
+        elif text in {")", "]", "}"}:
+            depth -= 1
+        if depth == 0 and (text == ";" or (text == "}" and _js_statement(current)["kind"] == "function")):
+            statements.append(_js_statement(current))
+            current = []
+    if current:
+        statements.append(_js_statement(current))
+    return statements
+
+
+def _js_selectors(tokens: list[tuple[str, str]]) -> list[str] | None:
+    # Selectors passed to document lookups before the function's first top-level return (its
+    # guard clause); None when one of them is not a plain string.
+    significant = _significant(tokens)
+    depth = 0
+    for index, (_, kind, text) in enumerate(significant):
+        if text == "{" and kind == "punct":
+            depth += 1
+        elif text == "}" and kind == "punct":
+            depth -= 1
+        elif kind == "word" and text == "return" and depth == 1:
+            significant = significant[:index]
+            break
+    selectors: list[str] = []
+    for index, (_, kind, text) in enumerate(significant[:-3]):
+        if kind != "word" or text != "document" or significant[index + 1][2] != ".":
+            continue
+        method = significant[index + 2][2]
+        if method not in BUNDLE_SELECTOR_METHODS or significant[index + 3][2] != "(":
+            continue
+        argument = significant[index + 4] if index + 4 < len(significant) else (0, "", "")
+        if argument[1] != "string":
+            return None
+        value = argument[2][1:-1]
+        selectors.append(f"#{value}" if method == "getElementById" else value)
+    return selectors
+
+
+def analyze_script(source: str) -> dict[str, Any]:
+    tokens = js_tokens(source)
+    if "".join(text for _, text in tokens) != source:
+        raise ValueError("script could not be tokenized losslessly")
+    statements = js_statements(tokens)
+    functions = {name: statement for statement in statements if statement["kind"] == "function" for name in statement["names"]}
+    name_pattern = re.compile(r"[A-Za-z_$][\w$]*")
+    markup: list[str] = []
+    for statement in statements:
+        significant = _significant(statement["tokens"])
+        refs: set[str] = set()
+        for index, (_, kind, text) in enumerate(significant):
+            if kind == "word" and (index == 0 or significant[index - 1][2] not in {".", "?."}):
+                refs.add(text)
+            elif kind in JS_LITERAL_KINDS:
+                # Handlers written into generated markup call functions by name from inside strings.
+                refs.update(word for word in name_pattern.findall(text) if word in functions)
+                lookup = index >= 2 and significant[index - 1][2] == "(" and significant[index - 2][2] in BUNDLE_LOOKUP_METHODS
+                if not lookup:
+                    markup.append(text)
+        statement["refs"] = refs - set(statement["names"])
+        statement["selectors"] = _js_selectors(statement["tokens"]) if statement["kind"] == "function" else None
+    # Attributes assigned through element.dataset never appear as literal data-* text.
+    for match in re.finditer(r"\.dataset\.([A-Za-z]\w*)\s*=(?!=)", source):
+        markup.append("data-" + re.sub(r"[A-Z]", lambda upper: "-" + upper.group(0).lower(), match.group(1)) + "=")
+    return {"statements": statements, "functions": functions, "markup": markup_index("\n".join(markup))}
+
+
+def markup_index(text: str) -> dict[str, set[str]]:
+    return {
+        "ids": set(re.findall(r"\bid\s*=\s*[\"']?([\w-]+)", text)),
+        "words": set(re.findall(r"[\w-]+", text)),
+    }
+
+
+def _selector_present(selector: str, indexes: tuple[dict[str, set[str]], ...]) -> bool:
+    # An element counts as present when the page or markup generated by the script could contain it.
+    for alternative in selector.split(","):
+        plain = re.sub(r"\[[^\]]*\]", " ", alternative)
+        checks = [("ids", name) for name in re.findall(r"#([\w-]+)", plain)]
+        checks += [("words", name) for name in re.findall(r"\.([\w-]+)", plain)]
+        checks += [("words", name) for name in re.findall(r"\[\s*([\w-]+)", alternative)]
+        if all(any(name in index[field] for index in indexes) for field, name in checks):
+            return True
+    return False
+
+
+def page_script_tokens(program: dict[str, Any], html: str) -> tuple[list[tuple[str, str]], list[str]]:
+    functions = program["functions"]
+    indexes = (markup_index(html), program["markup"])
+
+    def needed(name: str) -> bool:
+        selectors = functions[name]["selectors"]
+        return not selectors or any(_selector_present(selector, indexes) for selector in selectors)
+
+    # Entry statements (the init IIFE) lose calls to page initializers whose elements the page lacks.
+    dropped: set[str] = set()
+    roots: list[tuple[dict[str, Any], list[tuple[str, str]]]] = []
+    for statement in program["statements"]:
+        if statement["kind"] == "function":
+            continue
+        tokens = list(statement["tokens"])
+        if statement["kind"] == "statement":
+            significant = _significant(tokens)
+            removed: set[int] = set()
+            for index in range(len(significant) - 3):
+                name = significant[index][2]
+                shape = [item[2] for item in significant[index + 1 : index + 4]]
+                if name in functions and shape == ["(", ")", ";"] and not needed(name):
+                    start = significant[index][0]
+                    if start and tokens[start - 1][0] == "space":
+                        start -= 1
+                    removed.update(range(start, significant[index + 3][0] + 1))
+                    dropped.add(name)
+            tokens = [token for position, token in enumerate(tokens) if position not in removed]
+        roots.append((statement, tokens))
+
+    kept: set[str] = set()
+    pending = [
+        ref
+        for statement, tokens in roots
+        for ref in (_js_refs(tokens, functions) if statement["kind"] == "statement" else statement["refs"])
+    ]
+    while pending:
+        name = pending.pop()
+        if name in kept or name not in functions:
+            continue
+        kept.add(name)
+        pending.extend(functions[name]["refs"])
+    output: list[tuple[str, str]] = []
+    rewritten = {id(statement): tokens for statement, tokens in roots}
+    for statement in program["statements"]:
+        if statement["kind"] != "function":
+            output.extend(rewritten[id(statement)])
+        elif any(name in kept for name in statement["names"]):
+            output.extend(statement["tokens"])
+    return output, sorted(dropped)
+
+
+def _js_refs(tokens: list[tuple[str, str]], functions: dict[str, Any]) -> set[str]:
+    significant = _significant(tokens)
+    return {
+        text
+        for index, (_, kind, text) in enumerate(significant)
+        if kind == "word" and text in functions and (index == 0 or significant[index - 1][2] not in {".", "?."})
+    }
+
+
+def minify_js(tokens: list[tuple[str, str]]) -> str:
+    # Drops comments and indentation. Line breaks stay unless the previous line plainly
+    # ended its statement, so automatic semicolon insertion never changes meaning.
+    output: list[str] = []
+    previous: tuple[str, str] = ("", "")
+    gap = ""
+    for kind, text in tokens:
+        if kind == "comment":
+            gap = gap or " "
+            continue
+        if kind == "space":
+            gap = "\n" if "\n" in text or gap == "\n" else (gap or " ")
+            continue
+        if output:
+            if gap == "\n" and previous[1] not in {";", "{", ","} and text not in {")", "]", "}"}:
+                output.append("\n")
+            elif gap and _js_needs_space(previous, (kind, text)):
+                output.append(" ")
+        output.append(text)
+        previous = (kind, text)
+        gap = ""
+    return "".join(output) + "\n"
+
+
+def _js_needs_space(left: tuple[str, str], right: tuple[str, str]) -> bool:
+    wordy = {"word", "number", "regex"}
+    if left[0] in wordy and (right[0] in {"word", "number"} or (left[0] == "number" and right[1].startswith("."))):
+        return True
+    return left[0] == "punct" and left[1][-1:] + right[1][:1] in {"++", "--", "//", "/*"}
+
+
+def minify_css(source: str) -> str:
+    kept: list[str] = []
+
+    def stash(match: re.Match[str]) -> str:
+        if match.group(0).startswith("/*"):
+            return " "
+        kept.append(match.group(0))
+        return f"\x00{len(kept) - 1}\x00"
+
+    text = re.sub(r"/\*.*?\*/|\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'", stash, source, flags=re.S)
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r" ?([{};,>]) ?", r"\1", text)
+    text = text.replace(": ", ":").replace(";}", "}").strip()
+    return re.sub("\x00(\\d+)\x00", lambda match: kept[int(match.group(1))], text) + "\n"
+
+
+def _bundle_sources() -> dict[str, dict[str, int]]:
+    sources: dict[str, dict[str, int]] = {}
+    for path in [ROOT / BUNDLE_SCRIPT, ROOT / BUNDLE_STYLESHEET, *sorted(ROOT.glob("*.html"))]:
+        try:
+            info = path.stat()
+        except OSError:
+            continue
+        sources[path.name] = {"size": info.st_size, "mtimeNs": info.st_mtime_ns}
+    return sources
+
+
+def _write_bundle_file(stem: str, body: bytes, suffix: str, files: dict[str, dict[str, int]]) -> str:
+    name = f"{stem}.{hashlib.sha256(body).hexdigest()[:16]}{suffix}"
+    url = f"{BUNDLE_URL_PREFIX}{name}"
+    if url not in files:
+        target = BUNDLE_DIR / name
+        if not target.is_file() or target.stat().st_size != len(body):
+            temp_path = target.with_name(f".{name}.{os.getpid()}.tmp")
+            temp_path.write_bytes(body)
+            os.replace(temp_path, target)
+        files[url] = {"bytes": len(body), "gzipBytes": len(gzip.compress(body, compresslevel=6, mtime=0))}
+    return url
+
+
+def build_bundles() -> dict[str, Any]:
+    sources = _bundle_sources()
+    script = (ROOT / BUNDLE_SCRIPT).read_text(encoding="utf-8")
+    stylesheet = (ROOT / BUNDLE_STYLESHEET).read_text(encoding="utf-8")
+    program = analyze_script(script)
+    BUNDLE_DIR.mkdir(parents=True, exist_ok=True)
+    files: dict[str, dict[str, int]] = {}
+    stylesheet_url = _write_bundle_file(Path(BUNDLE_STYLESHEET).stem, minify_css(stylesheet).encode("utf-8"), ".css", files)
+    original = {
+        BUNDLE_SCRIPT: (len(script.encode("utf-8")), len(gzip.compress(script.encode("utf-8"), compresslevel=6, mtime=0))),
+        BUNDLE_STYLESHEET: (
+            len(stylesheet.encode("utf-8")),
+            len(gzip.compress(stylesheet.encode("utf-8"), compresslevel=6, mtime=0)),
+        ),
+    }
+    pages: dict[str, dict[str, Any]] = {}
+    totals = {"sourceBytes": 0, "sourceGzipBytes": 0, "bundleBytes": 0, "bundleGzipBytes": 0}
+    for page in sorted(ROOT.glob("*.html")):
+        html = page.read_text(encoding="utf-8", errors="replace")
+        entry: dict[str, Any] = {}
+        shipped: list[tuple[str, str]] = []
+        if f'src="{BUNDLE_SCRIPT}"' in html:
+            tokens, dropped = page_script_tokens(program, html)
+            entry["script"] = _write_bundle_file(Path(BUNDLE_SCRIPT).stem, minify_js(tokens).encode("utf-8"), ".js", files)
+            entry["droppedInits"] = dropped
+            shipped.append((BUNDLE_SCRIPT, entry["script"]))
+        if f'href="{BUNDLE_STYLESHEET}"' in html:
+            entry["stylesheet"] = stylesheet_url
+            shipped.append((BUNDLE_STYLESHEET, stylesheet_url))
+        if not entry:
+            continue
+        entry["sourceBytes"] = sum(original[name][0] for name, _ in shipped)
+        entry["sourceGzipBytes"] = sum(original[name][1] for name, _ in shipped)
+        entry["bundleBytes"] = sum(files[url]["bytes"] for _, url in shipped)
+        entry["bundleGzipBytes"] = sum(files[url]["gzipBytes"] for _, url in shipped)
+        for field in totals:
+            totals[field] += entry[field]
+        pages[f"/{page.name}"] = entry
+    for stale in BUNDLE_DIR.iterdir():
+        if BUNDLE_FILE_PATTERN.match(f"{BUNDLE_URL_PREFIX}{stale.name}") and f"{BUNDLE_URL_PREFIX}{stale.name}" not in files:
+            stale.unlink(missing_ok=True)
+    manifest = {
+        "generatedAt": now_utc().isoformat(timespec="seconds"),
+        "builtAt": time.time(),
+        "sources": sources,
+        "pages": pages,
+        "files": files,
+        "report": {
+            "pages": len(pages),
+            "files": len(files),
+            **totals,
+            "savedBytes": totals["sourceBytes"] - totals["bundleBytes"],
+            "savedGzipBytes": totals["sourceGzipBytes"] - totals["bundleGzipBytes"],
+        },
+    }
+    save_json_store(BUNDLE_MANIFEST_FILE, manifest)
+    return manifest
+
+
+_bundle_state: dict[str, Any] = {"checkedAt": -1e9, "fresh": None, "attempted": None}
+_bundle_state_lock = threading.Lock()
+
+
+def refresh_bundles() -> None:
+    started = time.perf_counter()
+    try:
+        manifest = build_bundles()
+    except (OSError, ValueError) as error:
+        message = f"bundle build failed: {error}"
+    else:
+        report = manifest["report"]
+        message = (
+            f"bundles: {report['pages']} pages, {report['bundleGzipBytes']} gzip bytes instead of "
+            f"{report['sourceGzipBytes']} in {round(time.perf_counter() - started, 2)}s"
+        )
+    write_log_record({"type": "message", "ts": now_utc().isoformat(timespec="milliseconds"), "message": message})
+
+
+def bundle_manifest() -> dict[str, Any] | None:
+    # A manifest is only used while every source it was built from is unchanged. Otherwise pages
+    # fall back to the plain files and one background rebuild runs per set of sources.
+    now = time.monotonic()
+    with _bundle_state_lock:
+        if now - _bundle_state["checkedAt"] < STATIC_STAT_INTERVAL_SECONDS:
+            return _bundle_state["fresh"]
+    sources = _bundle_sources()
+    manifest = load_json_store(BUNDLE_MANIFEST_FILE)
+    fresh = manifest if isinstance(manifest, dict) and manifest.get("sources") == sources else None
+    with _bundle_state_lock:
+        _bundle_state.update({"checkedAt": now, "fresh": fresh})
+        if fresh is not None or _bundle_state["attempted"] == sources:
+            return fresh
+        _bundle_state["attempted"] = sources
+    threading.Thread(target=refresh_bundles, name="bundler", daemon=True).start()
+    return None
+
+
+_bundled_pages: dict[str, dict[str, Any]] = {}
+
+
+def bundle_page(route: str, page: dict[str, Any]) -> dict[str, Any]:
+    manifest = bundle_manifest()
+    targets = manifest["pages"].get(route) if manifest else None
+    body = page.get("body")
+    if not targets or body is None:
+        return page
+    with _bundle_state_lock:
+        cached = _bundled_pages.get(route)
+        if cached is not None and cached["manifest"] is manifest and cached["source"] == page.get("etag"):
+            return cached["entry"]
+    if targets.get("script"):
+        body = body.replace(f'src="{BUNDLE_SCRIPT}"'.encode(), f'src="{targets["script"]}"'.encode(), 1)
+    if targets.get("stylesheet"):
+        body = body.replace(f'href="{BUNDLE_STYLESHEET}"'.encode(), f'href="{targets["stylesheet"]}"'.encode(), 1)
+    entry = derived_static_entry(page, body, max(float(page["mtime"]), float(manifest["builtAt"])))
+    with _bundle_state_lock:
+        _bundled_pages[route] = {"manifest": manifest, "source": page.get("etag"), "entry": entry}
+    return entry
+
+
+def auth_config_payload() -> dict[str, Any]:
+    return {
+        "ok": True,
+        "bootstrapRequired": auth_bootstrap_required(),
+        "requiresAdminToken": admin_token_required(),
+        "sessionHours": SESSION_HOURS,
+    }
+
+
+def json_store_version(path: Path) -> tuple[int, int, int] | None:
+    try:
+        info = path.stat()
+    except OSError:
+        return None
+    return (info.st_ino, info.st_mtime_ns, info.st_size)
+
+
+def projects_version() -> tuple[Any, ...]:
+    # list_projects reads each brief and probes for preview pages; editing those leaves the
+    # parent folder's mtime alone, so every file it looks at is part of the version.
+    try:
+        children = sorted(PROJECTS_DIR.iterdir())
+    except OSError:
+        return ()
+    watched = ("project-brief.json", "index.html", "web/index.html")
+    return tuple((child.name, json_store_version(child), *(json_store_version(child / name) for name in watched)) for child in children)
+
+
+# route -> (generation, payload); the payload is only built when the generation changed. A None
+# generation means the state lives in memory and the built payload is its own generation.
+BOOTSTRAP_SOURCES: dict[str, tuple[Any, Any]] = {
+    "/api/auth-config": (lambda: (json_store_version(AUTH_USERS_FILE), admin_token_required()), auth_config_payload),
+    "/api/providers": (lambda: "static", lambda: {"ok": True, "catalog": provider_catalog()}),
+    "/api/provider-health": (None, lambda: {"ok": True, "providers": provider_health_with_probes()}),
+    "/api/projects": (projects_version, lambda: {"ok": True, "projects": list_projects()}),
+    TEMPLATE_CATALOG_ROUTE: (
+        lambda: template_index()["version"],
+        lambda: search_templates("", "", 1, TEMPLATE_MAX_PAGE_SIZE),
+    ),
+}
+_bootstrap_pages: dict[str, dict[str, Any]] = {}
+_bootstrap_pages_lock = threading.Lock()
+
+
+def derived_static_entry(page: dict[str, Any], body: bytes, mtime: float) -> dict[str, Any]:
+    # Pages rewritten at serve time keep the source's identity but get their own validators.
+    compressed = gzip.compress(body, compresslevel=6, mtime=0)
+    digest = hashlib.sha256(body).hexdigest()[:20]
+    return {
+        "path": page["path"],
+        "fd": None,
+        "ino": page.get("ino"),
+        "mtimeNs": page.get("mtimeNs"),
+        "size": len(body),
+        "mtime": mtime,
+        "lastModified": formatdate(int(mtime), usegmt=True),
+        "contentType": page["contentType"],
+        "etag": f'"{digest}"',
+        "gzipEtag": f'"{digest}-gz"',
+        "body": body,
+        "gzip": compressed if len(compressed) < len(body) else None,
+    }
+
+
+def render_bootstrap_page(route: str, page: dict[str, Any]) -> dict[str, Any]:
+    routes = BOOTSTRAP_PAGES[route]
+    built: dict[str, Any] = {}
+    generations = []
+    for api_route in routes:
+        generation, build = BOOTSTRAP_SOURCES[api_route]
+        if generation is None:
+            built[api_route] = build()
+            generations.append(json.dumps(built[api_route], sort_keys=True))
+        else:
+            generations.append(generation())
+    key = ((page["ino"], page["mtimeNs"], page["size"]), tuple(generations))
+    with _bootstrap_pages_lock:
+        cached = _bootstrap_pages.get(route)
+        if cached is not None and cached["key"] == key:
+            return cached
+
+    body = page.get("body")
+    if body is None:
+        try:
+            body = Path(page["path"]).read_bytes()
+        except OSError:
+            return page
+    payloads = {api_route: built.get(api_route) or BOOTSTRAP_SOURCES[api_route][1]() for api_route in routes}
+    # "<" is escaped so no payload string can close the script element early.
+    data = json.dumps(payloads, separators=(",", ":")).replace("<", "\\u003c").encode("utf-8")
+    block = b'<script type="application/json" id="bootstrapData">' + data + b"</script>\n    "
+    marker = body.find(b'<script src="app.js"')
+    if marker < 0:
+        marker = body.rfind(b"</body>")
+    if marker < 0:
+        return page
+    entry = derived_static_entry(page, body[:marker] + block + body[marker:], time.time())
+    entry["key"] = key
+    with _bootstrap_pages_lock:
+        _bootstrap_pages[route] = entry
+    return entry
+
+
+def etag_matches(if_none_match: str | None, etag: str | None) -> bool:
+    if not if_none_match or etag is None:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def not_modified(headers: Any, mtime: float, etag: str | None = None) -> bool:
+    # If-None-Match wins over If-Modified-Since; dates compare in whole seconds like send_head.
+    if_none_match = headers.get("If-None-Match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    raw = headers.get("If-Modified-Since")
+    if not raw:
+        return False
+    try:
+        since = parsedate_to_datetime(raw)
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return datetime.fromtimestamp(int(mtime), timezone.utc) <= since
+
+
+_static_bodies: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_static_bodies_lock = threading.Lock()
+STATIC_BODY_STATS = {"hits": 0, "misses": 0, "bypassed": 0, "evictions": 0, "bytes": 0}
+
+
+def cached_static_body(path: Path) -> dict[str, Any] | None:
+    key = str(path)
+    now = time.monotonic()
+    with _static_bodies_lock:
+        entry = _static_bodies.get(key)
+        if entry is not None and now - entry["checkedAt"] < STATIC_STAT_INTERVAL_SECONDS:
+            _static_bodies.move_to_end(key)
+            STATIC_BODY_STATS["hits"] += 1
+            return entry
+    if entry is None:
+        return None
+    try:
+        info = os.stat(key)
+    except OSError:
+        info = None
+    with _static_bodies_lock:
+        if info is not None and (entry["ino"], entry["mtimeNs"], entry["size"]) == (
+            info.st_ino,
+            info.st_mtime_ns,
+            info.st_size,
+        ):
+            entry["checkedAt"] = now
+            STATIC_BODY_STATS["hits"] += 1
+            return entry
+        if _static_bodies.get(key) is entry:
+            del _static_bodies[key]
+            STATIC_BODY_STATS["bytes"] -= entry["cost"]
+    return None
+
+
+def admit_static_body(file_entry: dict[str, Any]) -> dict[str, Any] | None:
+    # Files under the size cap are read once, with validators and a gzip variant computed up front.
+    size = int(file_entry["size"])
+    if size > STATIC_BODY_MAX_FILE_BYTES or size > STATIC_BODY_CACHE_BYTES:
+        with _static_bodies_lock:
+            STATIC_BODY_STATS["bypassed"] += 1
+        return None
+    try:
+        with open(file_entry["path"], "rb") as handle:
+            info = os.fstat(handle.fileno())
+            body = handle.read()
+    except OSError:
+        return None
+    if len(body) != info.st_size:
+        return None
+    compressed = None
+    if Path(file_entry["path"]).suffix.lower() in PRECOMPRESS_SUFFIXES and len(body) >= PRECOMPRESS_MIN_BYTES:
+        compressed = gzip.compress(body, compresslevel=6, mtime=0)
+        if len(compressed) >= len(body):
+            compressed = None
+    digest = hashlib.sha256(body).hexdigest()[:20]
+    entry = {
+        "path": file_entry["path"],
+        "fd": None,
+        "ino": info.st_ino,
+        "mtimeNs": info.st_mtime_ns,
+        "mtime": info.st_mtime,
+        "size": info.st_size,
+        "lastModified": formatdate(int(info.st_mtime), usegmt=True),
+        "contentType": file_entry["contentType"],
+        "etag": f'"{digest}"',
+        "gzipEtag": f'"{digest}-gz"',
+        "body": body,
+        "gzip": compressed,
+        "cost": len(body) + len(compressed or b""),
+        "checkedAt": time.monotonic(),
+    }
+    with _static_bodies_lock:
+        STATIC_BODY_STATS["misses"] += 1
+        previous = _static_bodies.pop(entry["path"], None)
+        if previous is not None:
+            STATIC_BODY_STATS["bytes"] -= previous["cost"]
+        _static_bodies[entry["path"]] = entry
+        STATIC_BODY_STATS["bytes"] += entry["cost"]
+        while STATIC_BODY_STATS["bytes"] > STATIC_BODY_CACHE_BYTES:
+            _, evicted = _static_bodies.popitem(last=False)
+            STATIC_BODY_STATS["bytes"] -= evicted["cost"]
+            STATIC_BODY_STATS["evictions"] += 1
+    return entry
+
+
+def static_cache_stats() -> dict[str, Any]:
+    with _static_bodies_lock:
+        stats: dict[str, Any] = dict(STATIC_BODY_STATS)
+        stats["entries"] = len(_static_bodies)
+        stats["gzipEntries"] = sum(1 for entry in _static_bodies.values() if entry["gzip"] is not None)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hitRate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    stats["budgetBytes"] = STATIC_BODY_CACHE_BYTES
+    with _static_files_lock:
+        stats["openFiles"] = sum(1 for entry in _static_files.values() if entry["fd"] is not None)
+    return stats
+
+
+def warm_static_cache() -> dict[str, int]:
+    files = 0
+    raw_bytes = 0
+    gzip_bytes = 0
+    for folder in PRECOMPRESS_DIRS:
+        base = ROOT / folder if folder else ROOT
+        if not base.is_dir():
+            continue
+        candidates = base.rglob("*") if folder else base.glob("*")
+        for path in candidates:
+            if path.suffix.lower() not in PRECOMPRESS_SUFFIXES:
+                continue
+            file_entry = acquire_static_file(path.resolve())
+            if file_entry is None:
+                continue
+            try:
+                entry = admit_static_body(file_entry)
+            finally:
+                release_static_file(file_entry)
+            if entry is None:
+                continue
+            files += 1
+            raw_bytes += int(entry["size"])
+            gzip_bytes += len(entry["gzip"] or b"")
+    return {"files": files, "rawBytes": raw_bytes, "gzipBytes": gzip_bytes}
+
+
+def warm_up() -> dict[str, Any]:
+    started = time.perf_counter()
+    summary: dict[str, Any] = {
+        "catalogPlans": len(cached_catalog_index()),
+        "templates": len(template_index()["templates"]),
+        "providerConfigKeys": len(read_provider_config()),
+        "users": len(list_auth_users(public_only=False)),
+        "sessions": len(read_json_list(AUTH_SESSIONS_FILE)),
+        "requests": len(list_service_requests()),
+        "staticCache": warm_static_cache(),
+    }
+    STARTUP_STATS["warmupMs"] = round((time.perf_counter() - started) * 1000, 2)
+    return summary
+
+
+_active_requests = {"count": 0, "peak": 0}
+_active_requests_lock = threading.Lock()
+
+
+def track_active_request(delta: int) -> None:
+    with _active_requests_lock:
+        _active_requests["count"] += delta
+        _active_requests["peak"] = max(_active_requests["peak"], _active_requests["count"])
+
+
+def check_data_dir_writable() -> bool:
+    probe = DATA_DIR / f".readyz-{os.getpid()}.tmp"
+    try:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        probe.write_bytes(b"ok")
+        probe.unlink()
+    except OSError:
+        return False
+    return True
+
+
+def refresh_readiness() -> None:
+    READINESS["dataDirWritable"] = check_data_dir_writable()
+    READINESS["requestStoreLoaded"] = (
+        not SERVICE_REQUESTS_FILE.exists() or isinstance(load_json_store(SERVICE_REQUESTS_FILE), list)
+    )
+    READINESS["checkedAt"] = now_utc().isoformat()
+    READINESS.pop("error", None)
+
+
+def readiness_monitor_loop() -> None:
+    while True:
+        time.sleep(READINESS_CHECK_SECONDS)
+        try:
+            refresh_readiness()
+        except Exception as exc:  # noqa: BLE001
+            READINESS["checkedAt"] = now_utc().isoformat()
+            READINESS["error"] = str(exc)
+
+
+def readiness_report() -> dict[str, Any]:
+    active = _active_requests["count"]
+    checks = {
+        "warm": bool(SERVER_STATE["ready"]),
+        "dataDirWritable": READINESS["dataDirWritable"] is True,
+        "requestStoreLoaded": READINESS["requestStoreLoaded"] is True,
+        "threadHeadroom": active < MAX_ACTIVE_REQUESTS,
+    }
+    return {
+        "ok": True,
+        "ready": all(checks.values()),
+        "checks": checks,
+        "activeRequests": active,
+        "peakActiveRequests": _active_requests["peak"],
+        "maxActiveRequests": MAX_ACTIVE_REQUESTS,
+        "checkedAt": READINESS["checkedAt"],
+    }
+
+
+def note_first_byte() -> None:
+    STARTUP_STATS["firstByteMs"] = round((time.perf_counter() - BOOT_STARTED) * 1000, 2)
+    write_log_record({"type": "startup", "ts": now_utc().isoformat(timespec="milliseconds"), **STARTUP_STATS})
+
+
+_profile_lock = threading.Lock()
+PROFILE_HANDLER_METHODS = {"do_GET", "do_POST", "do_HEAD", "do_OPTIONS"}
+
+
+def describe_handler_frame(frame: Any) -> tuple[str, list[str]] | None:
+    labels: list[str] = []
+    current = frame
+    while current is not None:
+        code = current.f_code
+        # No line numbers: samples from different lines of one function must fold into one frame.
+        labels.append(f"{Path(code.co_filename).name}:{code.co_name}")
+        if code.co_name in PROFILE_HANDLER_METHODS:
+            handler = current.f_locals.get("self")
+            if isinstance(handler, AppHandler):
+                route = f"{handler.command} {urlparse(handler.path).path}"
+                labels.reverse()
+                return route, labels
+        current = current.f_back
+    return None
+
+
+def run_sampling_profile(*, seconds: float, interval: float, exclude: set[int]) -> dict[str, Any]:
+    if not _profile_lock.acquire(blocking=False):
+        return {"ok": False, "error": "A profile is already running"}
+    try:
+        stacks: dict[str, dict[str, int]] = {}
+        route_samples: dict[str, int] = {}
+        ticks = 0
+        started = time.perf_counter()
+        deadline = started + seconds
+        while time.perf_counter() < deadline:
+            ticks += 1
+            for ident, frame in sys._current_frames().items():  # noqa: SLF001 - sampling profiler
+                if ident in exclude:
+                    continue
+                described = describe_handler_frame(frame)
+                if described is None:
+                    continue
+                route, labels = described
+                collapsed = ";".join(label.replace(";", ":") for label in labels)
+                route_stacks = stacks.setdefault(route, {})
+                route_stacks[collapsed] = route_stacks.get(collapsed, 0) + 1
+                route_samples[route] = route_samples.get(route, 0) + 1
+            time.sleep(interval)
+        elapsed = time.perf_counter() - started
+    finally:
+        _profile_lock.release()
+
+    routes: list[dict[str, Any]] = []
+    collapsed_lines: list[str] = []
+    for route in sorted(route_samples, key=lambda item: route_samples[item], reverse=True):
+        ranked = sorted(stacks[route].items(), key=lambda item: item[1], reverse=True)
+        routes.append(
+            {
+                "route": route,
+                "samples": route_samples[route],
+                "hotStacks": [{"stack": stack, "count": count} for stack, count in ranked[:25]],
+            }
+        )
+        root = route.replace(";", ":")
+        collapsed_lines.extend(f"{root};{stack} {count}" for stack, count in ranked)
+
+    return {
+        "ok": True,
+        "seconds": round(elapsed, 3),
+        "intervalMs": round(interval * 1000, 3),
+        "ticks": ticks,
+        "samples": sum(route_samples.values()),
+        "routes": routes,
+        "collapsed": "\n".join(collapsed_lines) + ("\n" if collapsed_lines else ""),
+    }
+
+
+def use_data_dir(path: Path, *, projects_dir: Path | None = None) -> None:
+    global DATA_DIR, SERVICE_REQUESTS_FILE, AUTH_USERS_FILE, AUTH_SESSIONS_FILE, PROVIDER_CONFIG_FILE, IDEMPOTENCY_FILE, ARCHIVE_DIR
+    global BLOBS_DIR, ASSET_MANIFEST_FILE, SESSION_KEY_FILE, SESSION_REVOCATIONS_FILE, PROJECTS_DIR
+    DATA_DIR = path
+    SERVICE_REQUESTS_FILE = path / "service-requests.json"
+    AUTH_USERS_FILE = path / "auth-users.json"
+    AUTH_SESSIONS_FILE = path / "auth-sessions.json"
+    PROVIDER_CONFIG_FILE = path / "provider-config.json"
+    IDEMPOTENCY_FILE = path / "idempotency-keys.json"
+    ARCHIVE_DIR = path / "archive"
+    BLOBS_DIR = path / "blobs"
+    ASSET_MANIFEST_FILE = path / "asset-manifest.json"
+    SESSION_KEY_FILE = path / "session-signing-key"
+    SESSION_REVOCATIONS_FILE = path / "session-revocations.json"
+    PROJECTS_DIR = projects_dir or path / "projects"
+
+
+BENCH_ROUTES = [
+    "healthz",
+    "auth-config",
+    "auth-session",
+    "admin-health",
+    "providers",
+    "provider-health",
+    "projects",
+    "service-requests",
+    "service-request",
+    "service-request-status",
+    "provision-request",
+    "ai-build",
+    "static-index",
+    "static-app-js",
+    "static-image",
+]
+
+
+class BenchUpstreamHandler(SimpleHTTPRequestHandler):
+    latency_seconds = 0.0
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib method name
+        self.reply()
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib method name
+        length = int(self.headers.get("Content-Length", "0") or "0")
+        if length:
+            self.rfile.read(length)
+        self.reply()
+
+    def reply(self) -> None:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        parsed = urlparse(self.path)
+        token = secrets.token_hex(4)
+        payload: Any = {"ok": True}
+        if parsed.path == "/v1/owners":
+            payload = [{"id": "own-bench", "name": "bench", "slug": "bench"}]
+        elif parsed.path.startswith("/v1/services/") and parsed.path.endswith("/deploys"):
+            payload = [{"deploy": {"id": f"dep-bench-{token}", "status": "live"}}]
+        elif parsed.path.startswith("/api/v2/projects/") and parsed.path.endswith("/operations"):
+            payload = {"operations": [{"id": f"op-bench-{token}", "status": "finished"}]}
+        elif parsed.path == "/v1/services":
+            payload = {"id": f"srv-bench-{token}", "serviceDetails": {"url": f"https://bench-{token}.onrender.com"}}
+        elif parsed.path == "/api3.json":
+            query = dict(item.split("=", 1) for item in parsed.query.split("&") if "=" in item)
+            command = query.get("command", "")
+            if command == "register":
+                payload = {"RegisterResponse": {"ResponseCode": "0", "Status": "success"}}
+            else:
+                results = [
+                    {"DomainName": value, "Available": "yes", "Price": "12.99"}
+                    for key, value in sorted(query.items())
+                    if key.startswith("domain")
+                ]
+                payload = {"SearchResponse": {"ResponseCode": "0", "Status": "success", "SearchResults": results}}
+        elif parsed.path == "/v1/projects":
+            payload = {"id": f"ref{token}", "status": "COMING_UP"}
+        elif parsed.path == "/api/v2/projects":
+            payload = {"project": {"id": f"neon-bench-{token}"}}
+        elif parsed.path == "/v1/chat/completions":
+            content = json.dumps({"projectName": "Bench App", "template": "SaaS Dashboard", "nextSteps": ["a", "b", "c"]})
+            payload = {"choices": [{"message": {"content": content}}]}
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        return
+
+
+def seed_bench_data(*, users: int, sessions: int, requests: int, projects: int) -> dict[str, Any]:
+    salt = secrets.token_hex(16)
+    shared_hash = password_hash("bench-password", salt)
+    timestamp = now_utc()
+    user_records: list[dict[str, Any]] = []
+    for index in range(max(1, users)):
+        user_records.append(
+            {
+                "id": f"user_bench{index:04d}",
+                "username": f"bench{index:04d}",
+                "role": "owner" if index == 0 else ("admin" if index % 2 else "viewer"),
+                "createdAt": (timestamp + timedelta(seconds=index)).isoformat(),
+                "updatedAt": timestamp.isoformat(),
+                "lastLoginAt": "",
+                "passwordSalt": salt,
+                "passwordHash": shared_hash,
+            }
+        )
+    write_json_list(AUTH_USERS_FILE, user_records)
+
+    tokens: list[str] = []
+    session_records: list[dict[str, Any]] = []
+    for index in range(max(1, sessions)):
+        user = user_records[index % len(user_records)] if index else user_records[0]
+        token = secrets.token_urlsafe(32)
+        tokens.append(token)
+        session_records.append(
+            {
+                "id": f"session_bench{index:05d}",
+                "userId": user["id"],
+                "username": user["username"],
+                "role": user["role"],
+                "tokenHash": hash_session_token(token),
+                "createdAt": timestamp.isoformat(),
+                "lastSeenAt": timestamp.isoformat(),
+                "expiresAt": (timestamp + timedelta(hours=SESSION_HOURS)).isoformat(),
+            }
+        )
+    write_json_list(AUTH_SESSIONS_FILE, session_records)
+
+    catalog_index = build_catalog_index(provider_catalog())
+    plans = sorted(catalog_index.items())
+    date_part = datetime.now().strftime("%Y%m%d")
+    request_records: list[dict[str, Any]] = []
+    for index in range(requests):
+        items = []
+        for offset in range(2):
+            (provider_id, service_id, plan_id, cycle), plan = plans[(index + offset * 5) % len(plans)]
+            items.append(
+                {
+                    "providerId": provider_id,
+                    "providerName": plan["providerName"],
+                    "serviceId": service_id,
+                    "serviceName": plan["serviceName"],
+                    "planId": plan_id,
+                    "planLabel": plan["planLabel"],
+                    "billingCycle": cycle,
+                    "unitPrice": plan["price"],
+                }
+            )
+        created = (timestamp - timedelta(minutes=index)).isoformat()
+        request_records.append(
+            {
+                "requestId": f"SRV-{date_part}-{index + 1:04d}",
+                "createdAt": created,
+                "updatedAt": created,
+                "customerName": f"Bench Customer {index}",
+                "email": f"bench{index}@example.com",
+                "projectName": f"Bench Project {index}",
+                "notes": "",
+                "items": items,
+                "total": round(sum(float(item["unitPrice"]) for item in items), 2),
+                "status": "submitted",
+                "statusHistory": [{"status": "submitted", "timestamp": created, "reason": "request created"}],
+                "provisioning": [],
+            }
+        )
+    write_service_requests(request_records)
+
+    PROJECTS_DIR.mkdir(parents=True, exist_ok=True)
+    for index in range(projects):
+        project_dir = PROJECTS_DIR / f"bench-project-{index:04d}"
+        write_files(
+            project_dir,
+            {
+                "index.html": "<!doctype html><title>bench</title>\n",
+                "project-brief.json": json.dumps(
+                    {
+                        "projectName": f"Bench Project {index}",
+                        "owner": "Bench",
+                        "stack": "HTML/CSS/JS",
+                        "createdAt": (timestamp - timedelta(minutes=index)).isoformat(),
+                    }
+                ),
+            },
+        )
+
+    return {
+        "users": len(user_records),
+        "sessions": len(session_records),
+        "requests": len(request_records),
+        "projects": projects,
+        "ownerToken": tokens[0],
+        "requestIds": [record["requestId"] for record in request_records],
+    }
+
+
+def bench_workload(route: str, seed: dict[str, Any], counter: int) -> tuple[str, str, dict[str, Any] | None, dict[str, str]]:
+    owner_headers = {"Authorization": f"Bearer {seed['ownerToken']}"}
+    request_ids = seed.get("requestIds") or ["SRV-00000000-0000"]
+    request_id = request_ids[counter % len(request_ids)]
+    if route == "healthz":
+        return "GET", "/api/healthz", None, {}
+    if route == "auth-config":
+        return "GET", "/api/auth-config", None, {}
+    if route == "auth-session":
+        return "GET", "/api/auth-session", None, owner_headers
+    if route == "admin-health":
+        return "GET", "/api/admin-health", None, owner_headers
+    if route == "providers":
+        return "GET", "/api/providers", None, {}
+    if route == "provider-health":
+        return "GET", "/api/provider-health", None, {}
+    if route == "projects":
+        return "GET", "/api/projects", None, {}
+    if route == "service-requests":
+        return "GET", "/api/service-requests", None, {}
+    if route == "service-request":
+        body = {
+            "customerName": "Bench Customer",
+            "email": "bench@example.com",
+            "projectName": f"Bench Submit {counter}",
+            "items": [{"providerId": "render", "serviceId": "managed-web-hosting", "planId": "starter", "billingCycle": "monthly"}],
+        }
+        return "POST", "/api/service-request", body, {}
+    if route == "service-request-status":
+        status = "reviewing" if counter % 2 else "approved"
+        return "POST", "/api/service-request-status", {"requestId": request_id, "status": status}, owner_headers
+    if route == "provision-request":
+        return "POST", "/api/provision-request", {"requestId": request_id, "dbPassword": "bench-password"}, owner_headers
+    if route == "ai-build":
+        return "POST", "/api/ai-build", {"prompt": "Build a booking app for salons", "owner": "Bench"}, {}
+    if route == "static-index":
+        return "GET", "/index.html", None, {}
+    if route == "static-app-js":
+        return "GET", "/app.js", None, {}
+    if route == "static-image":
+        return "GET", "/flex-ui-assets/elements/cta/photo-laptop-ph.png", None, {}
+    raise ValueError(f"Unknown bench route: {route}")
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return round(sorted_values[rank], 3)
+
+
+def run_bench_route(
+    *,
+    port: int,
+    route: str,
+    seed: dict[str, Any],
+    concurrency: int,
+    duration: float,
+    max_requests: int,
+    keepalive: bool = False,
+) -> dict[str, Any]:
+    import http.client
+    from concurrent.futures import ThreadPoolExecutor
+
+    issued = {"count": 0}
+    issued_lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker() -> tuple[list[float], dict[int, int], int]:
+        latencies: list[float] = []
+        statuses: dict[int, int] = {}
+        errors = 0
+        connection: http.client.HTTPConnection | None = None
+        while time.perf_counter() < deadline:
+            with issued_lock:
+                if max_requests and issued["count"] >= max_requests:
+                    break
+                counter = issued["count"]
+                issued["count"] += 1
+            method, path, body, headers = bench_workload(route, seed, counter)
+            payload = json.dumps(body).encode("utf-8") if body is not None else None
+            request_headers = dict(headers)
+            if payload is not None:
+                request_headers["Content-Type"] = "application/json"
+            started = time.perf_counter()
+            try:
+                if connection is None:
+                    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                connection.request(method, path, body=payload, headers=request_headers)
+                response = connection.getresponse()
+                response.read()
+                status = int(response.status)
+                if not keepalive or response.will_close:
+                    connection.close()
+                    connection = None
+            except (OSError, http.client.HTTPException):
+                if connection is not None:
+                    connection.close()
+                    connection = None
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+            if status >= 400:
+                errors += 1
+        if connection is not None:
+            connection.close()
+        return latencies, statuses, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = [future.result() for future in [pool.submit(worker) for _ in range(concurrency)]]
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(value for result in results for value in result[0])
+    statuses: dict[str, int] = {}
+    for result in results:
+        for status, count in result[1].items():
+            statuses[str(status)] = statuses.get(str(status), 0) + count
+    return {
+        "requests": len(latencies),
+        "errors": sum(result[2] for result in results),
+        "statusCodes": statuses,
+        "seconds": round(elapsed, 3),
+        "throughputRps": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "latencyMs": {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+    }
+
+
+def run_bench(args: Any) -> dict[str, Any]:
+    global ACCESS_LOG_FILE, ACCESS_LOG_STDOUT
+    import shutil
+    import tempfile
+
+    routes = [item.strip() for item in str(args.routes or "").split(",") if item.strip()] or list(BENCH_ROUTES)
+    unknown = [route for route in routes if route not in BENCH_ROUTES]
+    if unknown:
+        raise SystemExit(f"Unknown bench routes: {', '.join(unknown)}. Choose from: {', '.join(BENCH_ROUTES)}")
+
+    temp_root = Path(tempfile.mkdtemp(prefix="islaapp-bench-"))
+    use_data_dir(temp_root / "data", projects_dir=temp_root / "projects")
+    ACCESS_LOG_FILE = temp_root / "data" / "logs" / "access.log" if args.access_log else None
+    ACCESS_LOG_STDOUT = False
+
+    BenchUpstreamHandler.latency_seconds = max(0.0, float(args.upstream_latency_ms) / 1000)
+    upstream = ThreadingHTTPServer(("127.0.0.1", 0), BenchUpstreamHandler)
+    upstream_base = f"http://127.0.0.1:{upstream.server_address[1]}"
+    for provider in PROVIDER_API_BASES:
+        os.environ[f"{provider.upper()}_API_BASE"] = upstream_base
+    os.environ.update(
+        {
+            "RENDER_API_KEY": "bench-render-key",
+            "RENDER_SERVICE_REPO": "https://github.com/example/bench",
+            "DYNADOT_API_KEY": "bench-dynadot-key",
+            "SUPABASE_ACCESS_TOKEN": "bench-supabase-token",
+            "SUPABASE_ORG_ID": "bench-org",
+            "NEON_API_KEY": "bench-neon-key",
+            "OPENAI_API_KEY": "bench-openai-key",
+        }
+    )
+
+    seed_started = time.perf_counter()
+    seed = seed_bench_data(users=args.users, sessions=args.sessions, requests=args.requests, projects=args.projects)
+    seed_seconds = time.perf_counter() - seed_started
+
+    server = AppServer(("127.0.0.1", 0), AppHandler)
+    port = int(server.server_address[1])
+    threads = [
+        threading.Thread(target=upstream.serve_forever, name="bench-upstream", daemon=True),
+        threading.Thread(target=server.serve_forever, name="bench-server", daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    report: dict[str, Any] = {
+        "ok": True,
+        "config": {
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "maxRequests": args.max_requests,
+            "upstreamLatencyMs": args.upstream_latency_ms,
+            "keepAlive": bool(args.keepalive),
+        },
+        "seed": {key: seed[key] for key in ("users", "sessions", "requests", "projects")},
+        "seedSeconds": round(seed_seconds, 3),
+        "routes": {},
+    }
+    try:
+        for route in routes:
+            report["routes"][route] = run_bench_route(
+                port=port,
+                route=route,
+                seed=seed,
+                concurrency=max(1, args.concurrency),
+                duration=max(0.1, float(args.duration)),
+                max_requests=max(0, args.max_requests),
+                keepalive=bool(args.keepalive),
+            )
+    finally:
+        server.shutdown()
+        upstream.shutdown()
+        server.server_close()
+        upstream.server_close()
+        flush_log_writer()
+        if not args.keep_data:
+            shutil.rmtree(temp_root, ignore_errors=True)
+        else:
+            report["dataDir"] = str(temp_root)
+    return report
+
+
+class AppServer(ThreadingHTTPServer):
+    # Keep-alive clients open fewer connections, but bursts still need a deeper backlog than 5.
+    request_queue_size = 128
+
+
+def serve() -> None:
+    server = AppServer((HOST, PORT), AppHandler)
     display_host = "127.0.0.1" if HOST == "0.0.0.0" else HOST
     print(f"Serving islaAPP at http://{display_host}:{PORT}", flush=True)
     print(f"Project scaffolds will be created in: {PROJECTS_DIR}", flush=True)
     if IS_RENDER:
         print("Render mode detected: enforcing 0.0.0.0 bind and Render-compatible port.", flush=True)
+    if SERVER_WARMUP:
+        summary = warm_up()
+        static_cache = summary["staticCache"]
+        print(
+            f"Warm-up: {summary['requests']} requests, {summary['sessions']} sessions loaded; "
+            f"{static_cache['files']} static files cached in {STARTUP_STATS['warmupMs']} ms",
+            flush=True,
+        )
+    refresh_readiness()
+    threading.Thread(target=readiness_monitor_loop, name="readiness-monitor", daemon=True).start()
+    if PROVIDER_PROBE_ENABLED:
+        threading.Thread(target=provider_probe_loop, name="provider-prober", daemon=True).start()
+    if RECONCILE_ENABLED:
+        threading.Thread(target=reconcile_loop, name="resource-reconciler", daemon=True).start()
+    if ARCHIVE_ENABLED:
+        threading.Thread(target=archive_loop, name="request-archiver", daemon=True).start()
+    threading.Thread(target=compact_stored_provisioning, name="provisioning-compactor", daemon=True).start()
+    if ASSET_DEDUP_ENABLED:
+        threading.Thread(target=refresh_asset_manifest, name="asset-indexer", daemon=True).start()
+    if BUNDLE_ENABLED:
+        bundle_manifest()
+    SERVER_STATE["ready"] = True
+    STARTUP_STATS["readyMs"] = round((time.perf_counter() - BOOT_STARTED) * 1000, 2)
+    print(f"Startup: imports {STARTUP_STATS['importMs']} ms, ready {STARTUP_STATS['readyMs']} ms after boot", flush=True)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down server.")
     finally:
         server.server_close()
+        flush_log_writer()
+
+
+def main(argv: list[str] | None = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="islaAPP development server")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("serve", help="Run the web server (default)")
+    bench = commands.add_parser("bench", help="Benchmark API routes against a seeded temporary data directory")
+    bench.add_argument("--routes", default="", help=f"Comma-separated routes (default: all). Choices: {', '.join(BENCH_ROUTES)}")
+    bench.add_argument("--concurrency", type=int, default=8)
+    bench.add_argument("--duration", type=float, default=3.0, help="Seconds to drive each route")
+    bench.add_argument("--max-requests", type=int, default=0, help="Cap requests per route (0 = duration only)")
+    bench.add_argument("--users", type=int, default=5)
+    bench.add_argument("--sessions", type=int, default=200)
+    bench.add_argument("--requests", type=int, default=500)
+    bench.add_argument("--projects", type=int, default=50)
+    bench.add_argument("--upstream-latency-ms", type=float, default=0.0, help="Delay added by the fake provider/OpenAI server")
+    bench.add_argument("--keepalive", action="store_true", help="Reuse one persistent connection per worker")
+    bench.add_argument("--access-log", action="store_true", help="Write access logs to the temporary data directory")
+    bench.add_argument("--keep-data", action="store_true", help="Keep the temporary data directory for inspection")
+    bench.add_argument("--output", default="", help="Also write the JSON report to this file")
+    archive = commands.add_parser("archive", help="Move old terminal service requests into compressed archive segments")
+    archive.add_argument("--older-than-days", type=int, default=ARCHIVE_AFTER_DAYS)
+    assets = commands.add_parser("assets", help="Hash template assets into the deduplicating asset manifest")
+    assets.add_argument("--hardlink", action="store_true", help="Replace duplicate files on disk with hard links to one copy")
+    commands.add_parser("bundle", help="Build minified per-page script bundles and stylesheet into dist/")
+
+    args = parser.parse_args(argv)
+    if args.command == "bench":
+        report = run_bench(args)
+        text = json.dumps(report, indent=2)
+        if args.output:
+            Path(args.output).write_text(text + "\n", encoding="utf-8")
+        print(text)
+        return
+    if args.command == "archive":
+        if args.older_than_days < 0:
+            archive.error("--older-than-days must be zero or more")
+        print(json.dumps(archive_service_requests(older_than_days=args.older_than_days), indent=2))
+        return
+    if args.command == "assets":
+        print(json.dumps(build_asset_manifest(hardlink=args.hardlink)["report"], indent=2))
+        return
+    if args.command == "bundle":
+        manifest = build_bundles()
+        pages = {
+            route: {field: entry[field] for field in ("sourceGzipBytes", "bundleGzipBytes", "droppedInits") if field in entry}
+            for route, entry in manifest["pages"].items()
+        }
+        print(json.dumps({**manifest["report"], "byPage": pages}, indent=2))
+        return
+    serve()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+import email
+import email.policy
+import http.client
+import io
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import dev_server  # noqa: E402
+
+BODY = bytes(range(256)) * 4
+SIZE = len(BODY)
+MTIME = 1_700_000_000.0
+
+
+def setUpModule() -> None:
+    # Keep the first-byte startup record out of the test output.
+    dev_server.STARTUP_STATS["firstByteMs"] = 0.0
+
+
+def make_entry() -> dict:
+    return dev_server.derived_static_entry({"path": "range-test.bin", "contentType": "application/octet-stream"}, BODY, MTIME)
+
+
+def serve(headers: dict[str, str], *, head: bool = False) -> tuple[http.client.HTTPResponse, bytes]:
+    # Drive send_static_entry on a bare handler and parse what it wrote like a client would.
+    handler = dev_server.AppHandler.__new__(dev_server.AppHandler)
+    handler._requests_handled = 0
+    handler.close_connection = False
+    handler.request_version = "HTTP/1.1"
+    handler.command = "HEAD" if head else "GET"
+    handler.client_address = ("127.0.0.1", 0)
+    handler.wfile = io.BytesIO()
+    handler.headers = http.client.HTTPMessage()
+    for name, value in headers.items():
+        handler.headers[name] = value
+    handler.send_static_entry(make_entry(), head)
+    raw = handler.wfile.getvalue()
+    head_bytes, _, body = raw.partition(b"\r\n\r\n")
+
+    class Wire:
+        def makefile(self, *args, **kwargs):
+            return io.BytesIO(head_bytes + b"\r\n\r\n")
+
+    response = http.client.HTTPResponse(Wire(), method=handler.command)
+    response.begin()
+    return response, body
+
+
+class ParseByteRangesTest(unittest.TestCase):
+    def test_single_ranges(self):
+        self.assertEqual(dev_server.parse_byte_ranges("bytes=0-0", SIZE), [(0, 0)])
+        self.assertEqual(dev_server.parse_byte_ranges("bytes=10-", SIZE), [(10, SIZE - 1)])
+        self.assertEqual(dev_server.parse_byte_ranges("bytes=-100", SIZE), [(SIZE - 100, SIZE - 1)])
+        self.assertEqual(dev_server.parse_byte_ranges(f"bytes=-{SIZE + 10}", SIZE), [(0, SIZE - 1)])
+        self.assertEqual(dev_server.parse_byte_ranges(f"bytes=5-{SIZE + 100}", SIZE), [(5, SIZE - 1)])
+
+    def test_unsatisfiable(self):
+        self.assertEqual(dev_server.parse_byte_ranges(f"bytes={SIZE}-", SIZE), [])
+        self.assertEqual(dev_server.parse_byte_ranges("bytes=-0", SIZE), [])
+        self.assertEqual(dev_server.parse_byte_ranges("bytes=0-", 0), [])
+
+    def test_ignored(self):
+        for header in ("items=0-1", "bytes=", "bytes=a-b", "bytes=5-1", "bytes=-"):
+            self.assertIsNone(dev_server.parse_byte_ranges(header, SIZE), header)
+
+    def test_overlapping_and_adjacent_ranges_merge(self):
+        self.assertEqual(dev_server.parse_byte_ranges("bytes=20-30,0-10,5-19", SIZE), [(0, 30)])
+        self.assertEqual(dev_server.parse_byte_ranges("bytes=0-9,-10,100-199", SIZE), [(0, 9), (100, 199), (SIZE - 10, SIZE - 1)])
+        self.assertEqual(dev_server.parse_byte_ranges(f"bytes={SIZE + 5}-,0-1", SIZE), [(0, 1)])
+
+    def test_range_count_limit(self):
+        limit = dev_server.STATIC_MAX_RANGES
+        at_limit = ",".join(f"{i * 10}-{i * 10 + 1}" for i in range(limit))
+        over_limit = ",".join(f"{i * 10}-{i * 10 + 1}" for i in range(limit + 1))
+        self.assertEqual(len(dev_server.parse_byte_ranges(f"bytes={at_limit}", SIZE)), limit)
+        self.assertIsNone(dev_server.parse_byte_ranges(f"bytes={over_limit}", SIZE))
+
+
+class SendStaticEntryRangeTest(unittest.TestCase):
+    def test_single_range(self):
+        response, body = serve({"Range": "bytes=-100"})
+        self.assertEqual(response.status, 206)
+        self.assertEqual(response.getheader("Content-Range"), f"bytes {SIZE - 100}-{SIZE - 1}/{SIZE}")
+        self.assertEqual(int(response.getheader("Content-Length")), 100)
+        self.assertEqual(body, BODY[-100:])
+
+    def test_open_ended_range(self):
+        response, body = serve({"Range": "bytes=1000-"})
+        self.assertEqual(response.status, 206)
+        self.assertEqual(body, BODY[1000:])
+
+    def test_unsatisfiable_range(self):
+        for header in (f"bytes={SIZE}-", "bytes=-0"):
+            response, body = serve({"Range": header})
+            self.assertEqual(response.status, 416, header)
+            self.assertEqual(response.getheader("Content-Range"), f"bytes */{SIZE}")
+            self.assertEqual(body, b"")
+
+    def test_too_many_ranges_sends_whole_file(self):
+        ranges = ",".join(f"{i * 10}-{i * 10 + 1}" for i in range(dev_server.STATIC_MAX_RANGES + 1))
+        response, body = serve({"Range": f"bytes={ranges}"})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, BODY)
+
+    def test_if_range_date(self):
+        entry = make_entry()
+        response, body = serve({"Range": "bytes=0-9", "If-Range": entry["lastModified"]})
+        self.assertEqual(response.status, 206)
+        self.assertEqual(body, BODY[:10])
+        response, body = serve({"Range": "bytes=0-9", "If-Range": "Mon, 01 Jan 2001 00:00:00 GMT"})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, BODY)
+
+    def test_if_range_etag(self):
+        entry = make_entry()
+        response, body = serve({"Range": "bytes=0-9", "If-Range": entry["etag"]})
+        self.assertEqual(response.status, 206)
+        self.assertEqual(body, BODY[:10])
+        response, body = serve({"Range": "bytes=0-9", "If-Range": '"stale"'})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, BODY)
+
+    def test_multipart_ranges(self):
+        response, body = serve({"Range": "bytes=0-9,5-19,100-199,-5"})
+        self.assertEqual(response.status, 206)
+        content_type = response.getheader("Content-Type")
+        self.assertTrue(content_type.startswith("multipart/byteranges; boundary="))
+        self.assertEqual(int(response.getheader("Content-Length")), len(body))
+        message = email.message_from_bytes(
+            b"Content-Type: " + content_type.encode("ascii") + b"\r\n\r\n" + body, policy=email.policy.HTTP
+        )
+        parts = [(part["Content-Range"], part.get_payload(decode=True)) for part in message.iter_parts()]
+        self.assertEqual(
+            parts,
+            [
+                (f"bytes 0-19/{SIZE}", BODY[:20]),
+                (f"bytes 100-199/{SIZE}", BODY[100:200]),
+                (f"bytes {SIZE - 5}-{SIZE - 1}/{SIZE}", BODY[-5:]),
+            ],
+        )
+
+    def test_multipart_head_has_same_length(self):
+        # The boundary is random but always the same length, so HEAD and GET agree on Content-Length.
+        response, body = serve({"Range": "bytes=0-9,100-199"}, head=True)
+        expected, _ = serve({"Range": "bytes=0-9,100-199"})
+        self.assertEqual(response.status, 206)
+        self.assertEqual(body, b"")
+        self.assertEqual(response.getheader("Content-Length"), expected.getheader("Content-Length"))
+
+
+if __name__ == "__main__":
+    unittest.main()